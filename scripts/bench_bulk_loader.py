@@ -0,0 +1,63 @@
+# scripts/bench_bulk_loader.py
+"""
+Benchmark penulisan dim_comics: DataFrame.to_sql vs bulk_loader (COPY).
+
+Contoh:
+    python bench_bulk_loader.py --scale 10 --db-uri postgresql+psycopg2://...
+"""
+import argparse
+import time
+
+import pandas as pd
+from sqlalchemy import text
+
+import data_etl
+import staging
+from bulk_loader import bulk_replace, DEFAULT_CHUNKSIZE
+from db_connector import get_engine
+
+
+def build_frame(input_file, scale):
+    df = staging.read_frame(input_file)
+    parts = []
+    for i in range(scale):
+        part = df.copy()
+        part['title_id'] = part['title_id'] + i * len(df)
+        parts.append(part)
+    df = pd.concat(parts, ignore_index=True)
+    df['row_hash'] = data_etl.row_fingerprint(df)
+
+    vocabs, _ = data_etl.build_vocab(df)
+    return data_etl.transform_comics(df, vocabs)[data_etl.DIM_COMICS_COLUMNS]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--input', default=data_etl.INPUT_FILE)
+    parser.add_argument('--db-uri', default=None, help="Default: konfigurasi .env (db_connector)")
+    parser.add_argument('--scale', type=int, default=1)
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args()
+
+    engine = get_engine(url=args.db_uri)
+    df = build_frame(args.input, args.scale)
+    print(f"=== BENCHMARK BULK LOAD ({len(df)} baris x {df.shape[1]} kolom) ===")
+
+    start = time.perf_counter()
+    df.to_sql('bench_to_sql', con=engine, if_exists='replace', index=False)
+    t_to_sql = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bulk_replace(df, 'bench_copy', engine, chunksize=args.chunksize, primary_key='title_id')
+    t_copy = time.perf_counter() - start
+
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS bench_to_sql; DROP TABLE IF EXISTS bench_copy;"))
+
+    print(f"to_sql : {t_to_sql:.2f} s ({len(df) / t_to_sql:,.0f} baris/s)")
+    print(f"COPY   : {t_copy:.2f} s ({len(df) / t_copy:,.0f} baris/s)")
+    print(f"Speedup: {t_to_sql / t_copy:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
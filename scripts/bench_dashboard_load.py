@@ -0,0 +1,182 @@
+# scripts/bench_dashboard_load.py
+"""
+Load test headless dashboard.py: N sesi bersamaan (satu thread + AppTest
+per sesi, cache Streamlit dipakai bersama seperti pada satu server) yang
+berpindah halaman, mengubah Top N, filter genre dan pilihan selectbox.
+
+AppTest memasang runtime Streamlit global selama satu rerun, sehingga
+rerun antar sesi dijalankan bergantian (lock); state semua sesi tetap
+hidup bersamaan. Dilaporkan latensi render (waktu rerun) dan latensi
+respons (antre + render) per rerun (p50 / p95 / maks), rerun per detik
+dan RSS proses (awal, setelah warm-up, puncak). Setiap mode dijalankan di
+proses baru:
+- shared : data loader dibagi semua sesi sebagai FrozenFrame read-only dan
+           spesifikasi grafik plotly di-cache (st.cache_resource)
+- copy   : st.cache_data (salinan hasil di-unpickle per rerun per sesi)
+
+Contoh:
+    python bench_dashboard_load.py --sessions 20 --steps 10
+    DATABASE_URL=postgresql+psycopg2://.../DW_UAS_BI python bench_dashboard_load.py --modes shared
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+import instrument
+
+DASHBOARD = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dashboard.py")
+MODES = {"shared": "true", "copy": "false"}
+PAGES = ["Target Audience", "Popularity", "Viral Potential"]
+TOP_N_VALUES = [5, 10, 20, 30]  # dalam rentang slider Top N (maks q.SUMMARY_TOP_N)
+
+
+# ===============================
+# SESI
+# ===============================
+_RUN_LOCK = threading.Lock()
+
+
+def _timed_run(widget_or_app, latencies):
+    """Rerun satu sesi → latencies.append((render ms, respons ms))."""
+    requested = time.perf_counter()
+    with _RUN_LOCK:
+        start = time.perf_counter()
+        at = widget_or_app.run()
+        end = time.perf_counter()
+    latencies.append(((end - start) * 1000, (end - requested) * 1000))
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return at
+
+
+def session(steps, seed, latencies, timeout):
+    """Satu sesi: render awal lalu `steps` interaksi acak."""
+    rng = random.Random(seed)
+    at = _timed_run(AppTest.from_file(DASHBOARD, default_timeout=timeout), latencies)
+    genres = at.sidebar.multiselect[0].options
+    for _ in range(steps):
+        action = rng.choice(("page", "top_n", "select", "genre"))
+        if action == "page":
+            widget = at.sidebar.radio[0].set_value(rng.choice(PAGES))
+        elif action == "top_n":
+            widget = at.sidebar.slider[0].set_value(rng.choice(TOP_N_VALUES))
+        elif action == "genre":
+            widget = at.sidebar.multiselect[0].set_value(rng.sample(genres, rng.randint(0, 2)))
+        else:
+            box = at.selectbox[0]
+            if not box.options:
+                continue
+            widget = box.set_value(rng.choice(box.options))
+        at = _timed_run(widget, latencies)
+
+
+class RssSampler(threading.Thread):
+    """Puncak RSS proses selama load test."""
+
+    def __init__(self, interval=0.02):
+        super().__init__(daemon=True)
+        self.interval, self.peak, self._done = interval, instrument.current_rss_mb(), threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            self.peak = max(self.peak, instrument.current_rss_mb())
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        return max(self.peak, instrument.current_rss_mb())
+
+
+def run_child(sessions, steps, seed, timeout):
+    """Satu mode di proses ini → dict hasil (dicetak sebagai JSON)."""
+    rss_start = instrument.current_rss_mb()
+    # Warm-up: cache loader terisi seperti server yang sudah berjalan
+    session(len(PAGES) * 4, seed - 1, [], timeout)
+    rss_warm = instrument.current_rss_mb()
+
+    latencies, errors = [], []
+
+    def worker(i):
+        try:
+            session(steps, seed + i, latencies, timeout)
+        except Exception as e:
+            errors.append(repr(e))
+
+    sampler = RssSampler()
+    sampler.start()
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    seconds = time.perf_counter() - start
+    peak = sampler.stop()
+
+    render, response = np.array(latencies).T
+    return {
+        "sessions": sessions, "reruns": len(render), "errors": errors[:3], "seconds": seconds,
+        "render_p50_ms": float(np.percentile(render, 50)), "render_p95_ms": float(np.percentile(render, 95)),
+        "render_max_ms": float(render.max()),
+        "response_p50_ms": float(np.percentile(response, 50)),
+        "response_p95_ms": float(np.percentile(response, 95)),
+        "reruns_per_s": len(render) / seconds,
+        "rss_start_mb": rss_start, "rss_warm_mb": rss_warm, "rss_peak_mb": peak,
+    }
+
+
+# ===============================
+# LAPORAN
+# ===============================
+def run_isolated(mode, args):
+    env = dict(
+        os.environ, DASHBOARD_SHARED_DATA=MODES[mode], RUN_METRICS_DB="false", RUN_METRICS_FILE=os.devnull
+    )
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child",
+         "--sessions", str(args.sessions), "--steps", str(args.steps),
+         "--seed", str(args.seed), "--timeout", str(args.timeout)],
+        env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sessions', type=int, default=20, help="Jumlah sesi bersamaan")
+    parser.add_argument('--steps', type=int, default=10, help="Interaksi per sesi")
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--timeout', type=float, default=300, help="Batas waktu satu rerun (detik)")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.sessions, args.steps, args.seed, args.timeout)))
+        return
+
+    print(f"=== LOAD TEST DASHBOARD: {args.sessions} sesi x {args.steps} interaksi ===")
+    print(f"{'':<7} {'':>6} {'render (ms)':^26} {'respons (ms)':^17} {'':>8} {'RSS (MB)':^26}")
+    print(f"{'mode':<7} {'rerun':>6} {'p50':>8} {'p95':>8} {'maks':>8} {'p50':>8} {'p95':>8} {'rerun/s':>8} "
+          f"{'awal':>8} {'warm-up':>8} {'puncak':>8}")
+    for mode in args.modes:
+        r = run_isolated(mode, args)
+        print(
+            f"{mode:<7} {r['reruns']:>6} {r['render_p50_ms']:>8.1f} {r['render_p95_ms']:>8.1f} "
+            f"{r['render_max_ms']:>8.1f} {r['response_p50_ms']:>8.1f} {r['response_p95_ms']:>8.1f} "
+            f"{r['reruns_per_s']:>8.1f} {r['rss_start_mb']:>8.1f} {r['rss_warm_mb']:>8.1f} {r['rss_peak_mb']:>8.1f}"
+        )
+        for error in r["errors"]:
+            print(f"   ⚠️ {error}")
+
+
+if __name__ == "__main__":
+    main()
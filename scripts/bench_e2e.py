@@ -0,0 +1,248 @@
+# scripts/bench_e2e.py
+"""
+Benchmark end-to-end pada data sintetis (synth_data.py) beberapa skala:
+pre_etl_harmonization → etl_process → train_model → query dashboard.
+
+Setiap fase berjalan di proses sendiri sehingga puncak memori (RSS) per
+fase terukur. Hasil (waktu, baris, throughput, puncak RSS) ditulis ke file
+JSON beserta commit git & versi library, untuk dibandingkan antar versi.
+
+PERHATIAN: etl_process & training menulis ulang star schema di database
+--db-uri; gunakan database khusus benchmark.
+
+Contoh:
+    python bench_e2e.py --db-uri postgresql+psycopg2://postgres@localhost/bench_dw \
+        --scales 10 100 1000 --output bench_e2e.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+
+from pipeline import peak_rss_mb
+
+PHASES = ("generate", "pre_etl", "etl", "train", "dashboard")
+
+# ===============================
+# FASE (dijalankan di proses anak)
+# ===============================
+def phase_generate(cfg):
+    import synth_data
+    written = synth_data.generate_sources(cfg["scale"], cfg["work_dir"], cfg["seed"])
+    return {"rows": sum(n for _, n in written.values())}
+
+
+def phase_pre_etl(cfg):
+    import pre_etl
+    import synth_data
+    sources = [os.path.join(cfg["work_dir"], synth_data.SOURCES[name] + ".csv")
+               for name in ("webtoon", "manga")]
+    with contextlib.redirect_stdout(io.StringIO()):
+        if cfg["pre_etl_mode"] == "streaming":
+            rows = pre_etl.pre_etl_harmonization_streaming(*sources, cfg["staged_file"], seed=cfg["seed"])
+        else:
+            rows = len(pre_etl.pre_etl_harmonization(*sources, cfg["staged_file"], seed=cfg["seed"]))
+    return {"rows": rows}
+
+
+def phase_etl(cfg):
+    import data_etl
+    data_etl.INPUT_FILE = cfg["staged_file"]
+    with contextlib.redirect_stdout(io.StringIO()):
+        counts = data_etl.etl_process()
+    return {"rows": counts["inserted"]}
+
+
+def phase_train(cfg):
+    import train_models as tm
+
+    start = time.perf_counter()
+    df, genre_matrix = tm.load_data()
+    df, df_completed, df_ongoing, _ = tm.prepare_data(df)
+    tasks = tm.build_tasks(df, df_completed, df_ongoing, genre_matrix)
+    t_load = time.perf_counter() - start
+
+    rng = np.random.default_rng(cfg["seed"])
+    targets, metrics_list, rows_trained = {}, [], 0
+    t_fit = t_predict = 0.0
+    for task in tasks:
+        pred_col, index, X, y, model_type, _ = task
+        # Baris latih dibatasi train_max_rows (sampel acak); prediksi tetap semua baris
+        sample = np.arange(len(y))
+        if len(sample) > cfg["train_max_rows"]:
+            sample = np.sort(rng.choice(sample, cfg["train_max_rows"], replace=False))
+        y_sample = y.iloc[sample]
+
+        start = time.perf_counter()
+        model, le_y, metrics = tm.train_model(X[sample], y_sample, model_type, n_jobs=cfg["workers"])
+        fit_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        df.loc[index, pred_col] = tm._predict_task(task, model, le_y, cfg["workers"])
+        predict_s = time.perf_counter() - start
+
+        t_fit += fit_s
+        t_predict += predict_s
+        rows_trained += len(sample)
+        metrics_list.append(metrics)
+        targets[y.name] = {
+            "engine": model_type, "rows_trained": int(len(sample)), "rows_predicted": int(len(y)),
+            "fit_s": round(fit_s, 3), "predict_s": round(predict_s, 3),
+            "accuracy": round(metrics["accuracy"], 4),
+        }
+
+    start = time.perf_counter()
+    tm.save_results(df, metrics_list)
+    t_save = time.perf_counter() - start
+
+    return {
+        "rows": int(len(df)), "rows_trained": rows_trained,
+        "load_s": round(t_load, 3), "fit_s": round(t_fit, 3),
+        "predict_s": round(t_predict, 3), "save_s": round(t_save, 3),
+        "targets": targets,
+    }
+
+
+def phase_dashboard(cfg):
+    import dashboard_queries as q
+    import pandas as pd
+    from db_connector import get_engine, DASHBOARD_STATEMENT_TIMEOUT_MS
+
+    engine = get_engine(statement_timeout_ms=DASHBOARD_STATEMENT_TIMEOUT_MS)
+    summary = q.summaries_ready(engine)
+    genres = pd.read_sql(
+        "SELECT genre_id FROM bridge_comic_genre GROUP BY genre_id ORDER BY COUNT(*) DESC LIMIT 2",
+        engine
+    )['genre_id'].tolist()
+
+    queries = {"catalog_stats": lambda g, s: q.catalog_stats(engine, g, summary=s)}
+    for pred_col in q.PRED_COLUMNS:
+        labels = q.label_counts(engine, pred_col)["Kategori"].tolist()
+        order_by = q.SUMMARY_TOP_ORDER[pred_col]
+        queries[f"label_counts:{pred_col}"] = (
+            lambda g, s, c=pred_col: q.label_counts(engine, c, g, summary=s)
+        )
+        if labels:
+            queries[f"top_comics:{pred_col}"] = (
+                lambda g, s, c=pred_col, l=labels[0], o=order_by:
+                    q.top_comics(engine, c, l, o, 10, g, summary=s)
+            )
+
+    variants = {"summary": ((), True), "live": ((), False), "genre_filter": (tuple(genres), False)}
+    timings = {}
+    for variant, (genre_ids, use_summary) in variants.items():
+        if use_summary and not summary:
+            continue
+        for name, query in queries.items():
+            times = []
+            for _ in range(cfg["repeat"]):
+                start = time.perf_counter()
+                query(genre_ids, use_summary)
+                times.append((time.perf_counter() - start) * 1000)
+            timings[f"{variant}:{name}"] = {
+                "p50_ms": round(float(np.percentile(times, 50)), 3),
+                "p95_ms": round(float(np.percentile(times, 95)), 3),
+            }
+    return {"rows": None, "queries_run": len(timings) * cfg["repeat"], "queries": timings}
+
+
+def _run_phase(name, cfg):
+    start = time.perf_counter()
+    result = globals()[f"phase_{name}"](cfg)
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    peak = peak_rss_mb()
+    result["peak_rss_mb"] = None if peak is None else round(peak, 1)
+    return result
+
+# ===============================
+# DRIVER
+# ===============================
+def environment_info():
+    import pandas as pd
+    import sklearn
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_scale(scale, args, pool_ctx):
+    results = []
+    with tempfile.TemporaryDirectory(dir=args.work_dir) as work_dir:
+        cfg = {
+            "scale": scale, "work_dir": work_dir, "seed": args.seed,
+            "staged_file": os.path.join(work_dir, f"data_gabungan.{args.staging_format}"),
+            "pre_etl_mode": args.pre_etl_mode, "train_max_rows": args.train_max_rows,
+            "workers": args.workers, "repeat": args.repeat,
+        }
+        for phase in PHASES:
+            # Proses baru per fase → puncak RSS milik fase itu saja
+            with ProcessPoolExecutor(1, mp_context=pool_ctx) as pool:
+                result = pool.submit(_run_phase, phase, cfg).result()
+            rows = result.get("rows") or 0
+            result.update({
+                "scale": scale, "phase": phase,
+                "rows_per_s": round(rows / result["seconds"], 1) if rows and result["seconds"] else None,
+            })
+            results.append(result)
+            print(
+                f"  {phase:<10}: {result['seconds']:>9.2f} s | {rows:>10} baris | "
+                f"{result['rows_per_s'] or 0:>12,.0f} baris/s | puncak {result['peak_rss_mb']} MB"
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--db-uri', required=True, help="Database KHUSUS benchmark (isinya ditimpa)")
+    parser.add_argument('--scales', type=float, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--pre-etl-mode', choices=['memory', 'streaming'], default='memory')
+    parser.add_argument('--staging-format', choices=['parquet', 'arrow', 'csv'], default='parquet')
+    parser.add_argument('--train-max-rows', type=int, default=200_000,
+                        help="Batas baris latih per target (sampel acak); prediksi tetap semua baris")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--repeat', type=int, default=20, help="Ulangan tiap query dashboard")
+    parser.add_argument('--work-dir', default=None, help="Folder file sementara (default: temp sistem)")
+    parser.add_argument('--output', default='bench_e2e.json')
+    args = parser.parse_args()
+
+    # Diwarisi proses fase (db_connector membaca DATABASE_URL)
+    os.environ["DATABASE_URL"] = args.db_uri
+    pool_ctx = multiprocessing.get_context("spawn")
+
+    report = {"environment": environment_info(), "config": vars(args) | {"db_uri": None}, "results": []}
+    for scale in args.scales:
+        print(f"=== SKALA {scale:g}x ===")
+        report["results"].extend(run_scale(scale, args, pool_ctx))
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    print(f"✅ Hasil ditulis ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# scripts/bench_forest_inference.py
+"""
+Benchmark inferensi random forest: model sklearn vs FlatForest
+(forest_arrays.py) untuk model yang sama.
+
+Dibandingkan ukuran artefak joblib di disk, ukuran array pohon di memori,
+waktu load artefak (joblib.load mmap_mode='r', seperti model_store) dan
+baris/detik predict_proba untuk beberapa ukuran batch (sklearn n_jobs=1).
+Juga dicek bahwa predict_proba keduanya identik bit.
+
+Exit code 1 jika hasil tidak identik atau FlatForest lebih lambat dari
+sklearn di salah satu ukuran batch (syarat sebelum model_store boleh
+menyimpan FlatForest).
+
+Data dibangun seperti bench_train_models.py (data_gabungan.csv di-upsample,
+tanpa database).
+
+Contoh:
+    python bench_forest_inference.py --rows 5000 --target Popularity
+    python bench_forest_inference.py --engines rf rf_bounded --batches 1 100 1000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+
+import data_etl
+import train_models as tm
+from bench_train_models import TARGETS, build_frame, target_data
+from forest_arrays import export_forest
+
+FOREST_ENGINES = ("rf", "rf_bounded")
+
+
+def sklearn_nbytes(model):
+    """Array node + value semua pohon sklearn (seperti setelah unpickle)."""
+    total = 0
+    for estimator in model.estimators_:
+        state = estimator.tree_.__getstate__()
+        total += state["nodes"].nbytes + state["values"].nbytes
+    return total
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def load_seconds(path, repeat):
+    # Baca sekali dulu supaya kedua format sama-sama dari page cache
+    joblib.load(path, mmap_mode="r")
+    return best_of(lambda: joblib.load(path, mmap_mode="r"), repeat)
+
+
+def bench_engine(X, y, engine, batches, repeat, tmp_dir):
+    model, _, _ = tm.train_model(X, y, engine, n_jobs=1)
+    model.set_params(n_jobs=1)
+    start = time.perf_counter()
+    flat = export_forest(model)
+    export_s = time.perf_counter() - start
+
+    paths = {}
+    for name, obj in (("sklearn", model), ("flat", flat)):
+        paths[name] = os.path.join(tmp_dir, f"{engine}_{name}.joblib")
+        joblib.dump(obj, paths[name])
+    loaded = joblib.load(paths["flat"], mmap_mode="r")
+
+    identical = np.array_equal(model.predict_proba(X), loaded.predict_proba(X))
+    result = {
+        "engine": engine, "trees": flat.n_estimators, "nodes": flat.n_nodes,
+        "identical": identical, "export_s": export_s,
+        "disk_mb": {name: os.path.getsize(p) / 2 ** 20 for name, p in paths.items()},
+        "memory_mb": {"sklearn": sklearn_nbytes(model) / 2 ** 20, "flat": flat.nbytes / 2 ** 20},
+        "load_s": {name: load_seconds(p, repeat) for name, p in paths.items()},
+        "rows_per_s": {},
+    }
+    for batch in batches:
+        rows = X[:batch]
+        result["rows_per_s"][batch] = {
+            name: rows.shape[0] / best_of(lambda m=m: m.predict_proba(rows), repeat)
+            for name, m in (("sklearn", model), ("flat", loaded))
+        }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--input', default=data_etl.INPUT_FILE)
+    parser.add_argument('--rows', type=int, default=5_000, help="Baris data latih (sebelum filter status)")
+    parser.add_argument('--target', choices=sorted(TARGETS), default="Popularity")
+    parser.add_argument('--engines', nargs='+', choices=FOREST_ENGINES, default=list(FOREST_ENGINES))
+    parser.add_argument('--batches', type=int, nargs='+', default=[1, 100, 1_000, 10_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    df, genre_matrix = build_frame(args.input, args.rows, args.seed)
+    df, df_completed, df_ongoing, _ = tm.prepare_data(df)
+    frame, y = target_data(df, df_completed, df_ongoing, args.target)
+    X = tm.feature_matrix(frame, TARGETS[args.target], genre_matrix)
+    batches = sorted({min(b, X.shape[0]) for b in args.batches})
+    print(f"=== {args.target}: {X.shape[0]:,} baris, {X.shape[1]} fitur ===")
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for engine in args.engines:
+            r = bench_engine(X, y, engine, batches, args.repeat, tmp_dir)
+            print(
+                f"\n{engine}: {r['trees']} pohon, {r['nodes']:,} node, ekspor {r['export_s']:.2f} s, "
+                f"predict_proba identik: {'ya' if r['identical'] else 'TIDAK'}"
+            )
+            print(f"{'':<14} {'sklearn':>10} {'flat':>10} {'rasio':>7}")
+            for label, key, fmt in (
+                ("disk (MB)", "disk_mb", ".1f"), ("memori (MB)", "memory_mb", ".1f"), ("load (ms)", "load_s", ".1f")
+            ):
+                old, new = r[key]["sklearn"], r[key]["flat"]
+                if key == "load_s":
+                    old, new = old * 1000, new * 1000
+                print(f"{label:<14} {old:>10{fmt}} {new:>10{fmt}} {new / old:>6.2f}x")
+            for batch, rates in r["rows_per_s"].items():
+                print(
+                    f"{f'baris/s @{batch}':<14} {rates['sklearn']:>10,.0f} {rates['flat']:>10,.0f} "
+                    f"{rates['flat'] / rates['sklearn']:>6.2f}x"
+                )
+
+            if not r["identical"]:
+                failures.append(f"{engine}: predict_proba tidak identik dengan sklearn")
+            slower = [batch for batch, rates in r["rows_per_s"].items() if rates["flat"] < rates["sklearn"]]
+            if slower:
+                failures.append(f"{engine}: FlatForest lebih lambat dari sklearn @ {', '.join(map(str, slower))} baris")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
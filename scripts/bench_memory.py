@@ -0,0 +1,144 @@
+# scripts/bench_memory.py
+"""
+Laporan memori pembacaan data per tahap: cara lama (SELECT *, dtype
+default pandas, seluruh hasil query di memori klien) vs dw_frames
+(proyeksi kolom per konsumen, dtype compact, server-side cursor per chunk).
+
+Setiap (tahap, mode) dijalankan di proses baru supaya RSS tidak terbawa
+dari tahap sebelumnya. Dilaporkan RSS sebelum & sesudah tahap, puncak RSS
+selama tahap (instrument.stage), ukuran DataFrame hasil dan waktu.
+
+Tahap:
+- train_models : load_data + prepare_data
+- score_models : iterasi batch delta (semua baris dianggap berubah)
+- similar_comics: load_comics
+
+Contoh:
+    python bench_memory.py
+    DATABASE_URL=postgresql+psycopg2://.../DW_UAS_BI python bench_memory.py --stages train_models
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pandas as pd
+from sqlalchemy import text
+
+import dw_frames
+import instrument
+import similar_comics
+import train_models as tm
+from db_connector import get_engine
+from feature_codec import ids_to_csr
+
+STAGES = ("train_models", "score_models", "similar_comics")
+MODES = ("lama", "compact")
+
+
+# ===============================
+# TAHAP (LAMA vs COMPACT)
+# ===============================
+def _train_models(engine, mode):
+    if mode == "lama":
+        df = pd.read_sql("SELECT * FROM v_comics ORDER BY title_id", con=engine)
+        n_genres = pd.read_sql("SELECT COUNT(*) AS n FROM dim_genre", con=engine)['n'].iloc[0]
+        ids_to_csr(df['genre_ids'], int(n_genres))
+    else:
+        df, _ = tm.load_data()
+    df, *_ = tm.prepare_data(df)
+    return df
+
+
+def _score_models(engine, mode, batch_size=10_000):
+    sql = "SELECT c.* FROM v_comics c ORDER BY c.title_id"
+    rows = 0
+    with engine.connect() as conn:
+        if mode == "lama":
+            batches = pd.read_sql(text(sql), conn, chunksize=batch_size)
+        else:
+            batches = dw_frames.read_chunks(
+                conn, dw_frames.select_sql("v_comics c", "score_models", order_by="c.title_id", alias="c"),
+                chunksize=batch_size
+            )
+        for batch in batches:
+            rows += len(batch)
+            last = batch
+    return last.assign(_rows=rows)
+
+
+def _similar_comics(engine, mode):
+    if mode == "lama":
+        df = pd.read_sql(
+            "SELECT title_id, author_id, synopsis, genre_ids FROM dim_comics ORDER BY title_id", con=engine
+        )
+        n_genres = pd.read_sql("SELECT COUNT(*) AS n FROM dim_genre", con=engine)['n'].iloc[0]
+        ids_to_csr(df['genre_ids'], int(n_genres))
+        return df
+    return similar_comics.load_comics(engine)[0]
+
+
+def run_child(stage, mode):
+    """Satu (tahap, mode) di proses ini → dict hasil (dicetak sebagai JSON)."""
+    engine = get_engine()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    rss_before = instrument.current_rss_mb()
+    start = time.perf_counter()
+    with instrument.stage(f"bench_memory.{stage}.{mode}") as metrics:
+        df = globals()[f"_{stage}"](engine, mode)
+    return {
+        "stage": stage, "mode": mode,
+        "rows": int(df["_rows"].iloc[0]) if "_rows" in df else len(df),
+        "seconds": time.perf_counter() - start,
+        "rss_before_mb": rss_before,
+        "rss_after_mb": instrument.current_rss_mb(),
+        "peak_rss_mb": metrics.record["peak_rss_mb"],
+        "frame_mb": dw_frames.frame_mb(df.drop(columns="_rows", errors="ignore")),
+    }
+
+
+# ===============================
+# LAPORAN
+# ===============================
+def run_isolated(stage, mode):
+    env = dict(os.environ, RUN_METRICS_DB="false", RUN_METRICS_FILE=os.devnull)
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", stage, mode],
+        env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES))
+    parser.add_argument('--child', nargs=2, metavar=("STAGE", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(*args.child)))
+        return
+
+    print("=== LAPORAN MEMORI PER TAHAP (MB) ===")
+    print(f"{'tahap':<15} {'mode':<8} {'baris':>9} {'RSS awal':>9} {'RSS akhir':>10} "
+          f"{'puncak':>8} {'frame':>8} {'detik':>7}")
+    for stage in args.stages:
+        results = {mode: run_isolated(stage, mode) for mode in MODES}
+        for mode, r in results.items():
+            print(
+                f"{stage:<15} {mode:<8} {r['rows']:>9} {r['rss_before_mb']:>9.1f} {r['rss_after_mb']:>10.1f} "
+                f"{r['peak_rss_mb']:>8.1f} {r['frame_mb']:>8.1f} {r['seconds']:>7.2f}"
+            )
+        old, new = results["lama"], results["compact"]
+        print(
+            f"{'':<15} → puncak {new['peak_rss_mb'] - old['peak_rss_mb']:+.1f} MB "
+            f"({new['peak_rss_mb'] - new['rss_before_mb']:.1f} vs {old['peak_rss_mb'] - old['rss_before_mb']:.1f} MB "
+            f"di atas RSS awal), frame {new['frame_mb']:.1f} vs {old['frame_mb']:.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# scripts/bench_near_dedup.py
+"""
+Benchmark deteksi near-duplicate (near_dedup.py) pada data sintetis
+(synth_data.py) beberapa skala.
+
+Setelah harmonisasi (pre_etl, dedup judul persis), sebagian baris
+disalin sebagai varian judul dengan author yang sama: tanda baca
+dibuang / ditambah, huruf besar-kecil, "The " di depan, keterangan
+"(Webnovel)", aksen & vokal panjang romanisasi. Diukur:
+- waktu, baris/detik & jumlah pasangan kandidat (harus tumbuh ~linear)
+- recall: varian yang tergabung dengan baris aslinya
+- baris non-varian yang ikut terbuang (false merge)
+- pasangan negatif asli (seri berbeda dari author yang sama di
+  data_gabungan, REAL_NEGATIVES) yang tergabung; harus 0
+
+Judul sintetis diberi nomor unik (synth_data), sehingga blok LSH di sini
+lebih kecil daripada di data asli; jumlah kandidat per baris di data asli
+(lihat near_dedup.py pada data_gabungan) sekitar 0.3.
+
+Contoh:
+    python bench_near_dedup.py --scales 1 10 100 --variant-rate 0.01
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import near_dedup
+import pre_etl
+import synth_data
+
+VARIANTS = (
+    lambda t: t.replace(":", "").replace("'", "").replace("-", " "),
+    lambda t: t.upper(),
+    lambda t: t.lower(),
+    lambda t: "The " + t,
+    lambda t: t + " (Webnovel)",
+    lambda t: t.replace("o", "ō", 1),
+    lambda t: t.replace("o", "ou", 1),
+    lambda t: t.replace(" ", "-", 1),
+)
+
+# Judul mirip dari author sama yang BUKAN duplikat (seri / sekuel / prekuel lain)
+REAL_NEGATIVES = (
+    ("Gundam Exa", "Gundam Exa Vs", "Tomohiro Chiba"),
+    ("Kamen Rider Spirits", "Shin Kamen Rider Spirits", "Kenichi Muraeda"),
+    ("Dragon Ball Super", "Dragon Ball Super Divers", "Toyotarou"),
+    ("Mobile Suit Crossbone Gundam Seerauber", "Mobile Suit Crossbone Gundam - Ghost", "Yuuichi Hasegawa"),
+    ("Jaa, Kimi No Kawari Ni Korosou Ka?", "Jaa Kimi No Kawari Ni Korosou Ka ~ Prequel", "Yukiaki  Kurando"),
+)
+
+
+def harmonized(scale, work_dir, seed):
+    """Data sintetis skala `scale` setelah pre_etl_harmonization (tanpa near-dedup)."""
+    synth_data.generate_sources(scale, work_dir, seed)
+    sources = [os.path.join(work_dir, synth_data.SOURCES[name] + ".csv") for name in ("webtoon", "manga")]
+    with contextlib.redirect_stdout(io.StringIO()):
+        return pre_etl.pre_etl_harmonization(*sources, os.path.join(work_dir, "data_gabungan.csv"), seed=seed)
+
+
+def inject_variants(df, rate, rng):
+    """Tambah varian judul dari `rate` x baris; kolom variant_of = posisi baris asli (-1 jika bukan varian)."""
+    df = df.reset_index(drop=True)
+    source = np.sort(rng.choice(len(df), int(len(df) * rate), replace=False))
+    variants = df.iloc[source].copy()
+    kinds = rng.integers(0, len(VARIANTS), len(source))
+    variants["title"] = [VARIANTS[k](t) for k, t in zip(kinds, variants["title"].astype(str))]
+    out = pd.concat([df, variants], ignore_index=True)
+    out["variant_of"] = np.concatenate([np.full(len(df), -1), source])
+    return out
+
+
+def inject_negatives(df, rng):
+    """Tambah pasangan REAL_NEGATIVES (kolom lain disalin dari baris acak); kolom negative_pair = nomor pasangan."""
+    template = df.iloc[rng.choice(len(df), 2 * len(REAL_NEGATIVES))].copy()
+    template["title"] = [t for first, second, _ in REAL_NEGATIVES for t in (first, second)]
+    template["author"] = [a for _, _, a in REAL_NEGATIVES for _ in range(2)]
+    template["variant_of"] = -1
+    out = pd.concat([df.assign(negative_pair=-1), template], ignore_index=True)
+    out.loc[len(df):, "negative_pair"] = np.repeat(np.arange(len(REAL_NEGATIVES)), 2)
+    return out
+
+
+def bench_scale(scale, args, rng):
+    with tempfile.TemporaryDirectory(dir=args.work_dir) as work_dir:
+        df = inject_negatives(inject_variants(harmonized(scale, work_dir, args.seed), args.variant_rate, rng), rng)
+
+    start = time.perf_counter()
+    cluster, stats = near_dedup.find_near_duplicates(
+        df, num_perm=args.num_perm, bands=args.bands, window=args.window,
+        title_threshold=args.title_threshold,
+    )
+    seconds = time.perf_counter() - start
+
+    variant_of = df["variant_of"].to_numpy()
+    is_variant = variant_of >= 0
+    recall = float((cluster[is_variant] == cluster[variant_of[is_variant]]).mean()) if is_variant.any() else None
+    dropped = cluster != np.arange(len(df))
+    false_merges = int((dropped & ~is_variant).sum())
+    negatives = df[df["negative_pair"] >= 0]
+    negative_merges = int(
+        (pd.Series(cluster[negatives.index]).groupby(negatives["negative_pair"].to_numpy()).nunique() == 1).sum()
+    )
+
+    result = {
+        "scale": scale, "rows": len(df), "seconds": seconds, "rows_per_s": len(df) / seconds,
+        "candidate_pairs": stats["candidate_pairs"], "pairs_per_row": stats["candidate_pairs"] / len(df),
+        "dropped": stats["dropped"], "recall": recall, "false_merges": false_merges,
+        "negative_merges": negative_merges,
+    }
+    print(
+        f"{scale:>6g}x | {len(df):>9} | {seconds:>8.2f} | {result['rows_per_s']:>10,.0f} | "
+        f"{stats['candidate_pairs']:>10} | {result['pairs_per_row']:>6.2f} | "
+        f"{recall:>6.1%} | {false_merges:>6} | {negative_merges:>3}/{len(REAL_NEGATIVES)}"
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scales', type=float, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--variant-rate', type=float, default=0.01, help="Porsi baris yang diberi varian judul")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--num-perm', type=int, default=near_dedup.NUM_PERM)
+    parser.add_argument('--bands', type=int, default=near_dedup.BANDS)
+    parser.add_argument('--window', type=int, default=near_dedup.WINDOW)
+    parser.add_argument('--title-threshold', type=float, default=near_dedup.TITLE_THRESHOLD)
+    parser.add_argument('--work-dir', default=None, help="Folder file sementara (default: temp sistem)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print("=== BENCHMARK NEAR-DUPLICATE ===")
+    print(f"{'skala':>7} | {'baris':>9} | {'detik':>8} | {'baris/s':>10} | {'kandidat':>10} | "
+          f"{'/baris':>6} | {'recall':>6} | {'salah':>6} | {'negatif':>7}")
+    results = [bench_scale(scale, args, rng) for scale in args.scales]
+
+    # Kemiringan log-log waktu terhadap baris: ~1 berarti linear
+    if len(results) > 1:
+        rows = np.log([r["rows"] for r in results])
+        secs = np.log([r["seconds"] for r in results])
+        print(f"Eksponen skala waktu (log-log): {np.polyfit(rows, secs, 1)[0]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
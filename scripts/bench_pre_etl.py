@@ -0,0 +1,133 @@
+# scripts/bench_pre_etl.py
+"""
+Benchmark harmonisasi pre-ETL: jalur per baris vs jalur vektor.
+
+Contoh:
+    python bench_pre_etl.py --scale 10 --repeat 3 --seed 42
+"""
+import argparse
+import contextlib
+import filecmp
+import io
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import pre_etl
+
+
+def _scaled_copy(path, scale, out_dir):
+    """Gandakan baris sumber `scale` kali (judul diberi akhiran unik)."""
+    if scale <= 1:
+        return path
+    df = pd.read_csv(path, encoding='latin-1')
+    parts = []
+    for i in range(scale):
+        part = df.copy()
+        if i > 0:
+            part['title'] = part['title'].astype(str) + f' vol {i}'
+        parts.append(part)
+    out = os.path.join(out_dir, os.path.basename(path))
+    pd.concat(parts, ignore_index=True).to_csv(out, index=False, encoding='latin-1', errors='replace')
+    return out
+
+
+def _run(file_webtoon, file_manga, output_file, seed, vectorized):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = pre_etl.pre_etl_harmonization(
+            file_webtoon, file_manga, output_file,
+            seed=seed, vectorized=vectorized
+        )
+    return time.perf_counter() - start, len(df)
+
+
+def _best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def bench_steps(file_manga, repeat, seed):
+    """Waktu tiap langkah harmonisasi (tanpa I/O CSV)."""
+    df = pd.read_csv(file_manga, encoding='latin-1')
+    titles = df['title'].astype(str).str.lower().str.strip()
+    ratings = pd.to_numeric(df['rating'], errors='coerce')
+    n = len(df)
+
+    def choice_rowwise():
+        random.seed(seed)
+        return [random.choice(pre_etl.VALID_WEEKDAYS) for _ in range(n)]
+
+    def choice_vectorized():
+        random.seed(seed)
+        return pre_etl.random_choice_vectorized(pre_etl.VALID_WEEKDAYS, n)
+
+    def rating_rowwise():
+        return ratings.apply(lambda r: np.nan if pd.isna(r) else (r if r <= 5 else r / 2))
+
+    steps = {
+        'format_title': (
+            lambda: titles.apply(pre_etl.format_title),
+            lambda: pre_etl.format_title_vectorized(titles),
+        ),
+        'normalize_rating': (
+            rating_rowwise,
+            lambda: pre_etl.normalize_rating_vectorized(ratings),
+        ),
+        'random_choice': (choice_rowwise, choice_vectorized),
+    }
+
+    print(f"--- Per langkah ({n} baris manga) ---")
+    for name, (rowwise, vectorized) in steps.items():
+        t_row = _best_of(rowwise, repeat)
+        t_vec = _best_of(vectorized, repeat)
+        print(f"{name:<17}: per baris {t_row:.4f} s | vektor {t_vec:.4f} s | {t_row / t_vec:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--webtoon', default=pre_etl.FILE_WEBTOON)
+    parser.add_argument('--manga', default=pre_etl.FILE_MANGA)
+    parser.add_argument('--scale', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_webtoon = _scaled_copy(args.webtoon, args.scale, tmp)
+        file_manga = _scaled_copy(args.manga, args.scale, tmp)
+        out_row = os.path.join(tmp, 'rowwise.csv')
+        out_vec = os.path.join(tmp, 'vectorized.csv')
+
+        times = {'rowwise': [], 'vectorized': []}
+        rows = 0
+        for _ in range(args.repeat):
+            t, rows = _run(file_webtoon, file_manga, out_row, args.seed, False)
+            times['rowwise'].append(t)
+            t, rows = _run(file_webtoon, file_manga, out_vec, args.seed, True)
+            times['vectorized'].append(t)
+
+        identical = filecmp.cmp(out_row, out_vec, shallow=False)
+
+    best_row = min(times['rowwise'])
+    best_vec = min(times['vectorized'])
+    print(f"=== BENCHMARK PRE-ETL (scale={args.scale}, rows={rows}) ===")
+    print(f"Per baris  : {best_row:.3f} s")
+    print(f"Vektor     : {best_vec:.3f} s")
+    print(f"Speedup    : {best_row / best_vec:.2f}x")
+    print(f"Output identik: {'YA' if identical else 'TIDAK'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_steps(_scaled_copy(args.manga, args.scale, tmp), args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# scripts/bench_staging.py
+"""
+Benchmark format staging: CSV vs Parquet (zstd) vs Arrow IPC (memory map).
+Untuk setiap dataset diukur waktu tulis, waktu baca semua kolom, waktu
+baca sebagian kolom (projection) dan ukuran file.
+
+Contoh:
+    python bench_staging.py --names data_gabungan feature_table --scale 10 --repeat 3
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+import staging
+
+
+def _best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def _scaled(df, scale):
+    if scale <= 1:
+        return df
+    return pd.concat([df] * scale, ignore_index=True)
+
+
+def bench_dataset(name, scale, repeat, columns, directory):
+    df = _scaled(staging.read_frame(staging.staging_path(name, "csv", directory)), scale)
+    columns = columns or list(df.columns[:3])
+
+    print(f"\n--- {name} ({len(df)} baris x {df.shape[1]} kolom, projection: {columns}) ---")
+    print(f"{'format':<8} | {'tulis (s)':>9} | {'baca (s)':>9} | {'proj. (s)':>9} | {'ukuran (MB)':>11}")
+
+    rows = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in staging.FORMATS:
+            path = staging.staging_path(name, fmt, tmp)
+            t_write = _best_of(lambda: staging.write_frame(df, path), repeat)
+            t_read = _best_of(lambda: staging.read_frame(path), repeat)
+            t_proj = _best_of(lambda: staging.read_frame(path, columns=columns), repeat)
+            size = os.path.getsize(path) / 1e6
+            rows[fmt] = (t_write, t_read, t_proj, size)
+            print(f"{fmt:<8} | {t_write:>9.3f} | {t_read:>9.3f} | {t_proj:>9.3f} | {size:>11.2f}")
+
+    csv = rows["csv"]
+    for fmt in ("parquet", "arrow"):
+        t_write, t_read, t_proj, size = rows[fmt]
+        print(
+            f"{fmt} vs csv: tulis {csv[0] / t_write:.1f}x, baca {csv[1] / t_read:.1f}x, "
+            f"projection {csv[2] / t_proj:.1f}x, ukuran {size / csv[3]:.0%}"
+        )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--names', nargs='+', default=['data_gabungan', 'feature_table'])
+    parser.add_argument('--dir', default=None, help="Folder CSV sumber (default STAGING_DIR)")
+    parser.add_argument('--scale', type=int, default=1, help="Gandakan baris N kali")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--columns', nargs='+', default=None,
+                        help="Kolom untuk uji projection (default 3 kolom pertama)")
+    args = parser.parse_args()
+
+    print(f"=== BENCHMARK STAGING (scale={args.scale}, best of {args.repeat}) ===")
+    for name in args.names:
+        bench_dataset(name, args.scale, args.repeat, args.columns, args.dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# scripts/bench_train_models.py
+"""
+Benchmark engine training (train_models.ENGINES): waktu fit, waktu predict,
+accuracy, F1 dan ROC AUC berdampingan untuk beberapa ukuran data.
+
+Data dibangun dari data_gabungan.csv (tanpa database): baris diambil acak
+dengan pengembalian sampai ukuran yang diminta, lalu rating & subscribers
+diberi sedikit noise agar tidak ada duplikat persis. Nilai metrik absolut
+pada data hasil upsampling cenderung optimis; yang dibandingkan adalah
+selisih antar engine pada data yang sama.
+
+Contoh:
+    python bench_train_models.py --sizes 20000 200000 2000000 --workers 4
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import data_etl
+import staging
+import train_models as tm
+from feature_codec import ids_to_csr
+
+TARGETS = {
+    "Target_Audience": tm.FEATURES_TARGET_AUDIENCE,
+    "Popularity": tm.FEATURES_TIER,
+    "Viral_Potential": tm.FEATURES_TIER,
+}
+
+
+def build_frame(input_file, n_rows, seed):
+    """Data dim_comics sintetis berukuran n_rows + matriks genre (CSR)."""
+    source = staging.read_frame(input_file)
+    rng = np.random.default_rng(seed)
+    df = source.iloc[rng.integers(0, len(source), n_rows)].reset_index(drop=True)
+
+    for col in ['rating', 'subscribers', 'year']:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    df['rating'] = (df['rating'] + rng.normal(0, 0.05, n_rows)).clip(0, 5)
+    df['subscribers'] = df['subscribers'] * rng.lognormal(0, 0.05, n_rows)
+
+    vocabs, _ = data_etl.build_vocab(df)
+    df = data_etl.transform_comics(df, vocabs)
+    genre_matrix = ids_to_csr(df['genre_ids'], len(vocabs['genre']))
+    return df, genre_matrix
+
+
+def target_data(df, df_completed, df_ongoing, target):
+    frame = {"Popularity": df_completed, "Viral_Potential": df_ongoing}.get(target, df)
+    return frame, frame[target]
+
+
+def bench_engine(X, y, engine, n_jobs):
+    start = time.perf_counter()
+    model, le_y, metrics = tm.train_model(X, y, engine, n_jobs=n_jobs)
+    t_fit = time.perf_counter() - start  # termasuk predict pada test split
+
+    X_pred = tm.engine_input(X, engine)
+    start = time.perf_counter()
+    with tm.threadpool_limits(limits=n_jobs, user_api="openmp"):
+        model.predict(X_pred)
+    t_predict = time.perf_counter() - start
+    return t_fit, t_predict, metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--input', default=data_etl.INPUT_FILE)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20_000, 200_000, 2_000_000])
+    parser.add_argument('--engines', nargs='+', choices=sorted(tm.ENGINES), default=list(tm.ENGINES))
+    parser.add_argument('--target', choices=sorted(TARGETS), default="Target_Audience")
+    parser.add_argument('--workers', type=int, default=1, help="n_jobs / thread per model")
+    parser.add_argument(
+        '--exact-max-rows', type=int, default=200_000,
+        help="Lewati engine 'gb' (split eksak) di atas jumlah baris ini"
+    )
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rows = []
+    for n_rows in args.sizes:
+        df, genre_matrix = build_frame(args.input, n_rows, args.seed)
+        df, df_completed, df_ongoing, _ = tm.prepare_data(df)
+        frame, y = target_data(df, df_completed, df_ongoing, args.target)
+        X = tm.feature_matrix(frame, TARGETS[args.target], genre_matrix)
+        print(f"=== {args.target}: {n_rows:,} baris ({X.shape[0]:,} baris latih+uji, {X.shape[1]} fitur) ===")
+
+        for engine in args.engines:
+            if engine == "gb" and n_rows > args.exact_max_rows:
+                print(f"{engine:<11} dilewati (> --exact-max-rows)")
+                continue
+            t_fit, t_predict, m = bench_engine(X, y, engine, args.workers)
+            rows.append((n_rows, engine, t_fit, t_predict, m))
+            print(
+                f"{engine:<11} fit {t_fit:8.2f} s | predict {t_predict:7.2f} s | "
+                f"acc {m['accuracy']:.4f} | f1 {m['f1_score']:.4f} | auc {m['roc_auc']:.4f}"
+            )
+
+    print("\n=== RINGKASAN ===")
+    print(f"{'baris':>10} {'engine':<11} {'fit (s)':>9} {'predict (s)':>12} {'accuracy':>9} {'f1':>7} {'roc_auc':>8}")
+    for n_rows, engine, t_fit, t_predict, m in rows:
+        print(
+            f"{n_rows:>10,} {engine:<11} {t_fit:>9.2f} {t_predict:>12.2f} "
+            f"{m['accuracy']:>9.4f} {m['f1_score']:>7.4f} {m['roc_auc']:>8.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# scripts/bench_tuning.py
+"""
+Benchmark tuning (tuning.py): successive halving vs grid penuh dengan
+kandidat & fold CV yang sama. Dibandingkan waktu, jumlah fit, biaya
+relatif (baris latih) dan skor CV pemenang.
+
+Data dibangun seperti bench_train_models.py (data_gabungan.csv di-upsample,
+tanpa database).
+
+Contoh:
+    python bench_tuning.py --rows 5000 --target Popularity --candidates 12
+"""
+import argparse
+import time
+
+from sklearn.preprocessing import LabelEncoder
+
+import data_etl
+import train_models as tm
+import tuning
+from bench_train_models import TARGETS, build_frame, target_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--input', default=data_etl.INPUT_FILE)
+    parser.add_argument('--rows', type=int, default=5_000)
+    parser.add_argument('--target', choices=sorted(TARGETS), default="Popularity")
+    parser.add_argument('--engines', nargs='+', choices=sorted(tm.ENGINES), default=list(tm.ENGINES))
+    parser.add_argument('--candidates', type=int, default=tuning.N_CANDIDATES)
+    parser.add_argument('--cv-folds', type=int, default=tuning.CV_FOLDS)
+    parser.add_argument('--eta', type=int, default=tuning.ETA)
+    parser.add_argument('--workers', type=int, default=1, help="Proses evaluasi kandidat paralel")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    df, genre_matrix = build_frame(args.input, args.rows, args.seed)
+    df, df_completed, df_ongoing, _ = tm.prepare_data(df)
+    frame, y = target_data(df, df_completed, df_ongoing, args.target)
+    X = tm.feature_matrix(frame, TARGETS[args.target], genre_matrix)
+    y = LabelEncoder().fit_transform(y)
+    print(f"=== {args.target}: {X.shape[0]:,} baris, {X.shape[1]} fitur, {args.cv_folds} fold ===")
+
+    results = {}
+    for name, halving in (("halving", True), ("grid", False)):
+        start = time.perf_counter()
+        results[name] = tuning.successive_halving(
+            X, y, args.engines, args.candidates, args.cv_folds, args.eta,
+            max_workers=args.workers, seed=args.seed, halving=halving
+        )
+        results[name]["wall_s"] = time.perf_counter() - start
+
+    print("\n=== RINGKASAN ===")
+    print(f"{'metode':<8} {'detik':>8} {'fit':>5} {'biaya':>6} {'CV F1':>7}  pemenang")
+    for name, r in results.items():
+        n_fits = sum(h["candidates"] for h in r["history"]) * r["cv_folds"]
+        print(
+            f"{name:<8} {r['wall_s']:>8.1f} {n_fits:>5} {r['cost_vs_grid']:>6.0%} "
+            f"{r['cv_f1']:>7.4f}  {r['engine']} {r['params']}"
+        )
+    print(f"Waktu halving / grid: {results['halving']['wall_s'] / results['grid']['wall_s']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
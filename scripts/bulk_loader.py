@@ -0,0 +1,126 @@
+# scripts/bulk_loader.py
+"""
+Bulk load DataFrame ke PostgreSQL dengan COPY FROM STDIN (psycopg2).
+
+- copy_into   : COPY ke tabel yang sudah ada, per chunk, di dalam transaksi
+                milik pemanggil.
+- bulk_replace: muat ke tabel staging lalu tukar (DROP + RENAME) dalam satu
+                transaksi, sehingga pembaca tidak pernah melihat tabel yang
+                setengah terisi.
+"""
+import io
+
+import numpy as np
+import pandas as pd
+from psycopg2.extensions import quote_ident
+from sqlalchemy import Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+
+import instrument
+
+DEFAULT_CHUNKSIZE = 50_000
+
+
+def _column_list(cur, df):
+    return ', '.join(quote_ident(str(c), cur) for c in df.columns)
+
+
+def _array_columns(df):
+    """Kolom object yang berisi list (mis. genre_ids) → kolom array PostgreSQL."""
+    cols = []
+    for col in df.columns:
+        if df[col].dtype == object:
+            first = df[col].dropna().head(1)
+            if len(first) and isinstance(first.iloc[0], (list, tuple, np.ndarray)):
+                cols.append(col)
+    return cols
+
+
+def _to_copy_frame(df, array_cols):
+    """List Python → literal array PostgreSQL '{1,2,3}' untuk COPY csv."""
+    if not array_cols:
+        return df
+    df = df.copy()
+    for col in array_cols:
+        df[col] = df[col].map(
+            lambda xs: '{' + ','.join(str(x) for x in xs) + '}'
+            if isinstance(xs, (list, tuple, np.ndarray)) else None
+        )
+    return df
+
+
+def copy_into(dbapi_conn, df, table, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    COPY df ke `table` (harus sudah ada) lewat koneksi psycopg2. Tidak
+    melakukan commit. Mengembalikan jumlah baris yang dimuat.
+    Dicatat instrument sebagai tahap db_write.<table>.
+    """
+    with instrument.stage(f"db_write.{table.removesuffix('__staging')}", rows=len(df)):
+        df = _to_copy_frame(df, _array_columns(df))
+        cur = dbapi_conn.cursor()
+        try:
+            sql = (
+                f"COPY {quote_ident(table, cur)} ({_column_list(cur, df)}) "
+                "FROM STDIN WITH (FORMAT csv)"
+            )
+            for start in range(0, len(df), chunksize):
+                buf = io.StringIO()
+                df.iloc[start:start + chunksize].to_csv(buf, index=False, header=False)
+                buf.seek(0)
+                cur.copy_expert(sql, buf)
+        finally:
+            cur.close()
+    return len(df)
+
+
+def bulk_replace(df, table, engine, chunksize=DEFAULT_CHUNKSIZE, primary_key=None,
+                 dtype_overrides=None):
+    """
+    Ganti isi `table` dengan df: CREATE staging → COPY per chunk →
+    (PRIMARY KEY) → DROP tabel lama + RENAME staging, semuanya dalam satu
+    transaksi. Tipe kolom sama dengan DataFrame.to_sql; kolom berisi list
+    menjadi INTEGER[] kecuali ditentukan lain lewat `dtype`.
+    Tabel yang masih dipakai view / foreign key lain tidak bisa diganti
+    (DROP gagal, tidak ada yang berubah); tabel seperti itu diisi dengan
+    copy_into.
+    """
+    staging = f"{table}__staging"
+    dtype = {col: ARRAY(Integer) for col in _array_columns(df)}
+    dtype.update(dtype_overrides or {})
+    schema_sql = pd.io.sql.get_schema(df, staging, con=engine, dtype=dtype or None)
+
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        cur.execute(f"DROP TABLE IF EXISTS {quote_ident(staging, cur)};")
+        cur.execute(schema_sql)
+
+        copy_into(raw, df, staging, chunksize)
+
+        if primary_key:
+            cur.execute(
+                f"ALTER TABLE {quote_ident(staging, cur)} "
+                f"ADD PRIMARY KEY ({quote_ident(primary_key, cur)});"
+            )
+
+        # Tanpa CASCADE: view / foreign key yang bergantung pada tabel lama
+        # membuat DROP gagal (transaksi dibatalkan), bukan ikut terhapus diam-diam
+        cur.execute(f"DROP TABLE IF EXISTS {quote_ident(table, cur)};")
+        cur.execute(
+            f"ALTER TABLE {quote_ident(staging, cur)} RENAME TO {quote_ident(table, cur)};"
+        )
+        if primary_key:
+            # Nama constraint ikut nama tabel staging; samakan dengan tabel final
+            cur.execute(
+                f"ALTER TABLE {quote_ident(table, cur)} RENAME CONSTRAINT "
+                f"{quote_ident(staging + '_pkey', cur)} TO {quote_ident(table + '_pkey', cur)};"
+            )
+        raw.commit()
+        cur.close()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+    return len(df)
@@ -0,0 +1,201 @@
+# scripts/dashboard_queries.py
+"""
+Query layer dashboard: setiap widget hanya mengambil data yang dibutuhkan
+dari star schema (agregasi GROUP BY, top-N ORDER BY ... LIMIT), bukan
+SELECT * lalu diolah di pandas.
+
+Index pendukung didefinisikan di dw_schema.DW_INDEXES_DDL. Tanpa filter
+genre, query dijawab dari materialized view ringkasan
+(dw_schema.DW_SUMMARY_VIEWS_DDL) jika summary=True.
+"""
+import pandas as pd
+from sqlalchemy import text
+
+from dw_schema import SUMMARY_TOP_N, SUMMARY_TOP_ORDER, SUMMARY_VIEWS
+
+# Kolom prediksi yang boleh dipakai (nama kolom tidak bisa di-bind parameter)
+PRED_COLUMNS = ("Target_Audience_Pred", "Popularity_Pred", "Viral_Potential_Pred")
+ORDER_COLUMNS = ("rating", "subscribers")
+RECOMMENDATION_COLUMNS = ["title", "author", "genre", "rating", "subscribers"]
+
+
+def _genre_filter(genre_ids):
+    """Klausa filter genre lewat bridge_comic_genre (index genre_id, title_id)."""
+    if not genre_ids:
+        return "", {}
+    return (
+        "f.title_id IN (SELECT title_id FROM bridge_comic_genre WHERE genre_id = ANY(:genre_ids))",
+        {"genre_ids": [int(i) for i in genre_ids]}
+    )
+
+
+def _where(*clauses):
+    clauses = [c for c in clauses if c]
+    return "WHERE " + " AND ".join(clauses) if clauses else ""
+
+
+def _check_column(col, allowed):
+    if col not in allowed:
+        raise ValueError(f"Kolom tidak dikenal: {col}")
+    return f'"{col}"'
+
+
+def summaries_ready(engine):
+    """True jika semua materialized view ringkasan sudah ada & terisi."""
+    sql = """
+        SELECT COUNT(*) FROM pg_matviews
+        WHERE matviewname = ANY(:names) AND ispopulated
+    """
+    with engine.connect() as conn:
+        return conn.execute(text(sql), {"names": SUMMARY_VIEWS}).scalar_one() == len(SUMMARY_VIEWS)
+
+
+def catalog_stats(engine, genre_ids=(), summary=False):
+    """Total komik, rata-rata rating, jumlah author, total subscribers."""
+    if summary and not genre_ids:
+        sql = "SELECT total, avg_rating, authors, subscribers FROM mv_catalog_stats"
+        with engine.connect() as conn:
+            return dict(conn.execute(text(sql)).mappings().one())
+
+    genre_sql, params = _genre_filter(genre_ids)
+    sql = f"""
+        SELECT COUNT(*) AS total,
+               AVG(d.rating) AS avg_rating,
+               COUNT(DISTINCT d.author_id) AS authors,
+               COALESCE(SUM(d.subscribers), 0) AS subscribers
+        FROM fact_predictions f
+        JOIN dim_comics d USING (title_id)
+        {_where(genre_sql)}
+    """
+    with engine.connect() as conn:
+        return dict(conn.execute(text(sql), params).mappings().one())
+
+
+def label_counts(engine, pred_col, genre_ids=(), summary=False):
+    """Distribusi label prediksi (Kategori, Jumlah), urut jumlah terbanyak."""
+    col = _check_column(pred_col, PRED_COLUMNS)
+    if summary and not genre_ids:
+        sql = """
+            SELECT label AS "Kategori", n AS "Jumlah"
+            FROM mv_label_counts
+            WHERE pred_col = :pred_col
+            ORDER BY n DESC, label
+        """
+        with engine.connect() as conn:
+            return pd.read_sql(text(sql), conn, params={"pred_col": pred_col})
+
+    genre_sql, params = _genre_filter(genre_ids)
+    sql = f"""
+        SELECT {col} AS "Kategori", COUNT(*) AS "Jumlah"
+        FROM fact_predictions f
+        {_where(f"{col} IS NOT NULL", genre_sql)}
+        GROUP BY {col}
+        ORDER BY "Jumlah" DESC, {col}
+    """
+    with engine.connect() as conn:
+        return pd.read_sql(text(sql), conn, params=params)
+
+
+def top_comics(engine, pred_col, label, order_by, limit, genre_ids=(), summary=False):
+    """Top-N komik untuk satu label, urut menurun menurut kolom order_by."""
+    col = _check_column(pred_col, PRED_COLUMNS)
+    if (summary and not genre_ids and limit <= SUMMARY_TOP_N
+            and tuple(order_by) == SUMMARY_TOP_ORDER[pred_col]):
+        sql = """
+            SELECT title, author, genre, rating, subscribers
+            FROM mv_top_comics
+            WHERE pred_col = :pred_col AND label = :label AND rank <= :limit
+            ORDER BY rank
+        """
+        params = {"pred_col": pred_col, "label": label, "limit": int(limit)}
+        with engine.connect() as conn:
+            return pd.read_sql(text(sql), conn, params=params)
+
+    order_sql = ", ".join(
+        f"d.{_check_column(c, ORDER_COLUMNS)} DESC NULLS LAST" for c in order_by
+    )
+    genre_sql, params = _genre_filter(genre_ids)
+    sql = f"""
+        SELECT d.title, a.author, d.genre, d.rating, d.subscribers
+        FROM fact_predictions f
+        JOIN dim_comics d USING (title_id)
+        LEFT JOIN dim_author a USING (author_id)
+        {_where(f"f.{col} = :label", genre_sql)}
+        ORDER BY {order_sql}, d.title_id
+        LIMIT :limit
+    """
+    params.update({"label": label, "limit": int(limit)})
+    with engine.connect() as conn:
+        return pd.read_sql(text(sql), conn, params=params)
+
+
+
+def run_metric_trends(engine, max_runs=30):
+    """
+    Record instrument (tabel run_metrics) dari max_runs run terakhir,
+    diagregasi per (run_id, stage): total wall/CPU time & baris, baris/detik
+    gabungan, puncak RSS. DataFrame kosong jika tabel belum ada.
+    """
+    sql = """
+        SELECT run_id, stage, MIN(started_at) AS started_at, COUNT(*) AS calls,
+               SUM(wall_s) AS wall_s, SUM(cpu_s) AS cpu_s, SUM(rows) AS rows,
+               SUM(rows) / NULLIF(SUM(wall_s), 0) AS rows_per_s,
+               MAX(peak_rss_mb) AS peak_rss_mb,
+               BOOL_OR(status <> 'ok') AS failed
+        FROM run_metrics
+        WHERE run_id IN (
+            SELECT run_id FROM run_metrics
+            GROUP BY run_id ORDER BY MAX(started_at) DESC LIMIT :max_runs
+        )
+        GROUP BY run_id, stage
+        ORDER BY started_at
+    """
+    with engine.connect() as conn:
+        if conn.execute(text("SELECT to_regclass('run_metrics')")).scalar() is None:
+            return pd.DataFrame()
+        return pd.read_sql(text(sql), conn, params={"max_runs": int(max_runs)})
+
+
+def search_titles(engine, query, limit=20):
+    """
+    Judul untuk pilihan "Komik Serupa" (title_id, title, author): judul
+    berawalan `query` dulu (index idx_comics_title_prefix), lalu judul yang
+    mengandung `query` jika hasilnya belum mencapai limit.
+    """
+    sql = """
+        SELECT d.title_id, d.title, a.author
+        FROM dim_comics d
+        LEFT JOIN dim_author a USING (author_id)
+        WHERE {condition}
+        ORDER BY lower(d.title), d.title_id
+        LIMIT :limit
+    """
+    escaped = query.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    with engine.connect() as conn:
+        found = pd.read_sql(
+            text(sql.format(condition="lower(d.title) LIKE :pattern")), conn,
+            params={"pattern": escaped + "%", "limit": int(limit)}
+        )
+        if len(found) < limit:
+            more = pd.read_sql(
+                text(sql.format(condition="lower(d.title) LIKE :pattern AND NOT (d.title_id = ANY(:found))")),
+                conn,
+                params={"pattern": "%" + escaped + "%", "found": found["title_id"].tolist(),
+                        "limit": int(limit) - len(found)}
+            )
+            found = pd.concat([found, more], ignore_index=True)
+    return found
+
+
+def similar_comics(engine, title_id, limit=10):
+    """Top-N komik serupa (tabel similar_comics, lookup PRIMARY KEY)."""
+    sql = """
+        SELECT d.title, a.author, d.genre, d.rating, d.subscribers, s.score
+        FROM similar_comics s
+        JOIN dim_comics d ON d.title_id = s.similar_id
+        LEFT JOIN dim_author a USING (author_id)
+        WHERE s.title_id = :title_id AND s.rank <= :limit
+        ORDER BY s.rank
+    """
+    with engine.connect() as conn:
+        return pd.read_sql(text(sql), conn, params={"title_id": int(title_id), "limit": int(limit)})
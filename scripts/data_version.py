@@ -0,0 +1,39 @@
+# scripts/data_version.py
+"""
+Stempel versi data: setiap tahap pipeline yang menulis ke gudang (ETL,
+training, scoring) menambah satu baris di pipeline_runs. run_id terbesar
+adalah versi data saat ini; dashboard memakainya sebagai kunci cache.
+"""
+from sqlalchemy import text, inspect
+
+PIPELINE_RUNS_DDL = """
+    CREATE TABLE IF NOT EXISTS pipeline_runs (
+        run_id BIGSERIAL PRIMARY KEY,
+        stage TEXT NOT NULL,
+        rows_written BIGINT,
+        finished_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    );
+"""
+
+
+def record_run(conn, stage, rows_written=None):
+    """
+    Catat satu run (koneksi SQLAlchemy, ikut transaksi pemanggil).
+    Mengembalikan run_id baru.
+    """
+    conn.execute(text(PIPELINE_RUNS_DDL))
+    return conn.execute(
+        text("INSERT INTO pipeline_runs (stage, rows_written) VALUES (:stage, :rows) RETURNING run_id"),
+        {"stage": stage, "rows": None if rows_written is None else int(rows_written)}
+    ).scalar_one()
+
+
+def current_version(engine):
+    """Run terakhir sebagai dict (run_id, stage, finished_at); run_id 0 jika belum ada."""
+    with engine.connect() as conn:
+        if not inspect(conn).has_table('pipeline_runs'):
+            return {"run_id": 0, "stage": None, "finished_at": None}
+        row = conn.execute(text(
+            "SELECT run_id, stage, finished_at FROM pipeline_runs ORDER BY run_id DESC LIMIT 1"
+        )).mappings().first()
+    return dict(row) if row else {"run_id": 0, "stage": None, "finished_at": None}
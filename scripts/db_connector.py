@@ -1,20 +1,171 @@
-import psycopg2
+"""
+Satu pintu akses database untuk semua script.
 
-def connect_db():
-    """Membuat dan mengembalikan koneksi ke PostgreSQL."""
-    conn = psycopg2.connect(
-        host="localhost",
-        database="datawarehouse",
-        user="postgres",
-        password="2004"
+Konfigurasi dibaca dari .env (root proyek) / environment:
+    DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD
+    DATABASE_URL                 (opsional, menimpa DB_* di atas)
+    DB_POOL_SIZE=5, DB_MAX_OVERFLOW=5, DB_POOL_TIMEOUT=30 (detik)
+    DB_POOL_RECYCLE=1800 (detik), DB_POOL_PRE_PING=true
+    DB_STATEMENT_TIMEOUT_MS=0    (0 = tanpa batas; untuk ETL / training)
+    DB_DASHBOARD_STATEMENT_TIMEOUT_MS=15000
+
+Engine SQLAlchemy dibuat sekali per proses (lazy) dan memakai pool
+koneksi; get_engine() berikutnya mengembalikan engine yang sama.
+"""
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine
+from sqlalchemy.engine import URL
+from sqlalchemy.pool import QueuePool
+
+ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".env")
+load_dotenv(ENV_FILE)
+
+# Query dashboard harus cepat; query yang macet dihentikan server
+DASHBOARD_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_DASHBOARD_STATEMENT_TIMEOUT_MS", 15000))
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def _env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+def _env_bool(name, default):
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+def database_url():
+    """URL database dari DATABASE_URL atau DB_* (.env)."""
+    if os.getenv("DATABASE_URL"):
+        return os.getenv("DATABASE_URL")
+    return URL.create(
+        "postgresql+psycopg2",
+        username=os.getenv("DB_USER", "postgres"),
+        password=os.getenv("DB_PASSWORD") or None,
+        host=os.getenv("DB_HOST", "localhost"),
+        port=_env_int("DB_PORT", 5432),
+        database=os.getenv("DB_NAME", "datawarehouse"),
     )
-    return conn
+
+
+# ===============================
+# POOL METRICS
+# ===============================
+class PoolMetrics:
+    """Jumlah checkout & waktu tunggu koneksi dari pool (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0          # checkout > 1 ms (menunggu koneksi bebas / membuka koneksi baru)
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, seconds):
+        with self._lock:
+            self.checkouts += 1
+            if seconds > 0.001:
+                self.waits += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+
+def _instrumented_pool(metrics):
+    class InstrumentedQueuePool(QueuePool):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                metrics.record(time.perf_counter() - start)
+
+    return InstrumentedQueuePool
+
+
+# ===============================
+# ENGINE
+# ===============================
+def get_engine(statement_timeout_ms=None, url=None):
+    """
+    Engine ber-pool (satu per kombinasi URL + statement timeout per proses).
+    statement_timeout_ms=None → DB_STATEMENT_TIMEOUT_MS.
+    """
+    if statement_timeout_ms is None:
+        statement_timeout_ms = _env_int("DB_STATEMENT_TIMEOUT_MS", 0)
+    url = url or database_url()
+    key = (str(url), statement_timeout_ms)
+
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            connect_args = {}
+            if statement_timeout_ms:
+                connect_args["options"] = f"-c statement_timeout={int(statement_timeout_ms)}"
+            metrics = PoolMetrics()
+            engine = create_engine(
+                url,
+                poolclass=_instrumented_pool(metrics),
+                pool_size=_env_int("DB_POOL_SIZE", 5),
+                max_overflow=_env_int("DB_MAX_OVERFLOW", 5),
+                pool_timeout=_env_int("DB_POOL_TIMEOUT", 30),
+                pool_recycle=_env_int("DB_POOL_RECYCLE", 1800),
+                pool_pre_ping=_env_bool("DB_POOL_PRE_PING", True),
+                connect_args=connect_args,
+            )
+            engine.pool_metrics = metrics
+            _engines[key] = engine
+    return engine
+
+
+def _discard_engines_after_fork():
+    """
+    Proses hasil fork (mis. worker training) tidak boleh memakai koneksi
+    pool milik induk; pool dilepas tanpa menutup koneksi induk.
+    """
+    for engine in _engines.values():
+        engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_discard_engines_after_fork)
+
+
+def pool_status(engine=None):
+    """Utilisasi pool & waktu tunggu checkout untuk engine (default: get_engine())."""
+    engine = engine or get_engine()
+    pool = engine.pool
+    metrics = engine.pool_metrics
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    checked_out = pool.checkedout()
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_out": checked_out,
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "utilization": checked_out / capacity if capacity else 0.0,
+        "checkouts": metrics.checkouts,
+        "waits": metrics.waits,
+        "wait_avg_ms": metrics.wait_total / metrics.checkouts * 1000 if metrics.checkouts else 0.0,
+        "wait_max_ms": metrics.wait_max * 1000,
+    }
+
+
+def connect_db():
+    """Koneksi psycopg2 dari pool; close() mengembalikannya ke pool."""
+    return get_engine().raw_connection()
 
 if __name__ == "__main__":
     try:
         conn = connect_db()
-        print("✅ Koneksi ke PostgreSQL berhasil!") 
+        print("✅ Koneksi ke PostgreSQL berhasil!")
         conn.close()
+        print(pool_status())
     except Exception as e:
         print("❌ Koneksi GAGAL. Cek kredensial Anda.")
         print(f"Detail Error: {e}")
@@ -0,0 +1,187 @@
+# scripts/dw_frames.py
+"""
+Tipe kolom DataFrame untuk tabel/view DW + pembacaan terproyeksi per
+konsumen, ber-chunk lewat server-side cursor.
+
+- COLUMN_DTYPES : satu tipe per nama kolom (sama di semua tabel). Numerik
+                  di-downcast (title_id int32, subscribers Int32, rating
+                  float32, year Int16, ...; tipe "Int" = nullable), teks
+                  berkardinalitas rendah (status, length, label prediksi,
+                  ...) menjadi category. Teks bebas (title, synopsis) dan
+                  author (hampir unik per komik) tetap string.
+- PROJECTIONS   : kolom yang benar-benar dipakai tiap konsumen, sehingga
+                  synopsis dkk. tidak ikut dibaca jika tidak perlu.
+- read_chunks   : iterasi DataFrame per chunk dari server-side cursor
+                  (stream_results); hasil query tidak ditampung utuh di
+                  memori klien.
+- read_frame    : gabungan chunk (kategori di-union antar chunk).
+- FrozenFrame   : DataFrame baca-saja yang dibagi antar sesi dashboard
+                  (array kolom read-only + view DataFrame tanpa salinan).
+
+Laporan memori sebelum/sesudah per tahap: bench_memory.py.
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+# Baris per chunk server-side cursor; puncak memori baca ± satu chunk objek Python
+READ_CHUNK_ROWS = 10_000
+
+COLUMN_DTYPES = {
+    "title_id": "int32",
+    "similar_id": "int32",
+    "author_id": "Int32",
+    "status_id": "int16",
+    "genre_id": "int16",
+    "weekday_mask": "int16",
+    "rank": "int16",
+    "subscribers": "Int32",
+    "year": "Int16",
+    "rating": "float32",
+    "score": "float32",
+    "genre": "category",
+    "status": "category",
+    "length": "category",
+    "weekdays": "category",
+    "source_type": "category",
+    "Target_Audience_Pred": "category",
+    "Popularity_Pred": "category",
+    "Viral_Potential_Pred": "category",
+}
+
+# Fitur model (train_models / score_models): FEATURES_*, status, genre_ids
+# dan kolom fact_predictions (title_id, row_hash)
+MODEL_COLUMNS = [
+    "title_id", "genre", "author", "length", "status",
+    "rating", "subscribers", "year", "genre_ids", "row_hash",
+]
+
+PROJECTIONS = {
+    "train_models": MODEL_COLUMNS,
+    "score_models": MODEL_COLUMNS,
+    "similar_comics": ["title_id", "author_id", "synopsis", "genre_ids"],
+    "subscriber_tiers": ["title_id", "status", "subscribers"],
+}
+
+
+# ===============================
+# DTYPE
+# ===============================
+def _fits(series, dtype):
+    """Nilai integer muat di dtype (mis. subscribers > 2^31 tidak muat di Int32)?"""
+    info = np.iinfo(dtype.lower())
+    values = series.dropna()
+    return values.empty or (values.min() >= info.min and values.max() <= info.max)
+
+
+def compact(df):
+    """Terapkan COLUMN_DTYPES ke kolom df yang dikenal (in place, dikembalikan)."""
+    for col, dtype in COLUMN_DTYPES.items():
+        if col not in df.columns:
+            continue
+        series = df[col]
+        if dtype == "category":
+            df[col] = series.astype("category")
+        elif dtype.lower().startswith("int"):
+            series = pd.to_numeric(series, errors="coerce")
+            if not _fits(series, dtype):
+                dtype = "Int64" if dtype[0] == "I" else "int64"
+            elif dtype[0] == "i" and series.isna().any():
+                dtype = dtype.capitalize()
+            df[col] = series.astype(dtype)
+        else:
+            df[col] = pd.to_numeric(series, errors="coerce").astype(dtype)
+    return df
+
+
+def frame_mb(df):
+    """Ukuran DataFrame di memori (termasuk isi string), MB."""
+    return df.memory_usage(deep=True).sum() / 2 ** 20
+
+
+def _read_only(series):
+    """Salinan kolom; array numpy dibuat tidak bisa ditulis."""
+    if isinstance(series.dtype, pd.api.extensions.ExtensionDtype):
+        return series.array.copy()
+    values = series.to_numpy(copy=True)
+    values.flags.writeable = False
+    return values
+
+
+class FrozenFrame:
+    """
+    Kolom DataFrame sebagai array read-only untuk dibagi antar thread /
+    sesi. Per entri lebih kecil dari DataFrame (tanpa BlockManager) maupun
+    pickle-nya; view() membuat DataFrame di atas array yang sama.
+    """
+
+    __slots__ = ("columns", "index")
+
+    def __init__(self, df):
+        self.columns = {col: _read_only(df[col]) for col in df.columns}
+        self.index = df.index
+
+    def view(self):
+        # Tanpa salinan: menulis ke kolom numpy → ValueError, bukan
+        # mengubah data pemakai lain
+        return pd.DataFrame(self.columns, index=self.index, copy=False)
+
+
+# ===============================
+# PEMBACAAN
+# ===============================
+def select_sql(relation, consumer, where=None, order_by="title_id", alias=None):
+    """
+    SELECT kolom PROJECTIONS[consumer] dari relation (tabel / view / join);
+    alias → kolom diberi prefix alias (untuk join dengan nama kolom sama).
+    """
+    prefix = f"{alias}." if alias else ""
+    sql = f"SELECT {', '.join(prefix + _quote(c) for c in PROJECTIONS[consumer])} FROM {relation}"
+    if where:
+        sql += f" WHERE {where}"
+    if order_by:
+        sql += f" ORDER BY {order_by}"
+    return sql
+
+
+def _quote(col):
+    return f'"{col}"' if col != col.lower() else col
+
+
+def read_chunks(conn, sql, params=None, chunksize=READ_CHUNK_ROWS):
+    """
+    DataFrame per chunk (sudah compact) dari server-side cursor. conn boleh
+    Engine (koneksi dibuka & ditutup di sini) atau Connection milik
+    pemanggil (mis. di dalam transaksi yang juga menulis).
+    """
+    statement = text(sql).execution_options(stream_results=True, max_row_buffer=chunksize)
+    if isinstance(conn, Engine):
+        with conn.connect() as own:
+            yield from read_chunks(own, sql, params, chunksize)
+        return
+    for chunk in pd.read_sql(statement, conn, params=params, chunksize=chunksize):
+        yield compact(chunk)
+
+
+def concat_frames(chunks):
+    """pd.concat yang mempertahankan kolom category (kategori di-union)."""
+    chunks = list(chunks)
+    if not chunks:
+        return pd.DataFrame()
+    if len(chunks) == 1:
+        return chunks[0].reset_index(drop=True)
+    columns = chunks[0].columns
+    cats = [c for c in columns if isinstance(chunks[0][c].dtype, pd.CategoricalDtype)]
+    unions = {c: union_categoricals([chunk[c] for chunk in chunks]) for c in cats}
+    df = pd.concat([chunk.drop(columns=cats) for chunk in chunks], ignore_index=True)
+    for c in cats:
+        df[c] = unions[c]
+    return df[columns]
+
+
+def read_frame(conn, relation, consumer, where=None, order_by="title_id", params=None,
+               chunksize=READ_CHUNK_ROWS):
+    """Proyeksi `consumer` dari relation sebagai satu DataFrame compact."""
+    return concat_frames(read_chunks(conn, select_sql(relation, consumer, where, order_by), params, chunksize))
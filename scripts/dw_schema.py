@@ -1,6 +1,232 @@
 # scripts/dw_schema.py
 from db_connector import connect_db
 
+# =============================
+# STAR SCHEMA
+# =============================
+# dim_comics di tengah; author & status sebagai dimensi sendiri, genre lewat
+# tabel bridge (satu komik bisa banyak genre), weekdays lewat bitmask
+# weekday_mask terhadap dim_weekday. fact_predictions hanya berisi label
+# prediksi per title_id. Loader (data_etl, train_models, score_models)
+# menulis ke tabel ini tanpa membuatnya ulang, sehingga key & index tetap ada.
+DW_TABLES_DDL = [
+    """CREATE TABLE IF NOT EXISTS dim_author (
+        author_id INTEGER PRIMARY KEY,
+        author TEXT NOT NULL UNIQUE
+    );""",
+    """CREATE TABLE IF NOT EXISTS dim_status (
+        status_id SMALLINT PRIMARY KEY,
+        status TEXT NOT NULL UNIQUE
+    );""",
+    """CREATE TABLE IF NOT EXISTS dim_genre (
+        genre_id SMALLINT PRIMARY KEY,
+        genre TEXT NOT NULL UNIQUE
+    );""",
+    """CREATE TABLE IF NOT EXISTS dim_weekday (
+        weekday_id SMALLINT PRIMARY KEY,
+        weekday TEXT NOT NULL UNIQUE
+    );""",
+    """CREATE TABLE IF NOT EXISTS dim_comics (
+        title_id INTEGER PRIMARY KEY,
+        title TEXT,
+        genre TEXT,
+        author_id INTEGER REFERENCES dim_author (author_id),
+        status_id SMALLINT REFERENCES dim_status (status_id),
+        weekdays TEXT,
+        length TEXT,
+        subscribers BIGINT,
+        rating DOUBLE PRECISION,
+        year INTEGER,
+        source_type TEXT,
+        synopsis TEXT,
+        genre_ids INTEGER[],
+        weekday_mask SMALLINT,
+        row_hash BIGINT NOT NULL
+    );""",
+    """CREATE TABLE IF NOT EXISTS bridge_comic_genre (
+        title_id INTEGER REFERENCES dim_comics (title_id) ON DELETE CASCADE,
+        genre_id SMALLINT REFERENCES dim_genre (genre_id),
+        PRIMARY KEY (title_id, genre_id)
+    );""",
+    """CREATE TABLE IF NOT EXISTS fact_predictions (
+        title_id INTEGER PRIMARY KEY REFERENCES dim_comics (title_id) ON DELETE CASCADE,
+        "Target_Audience_Pred" TEXT,
+        "Popularity_Pred" TEXT,
+        "Viral_Potential_Pred" TEXT,
+        row_hash BIGINT,
+        scored_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    );""",
+]
+
+# Top-k komik serupa per title_id (similar_comics.py); PRIMARY KEY
+# (title_id, rank) → lookup "more like this" di dashboard lewat index
+SIMILAR_COMICS_DDL = """CREATE TABLE IF NOT EXISTS similar_comics (
+        title_id INTEGER REFERENCES dim_comics (title_id) ON DELETE CASCADE,
+        rank SMALLINT,
+        similar_id INTEGER NOT NULL REFERENCES dim_comics (title_id) ON DELETE CASCADE,
+        score REAL NOT NULL,
+        PRIMARY KEY (title_id, rank)
+    );"""
+DW_TABLES_DDL.append(SIMILAR_COMICS_DDL)
+
+# Index pendukung filter & top-N dashboard (dashboard_queries.py)
+DW_INDEXES_DDL = [
+    "CREATE INDEX IF NOT EXISTS idx_comics_author ON dim_comics (author_id);",
+    "CREATE INDEX IF NOT EXISTS idx_comics_status ON dim_comics (status_id);",
+    """CREATE INDEX IF NOT EXISTS idx_comics_rating_top ON dim_comics
+       (rating DESC NULLS LAST, subscribers DESC NULLS LAST, title_id);""",
+    """CREATE INDEX IF NOT EXISTS idx_comics_subscribers_top ON dim_comics
+       (subscribers DESC NULLS LAST, title_id);""",
+    "CREATE INDEX IF NOT EXISTS idx_bridge_genre ON bridge_comic_genre (genre_id, title_id);",
+    # Pencarian judul berawalan (Komik Serupa): lower(title) LIKE 'abc%'
+    "CREATE INDEX IF NOT EXISTS idx_comics_title_prefix ON dim_comics (lower(title) text_pattern_ops);",
+    'CREATE INDEX IF NOT EXISTS idx_fact_ta ON fact_predictions ("Target_Audience_Pred");',
+    'CREATE INDEX IF NOT EXISTS idx_fact_popularity ON fact_predictions ("Popularity_Pred");',
+    'CREATE INDEX IF NOT EXISTS idx_fact_viral ON fact_predictions ("Viral_Potential_Pred");',
+]
+
+# Komik lengkap dengan label author & status (dibaca training & scoring)
+DW_VIEWS_DDL = [
+    """CREATE OR REPLACE VIEW v_comics AS
+       SELECT d.*, a.author, s.status
+       FROM dim_comics d
+       LEFT JOIN dim_author a USING (author_id)
+       LEFT JOIN dim_status s USING (status_id);""",
+]
+
+# =============================
+# RINGKASAN DASHBOARD
+# =============================
+# Agregat halaman utama dashboard (tanpa filter genre) dihitung sekali
+# sebagai materialized view dan di-refresh setiap kali fact_predictions
+# ditulis (train_models, score_models), sehingga setiap pengunjung cukup
+# membaca beberapa baris ber-index.
+SUMMARY_TOP_N = 30          # = nilai maksimum slider Top N di dashboard
+SUMMARY_TOP_ORDER = {
+    "Target_Audience_Pred": ("rating", "subscribers"),
+    "Popularity_Pred": ("subscribers",),
+    "Viral_Potential_Pred": ("subscribers",),
+}
+
+
+def _top_comics_select(pred_col, order_by):
+    order_sql = ", ".join(f"d.{c} DESC NULLS LAST" for c in order_by)
+    return f"""
+       SELECT '{pred_col}'::text AS pred_col, label, rank,
+              title_id, title, author, genre, rating, subscribers
+       FROM (
+           SELECT f."{pred_col}" AS label,
+                  ROW_NUMBER() OVER (
+                      PARTITION BY f."{pred_col}" ORDER BY {order_sql}, d.title_id
+                  ) AS rank,
+                  d.title_id, d.title, a.author, d.genre, d.rating, d.subscribers
+           FROM fact_predictions f
+           JOIN dim_comics d USING (title_id)
+           LEFT JOIN dim_author a USING (author_id)
+           WHERE f."{pred_col}" IS NOT NULL
+       ) ranked
+       WHERE rank <= {SUMMARY_TOP_N}"""
+
+
+# Setiap view punya UNIQUE index → bisa REFRESH ... CONCURRENTLY
+DW_SUMMARY_VIEWS_DDL = [
+    """CREATE MATERIALIZED VIEW IF NOT EXISTS mv_catalog_stats AS
+       SELECT 1 AS id,
+              COUNT(*) AS total,
+              AVG(d.rating) AS avg_rating,
+              COUNT(DISTINCT d.author_id) AS authors,
+              COALESCE(SUM(d.subscribers), 0) AS subscribers
+       FROM fact_predictions f
+       JOIN dim_comics d USING (title_id)
+       WITH NO DATA;""",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_catalog_stats ON mv_catalog_stats (id);",
+    """CREATE MATERIALIZED VIEW IF NOT EXISTS mv_label_counts AS
+       SELECT p.pred_col, p.label, COUNT(*) AS n
+       FROM fact_predictions f
+       CROSS JOIN LATERAL (VALUES
+           ('Target_Audience_Pred', f."Target_Audience_Pred"),
+           ('Popularity_Pred', f."Popularity_Pred"),
+           ('Viral_Potential_Pred', f."Viral_Potential_Pred")
+       ) AS p (pred_col, label)
+       WHERE p.label IS NOT NULL
+       GROUP BY p.pred_col, p.label
+       WITH NO DATA;""",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_label_counts ON mv_label_counts (pred_col, label);",
+    "CREATE MATERIALIZED VIEW IF NOT EXISTS mv_top_comics AS"
+    + "\n       UNION ALL".join(
+        _top_comics_select(col, order) for col, order in SUMMARY_TOP_ORDER.items()
+    )
+    + "\n       WITH NO DATA;",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_top_comics ON mv_top_comics (pred_col, label, rank);",
+]
+
+SUMMARY_VIEWS = ["mv_catalog_stats", "mv_label_counts", "mv_top_comics"]
+
+DW_TABLES = [
+    "similar_comics", "fact_predictions", "bridge_comic_genre", "dim_comics",
+    "dim_author", "dim_status", "dim_genre", "dim_weekday",
+]
+
+
+def schema_ready(cur):
+    """True jika star schema (bukan tabel lama hasil to_sql) sudah ada."""
+    cur.execute("""
+        SELECT to_regclass('bridge_comic_genre') IS NOT NULL
+           AND to_regclass('v_comics') IS NOT NULL
+           AND EXISTS (
+               SELECT 1 FROM information_schema.columns
+               WHERE table_name = 'fact_predictions' AND column_name = 'scored_at'
+           );
+    """)
+    return cur.fetchone()[0]
+
+
+def build_dw_schema(cur, drop_existing):
+    """Buat tabel, index & view (cursor di dalam transaksi pemanggil)."""
+    if drop_existing:
+        cur.execute("; ".join(f"DROP TABLE IF EXISTS {t} CASCADE" for t in DW_TABLES) + ";")
+        print("✅ Tabel lama dihapus")
+
+    for ddl in DW_TABLES_DDL:
+        cur.execute(ddl)
+    print("✅ Tabel dimensi, bridge & fakta dibuat")
+
+    for ddl in DW_INDEXES_DDL:
+        cur.execute(ddl)
+    for ddl in DW_VIEWS_DDL + DW_SUMMARY_VIEWS_DDL:
+        cur.execute(ddl)
+    print("✅ Index & view dibuat")
+
+
+def ensure_dw_schema(cur):
+    """
+    Dipanggil loader (cursor di dalam transaksi pemanggil): buat star schema
+    jika belum ada. Tabel lama dengan layout berbeda dihapus dulu.
+    """
+    if not schema_ready(cur):
+        print("Star schema belum ada, membuat schema data warehouse...")
+        build_dw_schema(cur, drop_existing=True)
+
+
+def refresh_summary_views(cur):
+    """
+    Refresh materialized view ringkasan dashboard (cursor di dalam transaksi
+    pemanggil, setelah fact_predictions ditulis). View yang sudah terisi
+    di-refresh CONCURRENTLY supaya dashboard tetap bisa membaca selama refresh;
+    view yang belum ada (schema lama) dibuat dulu.
+    """
+    for ddl in DW_SUMMARY_VIEWS_DDL:
+        cur.execute(ddl)
+    cur.execute(
+        "SELECT matviewname, ispopulated FROM pg_matviews WHERE matviewname = ANY(%s);",
+        (SUMMARY_VIEWS,)
+    )
+    populated = dict(cur.fetchall())
+    for name in SUMMARY_VIEWS:
+        mode = "CONCURRENTLY " if populated.get(name) else ""
+        cur.execute(f"REFRESH MATERIALIZED VIEW {mode}{name};")
+
+
 def create_dw_schema():
     conn = None
     try:
@@ -8,41 +234,7 @@ def create_dw_schema():
         cur = conn.cursor()
 
         print("\n=== MEMBUAT SCHEMA DATA WAREHOUSE ===")
-        cur.execute("""
-            DROP TABLE IF EXISTS fact_predictions CASCADE;
-            DROP TABLE IF EXISTS dim_comics CASCADE;
-        """)
-        print("✅ Tabel lama dihapus")
-
-        # Tabel dimensi / ML-ready
-        cur.execute("""
-            CREATE TABLE dim_comics (
-                title_id SERIAL PRIMARY KEY,
-                title TEXT,
-                genre TEXT,
-                author TEXT,
-                weekdays TEXT,
-                length TEXT,
-                status TEXT,
-                rating NUMERIC(5,2),
-                subscribers BIGINT,
-                year INTEGER
-            );
-        """)
-        print("✅ dim_comics dibuat")
-
-        # Tabel prediksi
-        cur.execute("""
-            CREATE TABLE fact_predictions (
-                pred_id SERIAL PRIMARY KEY,
-                title_id INTEGER,
-                Target_Audience_Pred TEXT,
-                Popularity_Pred TEXT,
-                Viral_Potential_Pred TEXT,
-                FOREIGN KEY (title_id) REFERENCES dim_comics(title_id)
-            );
-        """)
-        print("✅ fact_predictions dibuat")
+        build_dw_schema(cur, drop_existing=True)
 
         conn.commit()
         print("\n🎉 SCHEMA DATA WAREHOUSE BERHASIL DIBUAT!")
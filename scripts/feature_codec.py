@@ -0,0 +1,88 @@
+# scripts/feature_codec.py
+"""
+Encoding ringkas untuk fitur multi-label (genre & weekdays).
+
+Di memori  : scipy.sparse CSR (baris = komik, kolom = id kosakata).
+Di gudang  : genre_ids INTEGER[] (daftar id genre) dan weekday_mask
+             SMALLINT (bit ke-i = weekday id i), dengan kosakata di tabel
+             dim_genre / dim_weekday.
+"""
+import numpy as np
+from scipy import sparse
+
+
+def split_labels(series):
+    """'ACTION, DRAMA' → ['ACTION', 'DRAMA'] untuk setiap baris."""
+    return series.astype(str).str.split(",").apply(lambda xs: [x.strip() for x in xs])
+
+
+def extend_vocab(vocab, label_lists):
+    """
+    Tambahkan label baru ke akhir kosakata (id lama tidak berubah).
+    Mengembalikan (kosakata_baru, label_yang_ditambahkan).
+    """
+    vocab = list(vocab)
+    known = set(vocab)
+    added = sorted({x for xs in label_lists for x in xs} - known)
+    return vocab + added, added
+
+
+def encode_multilabel(label_lists, vocab):
+    """Daftar label per baris → CSR (n_baris x len(vocab)) bertipe uint8."""
+    index = {label: i for i, label in enumerate(vocab)}
+    indptr = [0]
+    indices = []
+    for labels in label_lists:
+        ids = sorted({index[x] for x in labels if x in index})
+        indices.extend(ids)
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.uint8)
+    return sparse.csr_matrix(
+        (data, np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, len(vocab))
+    )
+
+
+def csr_to_ids(matrix):
+    """CSR → list id per baris (untuk kolom array PostgreSQL)."""
+    matrix = sparse.csr_matrix(matrix)
+    return [
+        matrix.indices[start:end].tolist()
+        for start, end in zip(matrix.indptr[:-1], matrix.indptr[1:])
+    ]
+
+
+def ids_to_csr(id_lists, n_classes):
+    """List id per baris (mis. hasil SELECT genre_ids) → CSR uint8."""
+    id_lists = [ids if isinstance(ids, (list, tuple, np.ndarray)) else [] for ids in id_lists]
+    lengths = np.fromiter((len(ids) for ids in id_lists), dtype=np.int64, count=len(id_lists))
+    indptr = np.concatenate([[0], np.cumsum(lengths)])
+    indices = (
+        np.concatenate([np.asarray(ids, dtype=np.int32) for ids in id_lists])
+        if indptr[-1] > 0 else np.empty(0, dtype=np.int32)
+    )
+    data = np.ones(len(indices), dtype=np.uint8)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(id_lists), n_classes))
+
+
+def pack_bitmask(matrix):
+    """CSR dengan ≤ 15 kolom → bitmask int16 per baris."""
+    matrix = sparse.csr_matrix(matrix)
+    if matrix.shape[1] > 15:
+        raise ValueError("pack_bitmask hanya untuk kosakata ≤ 15 label")
+    weights = (1 << np.arange(matrix.shape[1], dtype=np.int64))
+    return np.asarray(matrix @ weights, dtype=np.int16).ravel()
+
+
+def unpack_bitmask(masks, n_classes):
+    """Bitmask per baris → CSR uint8."""
+    masks = np.asarray(masks, dtype=np.int64)
+    bits = (masks[:, None] >> np.arange(n_classes, dtype=np.int64)) & 1
+    return sparse.csr_matrix(bits.astype(np.uint8))
+
+
+def any_of(matrix, ids):
+    """Mask boolean: baris yang memiliki minimal satu id dari `ids`."""
+    if len(ids) == 0:
+        return np.ones(matrix.shape[0], dtype=bool)
+    return np.asarray(matrix[:, list(ids)].sum(axis=1)).ravel() > 0
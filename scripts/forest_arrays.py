@@ -0,0 +1,185 @@
+# scripts/forest_arrays.py
+"""
+Random forest sklearn → array datar + prediktor numpy ber-batch.
+
+Semua pohon digabung menjadi array node kontigu (indeks node global):
+- feature   int32 (node)        fitur split; 0 untuk daun
+- threshold float32 (node)      ambang split; +inf untuk daun
+- children  int32 (node, 2)     anak kiri / kanan; daun menunjuk dirinya sendiri
+- leaf      int32 (node)        baris `value` untuk daun, -1 untuk node internal
+- value     float64 (daun, kelas) proba daun (value / jumlah value, sama
+                                dengan DecisionTreeClassifier.predict_proba)
+- roots     int32 (pohon)       node akar tiap pohon
+
+Objek FlatForest hanya berisi array numpy, sehingga artefak joblib-nya
+di-mmap apa adanya (joblib.load(mmap_mode='r')); model sklearn menyalin
+semua node ke memori saat di-unpickle.
+
+Hasil predict_proba identik bit dengan sklearn (n_jobs=1):
+- sklearn membandingkan X float32 dengan ambang float64. Untuk x float32,
+  x <= t ⇔ x <= float32 terbesar yang ≤ t, jadi ambang disimpan sebagai
+  float32 dibulatkan ke bawah tanpa mengubah arah cabang.
+- Proba daun dijumlahkan urut pohon lalu dibagi n_estimators, urutan
+  yang sama dengan ForestClassifier.predict_proba.
+
+Belum dipakai model_store: traversal numpy per level ini masih ~2-3x lebih
+lambat dari traversal Cython sklearn untuk batch seluruh katalog, jadi
+artefak tetap menyimpan model sklearn. Benchmark ukuran, waktu load dan
+baris/detik: bench_forest_inference.py (gagal selama FlatForest lebih
+lambat dari sklearn).
+"""
+import numpy as np
+from scipy import sparse
+from sklearn.ensemble._forest import ForestClassifier
+
+# Elemen (baris x pohon) per batch traversal; membatasi memori kerja
+BATCH_NODES = 1 << 20
+# Array aktif dipadatkan jika < separuh elemennya masih bergerak turun
+_COMPACT_FRACTION = 0.5
+
+
+def is_forest(model):
+    """Forest klasifikasi satu output (RandomForest / ExtraTrees)?"""
+    return isinstance(model, ForestClassifier) and getattr(model, "n_outputs_", 1) == 1
+
+
+def _floor_float32(values):
+    """float32 terbesar yang ≤ values (float64)."""
+    rounded = values.astype(np.float32)
+    too_big = rounded.astype(np.float64) > values
+    rounded[too_big] = np.nextafter(rounded[too_big], np.float32(-np.inf))
+    return rounded
+
+
+class FlatForest:
+    """Forest sebagai array datar; antarmuka predict / predict_proba seperti sklearn."""
+
+    def __init__(self, feature, threshold, children, leaf, value, roots, classes, n_features):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.leaf = leaf
+        self.value = value
+        self.roots = roots
+        self.classes_ = classes
+        self.n_features_in_ = n_features
+
+    @property
+    def n_estimators(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (
+            self.feature, self.threshold, self.children, self.leaf, self.value, self.roots
+        ))
+
+    def _check_input(self, X):
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"X punya {X.shape[1]} fitur, forest dilatih dengan {self.n_features_in_} fitur"
+            )
+
+    def _dense_batch(self, X, start, stop):
+        batch = X[start:stop]
+        batch = batch.toarray() if sparse.issparse(batch) else np.asarray(batch)
+        batch = np.ascontiguousarray(batch, dtype=np.float32)
+        if np.isnan(batch).any():
+            raise ValueError("Input X mengandung NaN")
+        return batch
+
+    def _leaf_rows(self, batch):
+        """Baris `value` daun tujuan, bentuk (pohon, baris batch)."""
+        n_rows, n_features = batch.shape
+        x = batch.ravel()
+        children = self.children.ravel()
+        n_items = n_rows * self.n_estimators
+
+        node = np.repeat(self.roots, n_rows)
+        offset = np.tile(np.arange(n_rows, dtype=np.int32) * n_features, self.n_estimators)
+        position = np.arange(n_items, dtype=np.int32)
+        final = np.empty(n_items, dtype=np.int32)
+        while node.size:
+            go_right = x[offset + self.feature[node]] > self.threshold[node]
+            nxt = children[2 * node + go_right]
+            moving = nxt != node
+            if np.count_nonzero(moving) < _COMPACT_FRACTION * len(node):
+                # Elemen yang sudah di daun dikeluarkan dari array aktif
+                final[position[~moving]] = nxt[~moving]
+                node, offset, position = nxt[moving], offset[moving], position[moving]
+            else:
+                node = nxt
+        return self.leaf[final].reshape(self.n_estimators, n_rows)
+
+    def predict_proba(self, X):
+        self._check_input(X)
+        n_rows = X.shape[0]
+        proba = np.empty((n_rows, self.value.shape[1]), dtype=np.float64)
+        batch_rows = max(1, BATCH_NODES // self.n_estimators)
+        for start in range(0, n_rows, batch_rows):
+            stop = min(start + batch_rows, n_rows)
+            leaves = self._leaf_rows(self._dense_batch(X, start, stop))
+            acc = np.zeros((stop - start, self.value.shape[1]), dtype=np.float64)
+            for tree_leaves in leaves:
+                acc += self.value[tree_leaves]
+            acc /= self.n_estimators
+            proba[start:stop] = acc
+        return proba
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+
+def export_forest(model):
+    """RandomForestClassifier / ExtraTreesClassifier terlatih → FlatForest."""
+    if not is_forest(model):
+        raise ValueError(f"Bukan forest klasifikasi satu output: {type(model).__name__}")
+
+    features, thresholds, children, leaves, values, roots = [], [], [], [], [], []
+    n_nodes = n_leaves = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        is_leaf = tree.children_left == -1
+        ids = np.arange(tree.node_count) + n_nodes
+
+        feature = tree.feature.astype(np.int32)
+        feature[is_leaf] = 0
+        threshold = tree.threshold.copy()
+        threshold[is_leaf] = np.inf
+        leaf = np.full(tree.node_count, -1, dtype=np.int32)
+        leaf[is_leaf] = np.arange(is_leaf.sum()) + n_leaves
+
+        # Normalisasi sama dengan DecisionTreeClassifier.predict_proba
+        value = tree.value[is_leaf, 0, :]
+        normalizer = value.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0.0] = 1.0
+
+        features.append(feature)
+        thresholds.append(_floor_float32(threshold))
+        children.append(np.stack([
+            np.where(is_leaf, ids, tree.children_left + n_nodes),
+            np.where(is_leaf, ids, tree.children_right + n_nodes),
+        ], axis=1))
+        leaves.append(leaf)
+        values.append(value / normalizer)
+        roots.append(n_nodes)
+        n_nodes += tree.node_count
+        n_leaves += int(is_leaf.sum())
+
+    if n_nodes > np.iinfo(np.int32).max // 2:
+        raise ValueError(f"Forest terlalu besar untuk indeks int32: {n_nodes} node")
+    return FlatForest(
+        feature=np.concatenate(features),
+        threshold=np.concatenate(thresholds),
+        children=np.concatenate(children).astype(np.int32),
+        leaf=np.concatenate(leaves),
+        value=np.concatenate(values),
+        roots=np.asarray(roots, dtype=np.int32),
+        classes=np.asarray(model.classes_),
+        n_features=int(model.n_features_in_),
+    )
+
@@ -0,0 +1,253 @@
+# scripts/instrument.py
+"""
+Instrumentasi per tahap pipeline: wall time, CPU time, jumlah baris,
+baris/detik, puncak memori (RSS) dan (opsional) dump cProfile.
+
+Fungsi pipeline ikut serta lewat dekorator / context manager:
+
+    @instrument.timed("etl_process", rows=lambda counts, *a, **k: sum(counts.values()))
+    def etl_process(...): ...
+
+    with instrument.stage("train_model.Popularity", rows=len(y)):
+        ...
+
+Setiap tahap menjadi satu record yang ditambahkan ke run_metrics.jsonl
+(folder staging) dan ke tabel run_metrics di database (jika bisa
+dihubungi; dibaca panel tren di dashboard). Record satu run pipeline
+berbagi run_id yang sama (RUN_METRICS_RUN_ID, diwariskan ke proses anak).
+
+Konfigurasi (.env / environment):
+    RUN_METRICS_FILE   default <STAGING_DIR>/run_metrics.jsonl
+    RUN_METRICS_DB     true (default) / false
+    PROFILE_STAGES     daftar tahap (dipisah koma) yang di-cProfile, atau "all"
+    PROFILE_DIR        default <STAGING_DIR>/profiles
+"""
+import cProfile
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+import staging
+
+RUN_METRICS_DDL = """
+    CREATE TABLE IF NOT EXISTS run_metrics (
+        id BIGSERIAL PRIMARY KEY,
+        run_id TEXT NOT NULL,
+        stage TEXT NOT NULL,
+        started_at TIMESTAMPTZ NOT NULL,
+        wall_s DOUBLE PRECISION,
+        cpu_s DOUBLE PRECISION,
+        rows BIGINT,
+        rows_per_s DOUBLE PRECISION,
+        peak_rss_mb DOUBLE PRECISION,
+        status TEXT,
+        profile_path TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_run_metrics_stage ON run_metrics (stage, started_at);
+"""
+RECORD_FIELDS = (
+    "run_id", "stage", "started_at", "wall_s", "cpu_s", "rows", "rows_per_s",
+    "peak_rss_mb", "status", "profile_path",
+)
+SAMPLE_INTERVAL_S = 0.05
+
+_db_state = {"ready": False, "disabled": False}
+_lock = threading.Lock()
+
+
+def run_id():
+    """run_id bersama (env RUN_METRICS_RUN_ID); dibuat sekali per proses jika belum ada."""
+    if not os.getenv("RUN_METRICS_RUN_ID"):
+        os.environ["RUN_METRICS_RUN_ID"] = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+    return os.environ["RUN_METRICS_RUN_ID"]
+
+
+def metrics_file():
+    return os.getenv("RUN_METRICS_FILE") or os.path.join(staging.staging_dir(), "run_metrics.jsonl")
+
+
+def _profiled(name):
+    stages = {s.strip() for s in os.getenv("PROFILE_STAGES", "").split(",") if s.strip()}
+    return "all" in stages or name in stages or name.split(".")[0] in stages
+
+# ===============================
+# MEMORI
+# ===============================
+def current_rss_mb():
+    """RSS proses saat ini (MB); None jika tidak bisa dibaca."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss / 1e6
+
+
+class _PeakSampler:
+    """Sampling RSS di thread latar selama tahap berjalan (puncak per tahap)."""
+
+    def __init__(self):
+        self.peak = current_rss_mb()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        if self.peak is not None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(SAMPLE_INTERVAL_S):
+            self._sample()
+
+    def _sample(self):
+        rss = current_rss_mb()
+        if rss is not None:
+            self.peak = max(self.peak, rss)
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._sample()
+
+# ===============================
+# PENULISAN RECORD
+# ===============================
+def _write_db(record):
+    if _db_state["disabled"] or os.getenv("RUN_METRICS_DB", "true").lower() in ("0", "false", "no", "off"):
+        return
+    try:
+        from sqlalchemy import text
+        from db_connector import get_engine
+        with get_engine().begin() as conn:
+            if not _db_state["ready"]:
+                conn.execute(text(RUN_METRICS_DDL))
+                _db_state["ready"] = True
+            conn.execute(
+                text(f"INSERT INTO run_metrics ({', '.join(RECORD_FIELDS)}) "
+                     f"VALUES ({', '.join(':' + f for f in RECORD_FIELDS)})"),
+                {f: record.get(f) for f in RECORD_FIELDS}
+            )
+    except Exception as e:
+        # Metrik tidak boleh menggagalkan pipeline; DB dicoba sekali per proses
+        _db_state["disabled"] = True
+        print(f"⚠️  run_metrics tidak ditulis ke database: {type(e).__name__}: {e}", file=sys.stderr)
+
+
+def record(rec):
+    """Tambahkan satu record ke file run_metrics.jsonl & tabel run_metrics."""
+    path = metrics_file()
+    line = json.dumps(rec) + "\n"
+    with _lock:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a") as f:
+            f.write(line)
+        _write_db(rec)
+
+
+def load_records(run=None, path=None):
+    """Record dari run_metrics.jsonl (semua, atau satu run_id)."""
+    path = path or metrics_file()
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return [r for r in records if run is None or r["run_id"] == run]
+
+# ===============================
+# API
+# ===============================
+class StageMetrics:
+    """Objek yang diberikan `stage()`; pemanggil boleh mengisi .rows belakangan."""
+
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+        self.record = None
+
+
+@contextlib.contextmanager
+def stage(name, rows=None, profile=None):
+    """
+    Ukur satu tahap. profile=None → ikut PROFILE_STAGES. Record ditulis
+    juga saat tahap gagal (status "error"), lalu exception diteruskan.
+    """
+    metrics = StageMetrics(name, rows)
+    profile = _profiled(name) if profile is None else profile
+    profiler = cProfile.Profile() if profile else None
+    started_at = datetime.now(timezone.utc)
+    status = "ok"
+
+    start, cpu_start = time.perf_counter(), time.process_time()
+    sampler = _PeakSampler()
+    try:
+        with sampler:
+            if profiler:
+                profiler.enable()
+            try:
+                yield metrics
+            except BaseException:
+                status = "error"
+                raise
+            finally:
+                if profiler:
+                    profiler.disable()
+    finally:
+        # Di finally: exception tahap keluar dari blok sampler sebelum baris
+        # berikutnya, jadi record "error" hanya tertulis dari sini
+        _finish_stage(metrics, profiler, sampler, started_at, start, cpu_start, status)
+
+
+def _finish_stage(metrics, profiler, sampler, started_at, start, cpu_start, status):
+    wall = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+
+    profile_path = None
+    if profiler:
+        profile_dir = os.getenv("PROFILE_DIR") or os.path.join(staging.staging_dir(), "profiles")
+        os.makedirs(profile_dir, exist_ok=True)
+        profile_path = os.path.join(profile_dir, f"{metrics.name}_{run_id()}_{os.getpid()}.prof")
+        profiler.dump_stats(profile_path)
+
+    rows = None if metrics.rows is None else int(metrics.rows)
+    metrics.record = {
+        "run_id": run_id(),
+        "stage": metrics.name,
+        "started_at": started_at.isoformat(),
+        "wall_s": round(wall, 4),
+        "cpu_s": round(cpu, 4),
+        "rows": rows,
+        "rows_per_s": round(rows / wall, 1) if rows and wall > 0 else None,
+        "peak_rss_mb": None if sampler.peak is None else round(sampler.peak, 1),
+        "status": status,
+        "profile_path": profile_path,
+    }
+    record(metrics.record)
+
+
+def timed(name, rows=None):
+    """
+    Dekorator `stage()` untuk satu fungsi. rows: callable(result, *args,
+    **kwargs) → jumlah baris yang diproses.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name) as metrics:
+                result = fn(*args, **kwargs)
+                if rows is not None:
+                    metrics.rows = rows(result, *args, **kwargs)
+                return result
+        return wrapper
+    return decorator
@@ -0,0 +1,122 @@
+# scripts/model_store.py
+"""
+Penyimpanan artefak model hasil training.
+
+Satu artefak per target: <MODEL_DIR>/<target>.joblib berisi model,
+LabelEncoder target, preprocessing fitur (nilai pengisi NaN + LabelEncoder),
+daftar fitur dan baris ml_metrics, plus
+<target>.json kecil berisi fingerprint + metrik sehingga pengecekan
+"perlu latih ulang?" tidak perlu memuat model.
+
+Fingerprint = SHA-256 dari data latih (X, y), daftar fitur, engine,
+hyperparameter dan versi scikit-learn. Jika sama, model lama dimuat
+(array pohon di-mmap) dan fit dilewati.
+"""
+import hashlib
+import json
+import os
+
+import joblib
+import numpy as np
+import sklearn
+from scipy import sparse
+
+from staging import PROJECT_DIR
+
+# Folder artefak dari .env (MODEL_DIR), default <root proyek>/models
+MODEL_DIR = os.getenv("MODEL_DIR") or os.path.join(PROJECT_DIR, "models")
+
+# Parameter yang tidak memengaruhi hasil fit
+_RUNTIME_PARAMS = {"n_jobs", "verbose"}
+
+
+def _update_array(h, arr):
+    arr = np.ascontiguousarray(arr)
+    h.update(str((arr.dtype.str, arr.shape)).encode())
+    h.update(arr.tobytes())
+
+
+def fingerprint(X, y, features, engine, params):
+    """Hash data latih + konfigurasi model (hex)."""
+    h = hashlib.sha256()
+    if sparse.issparse(X):
+        X = sparse.csr_matrix(X)
+        X.sort_indices()
+        h.update(str(X.shape).encode())
+        for arr in (X.data, X.indices, X.indptr):
+            _update_array(h, arr)
+    else:
+        _update_array(h, np.asarray(X))
+    _update_array(h, np.asarray(y).astype(str))
+
+    config = {
+        "features": list(features),
+        "engine": engine,
+        "params": {k: repr(v) for k, v in sorted(params.items()) if k not in _RUNTIME_PARAMS},
+        "sklearn": sklearn.__version__,
+    }
+    h.update(json.dumps(config, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def _paths(target, model_dir):
+    base = os.path.join(model_dir, target)
+    return base + ".joblib", base + ".json"
+
+
+def read_fingerprint(target, model_dir=MODEL_DIR):
+    """Fingerprint artefak tersimpan (tanpa memuat model), None jika tidak ada."""
+    model_path, meta_path = _paths(target, model_dir)
+    if not (os.path.exists(model_path) and os.path.exists(meta_path)):
+        return None
+    with open(meta_path, encoding="utf-8") as f:
+        return json.load(f).get("fingerprint")
+
+
+def read_artifact(target, model_dir=MODEL_DIR):
+    """Artefak terakhir untuk target (apa pun fingerprint-nya), None jika tidak ada."""
+    if read_fingerprint(target, model_dir) is None:
+        return None
+    return joblib.load(_paths(target, model_dir)[0], mmap_mode="r")
+
+
+def load_artifact(target, fp, model_dir=MODEL_DIR):
+    """Artefak untuk target jika fingerprint cocok, selain itu None."""
+    if read_fingerprint(target, model_dir) != fp:
+        return None
+    artifact = read_artifact(target, model_dir)
+    # Artefak lama berisi FlatForest (forest_arrays) dilatih ulang menjadi
+    # model sklearn
+    if not hasattr(artifact["model"], "get_params"):
+        return None
+    return artifact
+
+
+def save_artifact(target, fp, model, label_encoder, preprocessing, features,
+                  engine, metrics, model_dir=MODEL_DIR):
+    """Simpan artefak (tanpa kompresi agar bisa di-mmap) + metadata JSON."""
+    os.makedirs(model_dir, exist_ok=True)
+    model_path, meta_path = _paths(target, model_dir)
+    # Metadata lama dihapus dulu: jika proses terhenti di tengah, artefak
+    # dianggap tidak ada dan model dilatih ulang
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+    # Salinan forest sklearn dari format FlatForest lama tidak dipakai lagi
+    legacy_path = os.path.join(model_dir, target + ".sklearn.joblib")
+    if os.path.exists(legacy_path):
+        os.remove(legacy_path)
+    artifact = {
+        "model": model,
+        "label_encoder": label_encoder,
+        "preprocessing": preprocessing,
+        "features": list(features),
+        "engine": engine,
+        "metrics": metrics,
+        "fingerprint": fp,
+    }
+    joblib.dump(artifact, model_path + ".tmp")
+    os.replace(model_path + ".tmp", model_path)
+    with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"fingerprint": fp, "engine": engine, "metrics": metrics}, f, indent=2)
+    os.replace(meta_path + ".tmp", meta_path)
+    return model_path
@@ -0,0 +1,354 @@
+# scripts/near_dedup.py
+"""
+Deteksi judul near-duplicate antar sumber (Webtoon & Manga).
+
+pre_etl_harmonization hanya membuang judul yang sama persis. Varian judul
+yang sama (tanda baca, subjudul, transliterasi "Shoujo" / "Shōjo" /
+"Shojo") lolos sebagai baris terpisah. Perbandingan semua pasangan tidak
+mungkin di jutaan baris, jadi kandidat dicari lewat blocking:
+
+1. Kunci ternormalisasi: NFKD → ASCII, huruf kecil, tanda baca dibuang,
+   vokal panjang romanisasi dilipat (ou/uu/oo → o/u/o).
+2. MinHash trigram karakter dari kunci (vektorisasi numpy), lalu LSH:
+   signature dibagi `bands` band; baris dengan band sama (dan nomor di
+   judul sama: "Vol 2" ≠ "Vol 3", "Castle" ≠ "Castle II") masuk satu blok.
+3. Blok kedua: judul dasar sama setelah keterangan dalam kurung di akhir
+   dibuang ("Crimson Heart (Webnovel)"). Subjudul setelah ":" tidak
+   dibuang; di data ini biasanya berarti seri lain dari author yang sama.
+4. Di dalam blok, pasangan kandidat diambil dengan sorted neighbourhood
+   (tetangga sampai `window` posisi), sehingga jumlah pasangan paling
+   banyak n x (bands + 1) x window → runtime mendekati linear.
+5. Verifikasi: estimasi Jaccard trigram ≥ title_threshold dan author
+   setuju (Jaccard token author ≥ author_threshold). Jika salah satu
+   author kosong, judul harus hampir identik (missing_author_threshold).
+   Pasangan judul-dasar hanya diterima jika kedua author ada & setuju.
+   Pasangan LSH ditolak jika satu kunci menambah / membuang kata utuh
+   ("Gundam Exa" vs "Gundam Exa Vs", "Dragon Ball Super" vs "... Divers")
+   atau menggantinya dengan kata yang ejaannya jauh berbeda ("... Gundam
+   Seerauber" vs "... Gundam - Ghost"): di data ini itu seri lain dari
+   author yang sama. Kata sandang (the / a / an) dan token satu huruf
+   ("Empress' Lipstick") tidak dihitung.
+6. Pasangan terverifikasi → cluster (connected components); baris pertama
+   tiap cluster dipertahankan, sama seperti drop_duplicates(keep='first').
+
+Contoh (terapkan ke data_gabungan yang sudah di-staging):
+    python near_dedup.py --report ../Data_Staging/near_duplicates.csv
+    python near_dedup.py --title-threshold 0.8 --dry-run
+"""
+import argparse
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+import instrument
+import staging
+
+# =========================
+# PARAMETER DEFAULT
+# =========================
+NUM_PERM = 32               # jumlah fungsi hash MinHash
+BANDS = 8                   # band LSH (baris per band = NUM_PERM / BANDS)
+WINDOW = 10                 # tetangga per blok (sorted neighbourhood)
+TITLE_THRESHOLD = 0.75      # estimasi Jaccard trigram minimal
+AUTHOR_THRESHOLD = 0.5      # Jaccard token author minimal
+MISSING_AUTHOR_THRESHOLD = 0.9
+TOKEN_EDIT_THRESHOLD = 0.6  # kemiripan ejaan minimal kata yang berbeda antar kunci
+MAX_KEY_LEN = 64            # kunci judul dipotong untuk matriks trigram
+MIN_BASE_LEN = 4            # judul dasar lebih pendek dari ini tidak dipakai blok
+BATCH_ROWS = 50_000
+
+_ROMANIZATION = (("ou", "o"), ("uu", "u"), ("oo", "o"), ("ii", "i"))
+_NUMBER = r"\d+|\b[ivx]{2,4}\b"
+_QUALIFIER = r"(?:\s*[\(\[][^\)\]]*[\)\]])+\s*$"
+_IGNORED_TOKENS = frozenset({"the", "a", "an"})
+
+
+# =========================
+# NORMALISASI
+# =========================
+# Operasi string lewat kernel pyarrow.compute (tanpa loop Python per baris)
+def _fold(values):
+    """NFKD → ASCII, huruf kecil, & → and."""
+    arr = pa.array(pd.Series(values).fillna("").astype(str), type=pa.string())
+    arr = pc.utf8_lower(pc.utf8_normalize(arr, "NFKD"))
+    arr = pc.replace_substring_regex(arr, r"[^\x00-\x7f]+", "")
+    return pc.replace_substring(arr, "&", " and ")
+
+
+def _squash(arr):
+    """Non-alfanumerik → satu spasi, tanpa spasi di tepi."""
+    return pc.utf8_trim_whitespace(pc.replace_substring_regex(arr, r"[^a-z0-9]+", " "))
+
+
+def _romanize(arr):
+    for pattern, repl in _ROMANIZATION:
+        arr = pc.replace_substring(arr, pattern, repl)
+    return arr
+
+
+def title_keys(titles):
+    """
+    Kunci perbandingan per judul (bukan untuk ditampilkan):
+    key     kunci ternormalisasi untuk MinHash
+    base    key tanpa keterangan dalam kurung di akhir ("(Webnovel)")
+    numbers angka & angka Romawi di judul ("2", "ii"), dipisah spasi
+    """
+    folded = _fold(titles)
+    squashed = _squash(folded)
+    base = _romanize(_squash(pc.replace_substring_regex(folded, _QUALIFIER, "")))
+    return pd.DataFrame({
+        "key": _romanize(squashed).to_pandas(),
+        "base": base.to_pandas(),
+        "numbers": squashed.to_pandas().str.findall(_NUMBER).str.join(" "),
+    })
+
+
+def normalize_authors(authors):
+    """Kunci author: token unik terurut; '' jika author kosong."""
+    codes, uniques = pd.factorize(pd.Series(authors).reset_index(drop=True), use_na_sentinel=False)
+    tokens = _squash(_fold(uniques)).to_pandas().str.split()
+    keys = tokens.map(lambda t: " ".join(sorted(set(t)))).to_numpy(dtype=object)
+    return pd.Series(keys[codes])
+
+
+# =========================
+# MINHASH & LSH
+# =========================
+def _trigrams(keys):
+    """Matriks trigram (int 24-bit) per kunci + mask posisi valid."""
+    padded = (" " + keys.str.slice(0, MAX_KEY_LEN - 2) + " ").to_numpy().astype(f"S{MAX_KEY_LEN}")
+    lengths = np.char.str_len(padded)
+    b = padded.view(np.uint8).reshape(len(padded), MAX_KEY_LEN).astype(np.uint32)
+    grams = (b[:, :-2] << 16) | (b[:, 1:-1] << 8) | b[:, 2:]
+    valid = np.arange(MAX_KEY_LEN - 2) < (lengths - 2)[:, None]
+    return grams, valid
+
+
+def minhash_signatures(keys, num_perm=NUM_PERM, seed=1):
+    """
+    Signature MinHash (uint32, n x num_perm) dari trigram karakter.
+    Hash multiply-shift: ((a * x + b) mod 2^64) >> 32, a ganjil acak.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2**63, num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+    empty = np.uint64(2**32 - 1)
+
+    sig = np.empty((len(keys), num_perm), dtype=np.uint32)
+    for start in range(0, len(keys), BATCH_ROWS):
+        grams, valid = _trigrams(keys.iloc[start:start + BATCH_ROWS])
+        grams = grams.astype(np.uint64)
+        for k in range(num_perm):
+            h = (grams * a[k] + b[k]) >> np.uint64(32)
+            sig[start:start + len(grams), k] = h.min(axis=1, initial=empty, where=valid)
+    return sig
+
+
+def _combine(columns):
+    """Gabungkan beberapa kolom integer menjadi satu hash uint64 per baris."""
+    h = np.full(len(columns[0]), 1469598103934665603, dtype=np.uint64)
+    for col in columns:
+        h = (h ^ col.astype(np.uint64)) * np.uint64(1099511628211)
+    return h
+
+
+def _neighbour_pairs(block, order_key, window):
+    """Pasangan (i, j) dalam blok sama, tetangga ≤ window setelah diurutkan."""
+    order = np.lexsort((order_key, block))
+    sorted_block = block[order]
+    pairs = []
+    for d in range(1, window + 1):
+        same = sorted_block[d:] == sorted_block[:-d]
+        if not same.any():
+            break
+        pairs.append(np.stack([order[:-d][same], order[d:][same]], axis=1))
+    return np.concatenate(pairs) if pairs else np.empty((0, 2), dtype=np.int64)
+
+
+def candidate_pairs(sig, digit_codes, base_codes, author_codes, bands=BANDS, window=WINDOW):
+    """Pasangan kandidat dari blok LSH per band + blok judul dasar (i < j, unik)."""
+    rows_per_band = sig.shape[1] // bands
+    lsh = []
+    for band in range(bands):
+        cols = sig[:, band * rows_per_band:(band + 1) * rows_per_band]
+        block = _combine([np.full(len(sig), band), digit_codes, *cols.T])
+        lsh.append(_neighbour_pairs(block, author_codes, window))
+    lsh = np.concatenate(lsh)
+
+    has_base = base_codes >= 0
+    idx = np.flatnonzero(has_base)
+    base = _neighbour_pairs(base_codes[has_base], author_codes[has_base], window)
+    base = idx[base]
+
+    def unique(pairs):
+        pairs = np.sort(pairs, axis=1)
+        return np.unique(pairs, axis=0) if len(pairs) else pairs
+
+    return unique(lsh), unique(base)
+
+
+# =========================
+# VERIFIKASI & CLUSTER
+# =========================
+def _author_similarity(pairs, author_keys):
+    """Jaccard token author per pasangan (NaN jika salah satu kosong)."""
+    codes, uniques = pd.factorize(author_keys)
+    token_sets = [frozenset(u.split()) for u in uniques]
+    ci, cj = codes[pairs[:, 0]], codes[pairs[:, 1]]
+    sim = np.where(ci == cj, 1.0, 0.0)
+    for k in np.flatnonzero(ci != cj):
+        a, b = token_sets[ci[k]], token_sets[cj[k]]
+        sim[k] = len(a & b) / len(a | b)
+    missing = (author_keys.to_numpy()[pairs[:, 0]] == "") | (author_keys.to_numpy()[pairs[:, 1]] == "")
+    sim[missing] = np.nan
+    return sim
+
+
+def _token_change(pairs, keys, token_edit_threshold=TOKEN_EDIT_THRESHOLD):
+    """
+    True jika kata di kedua kunci pasangan berbeda utuh: kata (lebih dari
+    satu huruf) hanya ada di satu sisi, atau kata pengganti ejaannya jauh
+    berbeda (rasio SequenceMatcher < token_edit_threshold; "i m" vs "iam"
+    tetap dianggap varian).
+    """
+    keys = keys.to_numpy()
+    changed = np.zeros(len(pairs), dtype=bool)
+    for k, (i, j) in enumerate(pairs):
+        a, b = set(keys[i].split()) - _IGNORED_TOKENS, set(keys[j].split()) - _IGNORED_TOKENS
+        only_a, only_b = sorted(a - b), sorted(b - a)
+        if only_a and only_b:
+            ratio = SequenceMatcher(None, "".join(only_a), "".join(only_b)).ratio()
+            changed[k] = ratio < token_edit_threshold
+        else:
+            changed[k] = any(len(t) > 1 for t in only_a + only_b)
+    return changed
+
+
+def find_near_duplicates(df, title_col="title", author_col="author",
+                         num_perm=NUM_PERM, bands=BANDS, window=WINDOW,
+                         title_threshold=TITLE_THRESHOLD, author_threshold=AUTHOR_THRESHOLD,
+                         missing_author_threshold=MISSING_AUTHOR_THRESHOLD,
+                         token_edit_threshold=TOKEN_EDIT_THRESHOLD, seed=1):
+    """
+    Cluster near-duplicate. Mengembalikan (cluster, stats): cluster[i] =
+    posisi baris pertama di cluster baris i (baris unik menunjuk dirinya
+    sendiri); stats berisi jumlah kandidat & pasangan terverifikasi.
+    """
+    if num_perm % bands:
+        raise ValueError(f"num_perm ({num_perm}) harus habis dibagi bands ({bands})")
+    n = len(df)
+    keys = title_keys(df[title_col])
+    author_keys = normalize_authors(df[author_col])
+
+    # MinHash hanya untuk kunci unik, lalu disebar ke semua baris
+    key_codes, unique_keys = pd.factorize(keys["key"])
+    sig = minhash_signatures(pd.Series(unique_keys), num_perm, seed)[key_codes]
+
+    digit_codes = pd.factorize(keys["numbers"])[0]
+    base_codes = pd.factorize(keys["base"].where(keys["base"].str.len() >= MIN_BASE_LEN))[0]
+    author_codes = pd.factorize(author_keys)[0]
+
+    lsh_pairs, base_pairs = candidate_pairs(sig, digit_codes, base_codes, author_codes, bands, window)
+
+    def title_similarity(pairs):
+        return (sig[pairs[:, 0]] == sig[pairs[:, 1]]).mean(axis=1)
+
+    sim = title_similarity(lsh_pairs)
+    author_sim = _author_similarity(lsh_pairs, author_keys)
+    accept = np.where(
+        np.isnan(author_sim),
+        sim >= missing_author_threshold,
+        (sim >= title_threshold) & (author_sim >= author_threshold)
+    )
+    accept[accept] = ~_token_change(lsh_pairs[accept], keys["key"], token_edit_threshold)
+    base_author_sim = _author_similarity(base_pairs, author_keys)
+    base_accept = np.nan_to_num(base_author_sim, nan=0.0) >= author_threshold
+
+    matched = np.concatenate([lsh_pairs[accept], base_pairs[base_accept]])
+    graph = sparse.coo_matrix(
+        (np.ones(len(matched), dtype=np.int8), (matched[:, 0], matched[:, 1])), shape=(n, n)
+    )
+    _, labels = connected_components(graph, directed=False)
+    # Wakil cluster = posisi terkecil (baris pertama, seperti keep='first')
+    first = pd.Series(np.arange(n)).groupby(labels).transform("min").to_numpy()
+
+    stats = {
+        "rows": n,
+        "candidate_pairs": int(len(lsh_pairs) + len(base_pairs)),
+        "matched_pairs": int(len(np.unique(np.sort(matched, axis=1), axis=0))) if len(matched) else 0,
+        "clusters": int(len(np.unique(first[first != np.arange(n)]))),
+        "dropped": int((first != np.arange(n)).sum()),
+    }
+    return first, stats
+
+
+def cluster_report(df, cluster, title_col="title", author_col="author"):
+    """Cluster yang digabung: satu baris per anggota, kept=True untuk wakilnya."""
+    positions = np.arange(len(df))
+    members = np.isin(cluster, cluster[cluster != positions])
+    cols = [c for c in (title_col, author_col, "source_type") if c in df.columns]
+    report = df.iloc[members][cols].reset_index(drop=True)
+    report.insert(0, "cluster", cluster[members])
+    report.insert(1, "kept", cluster[members] == positions[members])
+    report["kept_title"] = df[title_col].to_numpy()[cluster[members]]
+    return report.sort_values(["cluster", "kept"], ascending=[True, False], kind="stable").reset_index(drop=True)
+
+
+@instrument.timed("near_dedup", rows=lambda result, df, *a, **k: len(df))
+def drop_near_duplicates(df, **params):
+    """
+    Buang near-duplicate (keep first). Mengembalikan (df_bersih, report,
+    stats); parameter diteruskan ke find_near_duplicates.
+    """
+    cluster, stats = find_near_duplicates(df, **params)
+    report = cluster_report(df, cluster, params.get("title_col", "title"), params.get("author_col", "author"))
+    keep = cluster == np.arange(len(df))
+    return df[keep], report, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Deteksi & buang judul near-duplicate di data_gabungan")
+    parser.add_argument('--input', default=None, help="File staging (default: data_gabungan di STAGING_DIR)")
+    parser.add_argument('--output', default=None, help="File hasil (default: menimpa input)")
+    parser.add_argument('--report', default=None, help="File CSV laporan cluster yang digabung")
+    parser.add_argument('--num-perm', type=int, default=NUM_PERM)
+    parser.add_argument('--bands', type=int, default=BANDS)
+    parser.add_argument('--window', type=int, default=WINDOW)
+    parser.add_argument('--title-threshold', type=float, default=TITLE_THRESHOLD)
+    parser.add_argument('--author-threshold', type=float, default=AUTHOR_THRESHOLD)
+    parser.add_argument('--missing-author-threshold', type=float, default=MISSING_AUTHOR_THRESHOLD)
+    parser.add_argument('--token-edit-threshold', type=float, default=TOKEN_EDIT_THRESHOLD)
+    parser.add_argument('--dry-run', action='store_true', help="Hanya laporan, file tidak ditulis")
+    args = parser.parse_args(argv)
+
+    path = args.input or staging.dataset_path("data_gabungan")
+    df = staging.read_frame(path)
+    df_clean, report, stats = drop_near_duplicates(
+        df, num_perm=args.num_perm, bands=args.bands, window=args.window,
+        title_threshold=args.title_threshold, author_threshold=args.author_threshold,
+        missing_author_threshold=args.missing_author_threshold,
+        token_edit_threshold=args.token_edit_threshold,
+    )
+    print(
+        f"Kandidat: {stats['candidate_pairs']} pasangan, cocok: {stats['matched_pairs']}, "
+        f"{stats['clusters']} cluster, {stats['dropped']} baris near-duplicate"
+    )
+    if args.report:
+        report.to_csv(args.report, index=False)
+        print(f"Laporan cluster: {args.report}")
+    if not args.dry_run:
+        df_clean = df_clean.reset_index(drop=True)
+        if 'title_id' in df_clean.columns:
+            df_clean['title_id'] = df_clean.index + 1
+        output = args.output or path
+        staging.write_frame(df_clean, output)
+        print(f"FILE DISIMPAN KE: {output} ({len(df_clean)} baris)")
+
+
+if __name__ == "__main__":
+    main()
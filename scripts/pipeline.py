@@ -0,0 +1,392 @@
+# scripts/pipeline.py
+"""
+Runner pipeline: pre_etl → dw_schema → data_etl → train_models &
+similar_comics sebagai DAG.
+
+Setiap tahap mendeklarasikan file input, modul kode utama, tahap yang
+menjadi dependensinya dan pemeriksaan output. Kunci tahap = SHA-256 dari
+kode (modul utama + semua modul proyek yang diimpornya, diturunkan dari
+import), isi file input dan kunci dependensinya. Tahap dilewati jika kuncinya sama
+dengan run sukses terakhir (pipeline_state.json) dan outputnya masih ada,
+sehingga rerun pada data yang tidak berubah hampir instan.
+
+Tahap yang saling independen (pre_etl & dw_schema, train_models &
+similar_comics) dijalankan paralel,
+masing-masing di proses sendiri. Setiap tahap dicatat ke run log
+(pipeline_log.jsonl, satu baris JSON per tahap): status, wall time, jumlah
+baris dan puncak memori (RSS).
+
+Contoh:
+    python pipeline.py                     # semua tahap
+    python pipeline.py data_etl --force    # data_etl (+ dependensinya), tanpa cache
+    python pipeline.py --rebuild-schema    # hapus & buat ulang seluruh data warehouse
+"""
+import argparse
+import ast
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+import staging
+from db_connector import get_engine
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_FILE = os.path.join(staging.staging_dir(), "pipeline_state.json")
+LOG_FILE = os.path.join(staging.staging_dir(), "pipeline_log.jsonl")
+
+# ===============================
+# TAHAP
+# ===============================
+# Fungsi tahap dijalankan di proses anak (spawn), mengembalikan jumlah baris
+def run_pre_etl(workers, rebuild_schema=False):
+    import pre_etl
+    return len(pre_etl.pre_etl_harmonization())
+
+
+def run_dw_schema(workers, rebuild_schema=False):
+    """
+    Tanpa rebuild_schema data tidak pernah dihapus: schema dibuat jika belum
+    ada, index/view baru ditambahkan (DDL IF NOT EXISTS). Drop & buat ulang
+    seluruh warehouse hanya lewat --rebuild-schema.
+    """
+    from dw_schema import build_dw_schema, ensure_dw_schema, schema_ready
+    with get_engine().begin() as conn:
+        cur = conn.connection.cursor()
+        if rebuild_schema:
+            build_dw_schema(cur, drop_existing=True)
+        elif schema_ready(cur):
+            build_dw_schema(cur, drop_existing=False)
+        else:
+            ensure_dw_schema(cur)
+    return None
+
+
+def run_data_etl(workers, rebuild_schema=False):
+    import data_etl
+    import pre_etl
+    data_etl.INPUT_FILE = pre_etl.OUTPUT_FILE
+    return sum(data_etl.etl_process(incremental=True).values())
+
+
+def run_train_models(workers, rebuild_schema=False):
+    import train_models
+    return train_models.main(['--workers', str(workers)])
+
+
+def run_similar_comics(workers, rebuild_schema=False):
+    import similar_comics
+    return similar_comics.build_similar_comics()
+
+
+def _table_has_rows(table):
+    def check():
+        with get_engine().connect() as conn:
+            if conn.execute(text("SELECT to_regclass(:t)"), {"t": table}).scalar() is None:
+                return False
+            return conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {table})")).scalar()
+    return check
+
+
+def _schema_ready():
+    from dw_schema import schema_ready
+    raw = get_engine().raw_connection()
+    try:
+        return schema_ready(raw.cursor())
+    finally:
+        raw.close()
+
+
+def _staging_file(name, fmt=None):
+    return lambda: staging.staging_path(name, fmt)
+
+
+# nama → deps, file input, modul kode utama, file output, cek output DB, fungsi
+STAGES = {
+    "pre_etl": {
+        "deps": (),
+        "inputs": (_staging_file("webtoon_originals_id", "csv"), _staging_file("Manga_Details", "csv")),
+        "code": ("pre_etl.py",),
+        "outputs": (_staging_file("data_gabungan"),),
+        "check": None,
+        "run": run_pre_etl,
+    },
+    "dw_schema": {
+        "deps": (),
+        "inputs": (),
+        "code": ("dw_schema.py",),
+        "outputs": (),
+        "check": _schema_ready,
+        "run": run_dw_schema,
+    },
+    "data_etl": {
+        "deps": ("pre_etl", "dw_schema"),
+        "inputs": (_staging_file("data_gabungan"),),
+        "code": ("data_etl.py",),
+        "outputs": (),
+        "check": _table_has_rows("dim_comics"),
+        "run": run_data_etl,
+    },
+    "train_models": {
+        "deps": ("data_etl",),
+        "inputs": (),
+        "code": ("train_models.py",),
+        "outputs": (),
+        "check": _table_has_rows("fact_predictions"),
+        "run": run_train_models,
+    },
+    "similar_comics": {
+        "deps": ("data_etl",),
+        "inputs": (),
+        "code": ("similar_comics.py",),
+        "outputs": (),
+        "check": _table_has_rows("similar_comics"),
+        "run": run_similar_comics,
+    },
+}
+
+
+def stage_order(targets=None):
+    """Urutan topologis tahap target beserta semua dependensinya."""
+    order = []
+
+    def visit(name):
+        if name not in STAGES:
+            raise ValueError(f"Tahap tidak dikenal: {name}")
+        for dep in STAGES[name]["deps"]:
+            visit(dep)
+        if name not in order:
+            order.append(name)
+
+    for name in targets or STAGES:
+        visit(name)
+    return order
+
+# ===============================
+# HASH INPUT
+# ===============================
+def file_hash(path, file_cache):
+    """
+    SHA-256 isi file; di-cache per (ukuran, mtime) supaya file besar yang
+    tidak berubah tidak dibaca ulang. None jika file tidak ada.
+    """
+    if not os.path.exists(path):
+        return None
+    st = os.stat(path)
+    cached = file_cache.get(path)
+    if cached and cached["size"] == st.st_size and cached["mtime_ns"] == st.st_mtime_ns:
+        return cached["sha256"]
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    file_cache[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": h.hexdigest()}
+    return h.hexdigest()
+
+
+def _imported_modules(module):
+    """Modul proyek (file .py di SCRIPTS_DIR) yang diimpor module, termasuk import di dalam fungsi."""
+    with open(os.path.join(SCRIPTS_DIR, module), encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=module)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module)
+    found = (f"{n.split('.')[0]}.py" for n in names)
+    return {m for m in found if os.path.exists(os.path.join(SCRIPTS_DIR, m))}
+
+
+def code_modules(name):
+    """Modul kode utama tahap + semua modul proyek yang diimpornya (transitif), terurut."""
+    seen, stack = set(), list(STAGES[name]["code"])
+    while stack:
+        module = stack.pop()
+        if module not in seen:
+            seen.add(module)
+            stack.extend(_imported_modules(module) - seen)
+    return sorted(seen)
+
+
+def stage_key(name, keys, file_cache):
+    """Kunci tahap dari kode, isi file input & kunci tahap dependensinya."""
+    stage = STAGES[name]
+    h = hashlib.sha256(name.encode())
+    for module in code_modules(name):
+        h.update(f"code:{module}:{file_hash(os.path.join(SCRIPTS_DIR, module), file_cache)}".encode())
+    for path in stage["inputs"]:
+        h.update(f"input:{file_hash(path(), file_cache)}".encode())
+    for dep in stage["deps"]:
+        h.update(f"dep:{dep}:{keys[dep]}".encode())
+    return h.hexdigest()
+
+
+def outputs_current(name):
+    stage = STAGES[name]
+    if not all(os.path.exists(path()) for path in stage["outputs"]):
+        return False
+    return stage["check"] is None or bool(stage["check"]())
+
+# ===============================
+# STATE & RUN LOG
+# ===============================
+def load_state(path=STATE_FILE):
+    if not os.path.exists(path):
+        return {"stages": {}, "files": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_state(state, path=STATE_FILE):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+
+def append_log(records, path=LOG_FILE):
+    with open(path, "a") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+# ===============================
+# EKSEKUSI
+# ===============================
+def peak_rss_mb():
+    """Puncak RSS proses ini & anak-anaknya (MB); None jika tidak tersedia."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().peak_wset / 1e6
+
+    scale = 1 if sys.platform == "darwin" else 1024  # ru_maxrss: byte (macOS) / KB
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    return peak * scale / 1e6
+
+
+def _execute(name, workers, rebuild_schema=False):
+    """Dijalankan di proses anak baru: (baris, wall time, puncak RSS)."""
+    start = time.perf_counter()
+    rows = STAGES[name]["run"](workers, rebuild_schema)
+    return rows, time.perf_counter() - start, peak_rss_mb()
+
+
+def run_pipeline(targets=None, jobs=2, workers=None, force=False,
+                 state_file=STATE_FILE, log_file=LOG_FILE, rebuild_schema=False):
+    """
+    Jalankan tahap target (+ dependensinya). Mengembalikan list record run
+    log; tahap gagal membuat tahap turunannya berstatus "blocked".
+    rebuild_schema=True → dw_schema menghapus & membuat ulang seluruh
+    warehouse (force tidak pernah menghapus data).
+    """
+    order = stage_order(targets)
+    workers = workers or os.cpu_count() or 1
+    state = load_state(state_file)
+    run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+    # Diwarisi proses tahap → record instrument (run_metrics) berbagi run_id ini
+    os.environ["RUN_METRICS_RUN_ID"] = run_id
+
+    keys, status, records = {}, {}, []
+    pending = list(order)
+    running = {}
+
+    def finish(name, result, rows=None, wall=0.0, peak=None, error=None):
+        status[name] = result
+        record = {
+            "run_id": run_id, "stage": name, "status": result, "key": keys.get(name),
+            "wall_s": round(wall, 3), "rows": rows,
+            "peak_rss_mb": None if peak is None else round(peak, 1),
+            "finished_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        if error:
+            record["error"] = error
+        records.append(record)
+        append_log([record], log_file)
+
+        icon = {"ran": "✅", "skipped": "⏭️ ", "failed": "❌", "blocked": "⛔"}[result]
+        detail = f" ({wall:.2f} s, {rows} baris, puncak {record['peak_rss_mb']} MB)" if result == "ran" else ""
+        print(f"{icon} {name}: {result}{detail}" + (f" — {error}" if error else ""))
+
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=ctx, max_tasks_per_child=1) as pool:
+        while pending or running:
+            for name in list(pending):
+                deps = STAGES[name]["deps"]
+                if any(status.get(d) in ("failed", "blocked") for d in deps if d in order):
+                    pending.remove(name)
+                    finish(name, "blocked")
+                    continue
+                if not all(status.get(d) in ("ran", "skipped") for d in deps if d in order):
+                    continue
+
+                pending.remove(name)
+                keys[name] = stage_key(name, keys, state["files"])
+                previous = state["stages"].get(name, {})
+                # Tahap dependensi yang baru dijalankan memaksa tahap ini ikut jalan
+                upstream_ran = any(status.get(d) == "ran" for d in deps)
+                rebuild = rebuild_schema and name == "dw_schema"
+                if (not force and not rebuild and not upstream_ran and previous.get("key") == keys[name]
+                        and outputs_current(name)):
+                    finish(name, "skipped")
+                else:
+                    print(f"▶️  {name} dijalankan...")
+                    running[pool.submit(_execute, name, workers, rebuild)] = name
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    rows, wall, peak = future.result()
+                except Exception as e:
+                    finish(name, "failed", error=f"{type(e).__name__}: {e}")
+                    continue
+                # Kunci dihitung ulang: file input bisa baru ditulis tahap ini
+                keys[name] = stage_key(name, keys, state["files"])
+                state["stages"][name] = {"key": keys[name], "finished_at": run_id}
+                save_state(state, state_file)
+                finish(name, "ran", rows, wall, peak)
+
+    save_state(state, state_file)
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Jalankan pipeline BI sebagai DAG")
+    parser.add_argument('stages', nargs='*', help=f"Tahap target (default semua): {', '.join(STAGES)}")
+    parser.add_argument('--jobs', type=int, default=2, help="Tahap yang boleh berjalan paralel")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Anggaran core training (default: semua core)")
+    parser.add_argument('--force', action='store_true', help="Jalankan ulang walaupun input tidak berubah")
+    parser.add_argument('--rebuild-schema', action='store_true',
+                        help="Hapus & buat ulang seluruh tabel data warehouse (data hilang)")
+    parser.add_argument('--state', default=STATE_FILE)
+    parser.add_argument('--log', default=LOG_FILE)
+    args = parser.parse_args(argv)
+
+    print("=== PIPELINE BI ===")
+    start = time.perf_counter()
+    records = run_pipeline(args.stages or None, args.jobs, args.workers, args.force,
+                           args.state, args.log, args.rebuild_schema)
+    print(f"Selesai dalam {time.perf_counter() - start:.2f} s, run log: {args.log}")
+    return 1 if any(r["status"] in ("failed", "blocked") for r in records) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,24 @@
 import pandas as pd
 import numpy as np
 import random
+import sqlite3
+import sys
+import pyarrow as pa
+import pyarrow.compute as pc
+
+import instrument
+import near_dedup
+import staging
 
 # =========================
 # KONFIGURASI FILE
 # =========================
-FILE_WEBTOON = 'D:/UAS_BI/Data_Staging/webtoon_originals_id.csv'
-FILE_MANGA = 'D:/UAS_BI/Data_Staging/Manga_Details.csv'
-OUTPUT_FILE = 'D:/UAS_BI/Data_Staging/data_gabungan.csv'
+# Folder & format staging dari .env (STAGING_DIR, STAGING_FORMAT); sumber
+# mentah tetap CSV, output mengikuti STAGING_FORMAT (default Parquet)
+FILE_WEBTOON = staging.staging_path('webtoon_originals_id', 'csv')
+FILE_MANGA = staging.staging_path('Manga_Details', 'csv')
+OUTPUT_FILE = staging.staging_path('data_gabungan')
+NEAR_DUP_REPORT = staging.staging_path('near_duplicates', 'csv')
 
 VALID_WEEKDAYS = [
     'MONDAY', 'TUESDAY', 'WEDNESDAY',
@@ -16,6 +27,16 @@ VALID_WEEKDAYS = [
 
 VALID_LENGTH = ['SHORT', 'MEDIUM', 'LONG']
 
+# Kata-kata yang tidak perlu dikapitalisasi penuh (kecuali di awal)
+SMALL_WORDS = {'a', 'an', 'and', 'as', 'at', 'but', 'by', 'for',
+               'in', 'nor', 'of', 'on', 'or', 'so', 'the', 'to',
+               'up', 'yet', 'with'}
+
+# Mode streaming: jumlah baris per chunk & tipe kolom output yang tetap
+# (subscribers: angka Webtoon + teks Manga → teks di Parquet / Arrow)
+DEFAULT_CHUNKSIZE = 100_000
+STREAMING_DTYPES = {'rating': 'float64', 'year': 'float64', 'subscribers': 'object'}
+
 TARGET_COLUMNS = [
     'title', 'genre', 'author', 'weekdays', 'length',
     'subscribers', 'status', 'rating', 'year',
@@ -35,11 +56,6 @@ def format_title(title):
     
     title = str(title)
     
-    # Kata-kata yang tidak perlu dikapitalisasi penuh (kecuali di awal)
-    small_words = {'a', 'an', 'and', 'as', 'at', 'but', 'by', 'for', 
-                   'in', 'nor', 'of', 'on', 'or', 'so', 'the', 'to', 
-                   'up', 'yet', 'with'}
-    
     # Split judul menjadi kata-kata
     words = title.split()
     formatted_words = []
@@ -54,7 +70,7 @@ def format_title(title):
             if i == 0:
                 formatted_words.append(word.title())
             # Kata-kata kecil tidak dikapitalisasi (kecuali penting)
-            elif word.lower() in small_words:
+            elif word.lower() in SMALL_WORDS:
                 formatted_words.append(word.lower())
             else:
                 formatted_words.append(word.title())
@@ -62,33 +78,128 @@ def format_title(title):
     return ' '.join(formatted_words)
 
 # =========================
-# PRE-ETL HARMONIZATION
+# VERSI VEKTOR (PER KOLOM)
 # =========================
-def pre_etl_harmonization():
-    print("=== MULAI PROSES HARMONISASI DATA ===")
+def format_title_vectorized(titles):
+    """
+    Versi vektor dari format_title. Judul dipecah menjadi kata dengan
+    kernel string Arrow, aturan kapitalisasi dihitung sekali per kata unik
+    (kosakata jauh lebih kecil dari jumlah baris), lalu judul disusun
+    kembali. Hasil identik dengan titles.apply(format_title).
+    """
+    titles = pd.Series(titles)
+    result = titles.astype(object).copy()
+
+    mask_valid = titles.notna().to_numpy()
+    s = titles[mask_valid].astype(str)
+    arr = pa.array(s.to_numpy(dtype=object), type=pa.string())
+
+    # Judul dengan karakter non-ASCII diproses per baris, karena definisi
+    # spasi Unicode str.split() tidak dijamin sama dengan Arrow
+    mask_slow = pc.match_substring_regex(arr, r'[^\x00-\x7f]')
+    mask_slow = mask_slow.to_numpy(zero_copy_only=False)
+    fast = arr.filter(pa.array(~mask_slow))
+
+    # 1. Pecah menjadi kata (setara title.split(): token kosong dibuang)
+    words = pc.utf8_split_whitespace(fast)
+    offsets = words.offsets.to_numpy()
+    flat = words.flatten()
+    keep = pc.greater(pc.binary_length(flat), 0).to_numpy(zero_copy_only=False)
+    kept_before = np.concatenate([[0], np.cumsum(keep)])
+    offsets = kept_before[offsets - offsets[0]]
+    flat = flat.filter(pa.array(keep))
+
+    # 2. Tandai kata pertama di setiap judul
+    is_first = np.zeros(len(flat), dtype=bool)
+    non_empty = offsets[1:] > offsets[:-1]
+    is_first[offsets[:-1][non_empty]] = True
+
+    # 3. Terapkan aturan format_title per kata unik
+    encoded = pc.dictionary_encode(flat)
+    vocab = encoded.dictionary.to_pylist()
+    first_forms = [w if w.isupper() else w.title() for w in vocab]
+    other_forms = [
+        w if w.isupper() else (w.lower() if w.lower() in SMALL_WORDS else w.title())
+        for w in vocab
+    ]
+    forms = pa.array(first_forms + other_forms, type=pa.string())
+    codes = encoded.indices.to_numpy(zero_copy_only=False).astype(np.int64)
+    codes[~is_first] += len(vocab)
 
-    # 1. LOAD DATA
-    df_webtoon = pd.read_csv(FILE_WEBTOON, encoding='latin-1')
-    df_manga = pd.read_csv(FILE_MANGA, encoding='latin-1')
+    # 4. Susun kembali judul
+    formatted = pa.ListArray.from_arrays(
+        pa.array(offsets, type=pa.int32()), forms.take(pa.array(codes))
+    )
+    formatted = pc.binary_join(formatted, ' ')
 
-    df_webtoon.columns = df_webtoon.columns.str.lower().str.strip()
-    df_manga.columns = df_manga.columns.str.lower().str.strip()
+    valid_index = s.index
+    result[valid_index[~mask_slow]] = formatted.to_numpy(zero_copy_only=False)
+    slow_index = valid_index[mask_slow]
+    if len(slow_index) > 0:
+        result[slow_index] = s[slow_index].map(format_title)
 
-    # 2. PASTIKAN KOLOM AUTHOR ADA
-    if 'authors' not in df_manga.columns:
-        df_manga['authors'] = np.nan
+    return result
 
-    df_manga.rename(columns={'authors': 'author'}, inplace=True)
-    df_webtoon.rename(columns={'authors': 'author'}, inplace=True)
 
-    # 3. CLEANING DATA MANGA
+def normalize_rating_vectorized(ratings):
+    """Normalisasi rating 1–10 → 1–5 untuk satu kolom sekaligus."""
+    ratings = pd.to_numeric(ratings, errors='coerce')
+    return ratings.mask(ratings > 5, ratings / 2)
+
+
+def random_choice_vectorized(population, n, rng=random):
+    """
+    Setara [rng.choice(population) for _ in range(n)], termasuk urutan
+    state RNG, tetapi bit acak diambil sekaligus lalu diolah dengan NumPy.
+
+    random.choice memakai getrandbits(k) (satu word 32-bit per percobaan,
+    diambil k bit teratas) dan menolak nilai >= len(population).
+    """
+    population = np.asarray(population, dtype=object)
+    size = len(population)
+    k = size.bit_length()
+
+    parts = []
+    remaining = int(n)
+    while remaining > 0:
+        # Ambil tepat `remaining` word agar state RNG tidak melewati
+        # jumlah percobaan yang dipakai versi per baris
+        bits = rng.getrandbits(32 * remaining)
+        words = np.frombuffer(bits.to_bytes(4 * remaining, 'little'), dtype='<u4')
+        idx = words >> np.uint32(32 - k)
+        idx = idx[idx < size]
+        parts.append(idx)
+        remaining -= len(idx)
+
+    if not parts:
+        return population[:0]
+    return population[np.concatenate(parts).astype(np.intp)]
+
+# =========================
+# CLEANING PER SUMBER
+# =========================
+def _clean_columns(df):
+    """Nama kolom huruf kecil + kolom authors → author."""
+    df.columns = df.columns.str.lower().str.strip()
+    if 'authors' not in df.columns and 'author' not in df.columns:
+        df['authors'] = np.nan
+    df.rename(columns={'authors': 'author'}, inplace=True)
+    return df
+
+
+def _clean_manga(df_manga, vectorized=True):
+    """Cleaning data Manga, hasil sudah berstruktur TARGET_COLUMNS."""
+    df_manga = _clean_columns(df_manga)
     df_manga['title_original'] = df_manga['title'].copy()
     
     # Clean judul: lower case dulu untuk konsistensi
     df_manga['title'] = df_manga['title'].astype(str).str.lower().str.strip()
     
     # Format judul menjadi Title Case
-    df_manga['title'] = df_manga['title'].apply(format_title)
+    if vectorized:
+        df_manga['title'] = format_title_vectorized(df_manga['title'])
+    else:
+        df_manga['title'] = df_manga['title'].apply(format_title)
     
     # Author cleaning
     df_manga['author'] = df_manga['author'].astype(str).str.strip()
@@ -108,18 +219,33 @@ def pre_etl_harmonization():
     )
 
     mask_length_na = df_manga['length'].isna()
-    df_manga.loc[mask_length_na, 'length'] = [
-        random.choice(VALID_LENGTH) for _ in range(mask_length_na.sum())
-    ]
+    if vectorized:
+        df_manga.loc[mask_length_na, 'length'] = random_choice_vectorized(
+            VALID_LENGTH, mask_length_na.sum()
+        )
+    else:
+        df_manga.loc[mask_length_na, 'length'] = [
+            random.choice(VALID_LENGTH) for _ in range(mask_length_na.sum())
+        ]
 
     # WEEKDAYS RANDOM
-    df_manga['weekdays'] = [
-        random.choice(VALID_WEEKDAYS) for _ in range(len(df_manga))
-    ]
+    if vectorized:
+        df_manga['weekdays'] = random_choice_vectorized(
+            VALID_WEEKDAYS, len(df_manga)
+        )
+    else:
+        df_manga['weekdays'] = [
+            random.choice(VALID_WEEKDAYS) for _ in range(len(df_manga))
+        ]
 
     df_manga['source_type'] = 'MANGA/WEBTOON ID'
 
-    # 4. CLEANING DATA WEBTOON
+    return df_manga.reindex(columns=TARGET_COLUMNS)
+
+
+def _clean_webtoon(df_webtoon, vectorized=True):
+    """Cleaning data Webtoon, hasil sudah berstruktur TARGET_COLUMNS."""
+    df_webtoon = _clean_columns(df_webtoon)
     df_webtoon['title_original'] = df_webtoon['title'].copy()
     
     df_webtoon.drop(
@@ -131,32 +257,29 @@ def pre_etl_harmonization():
     df_webtoon['title'] = df_webtoon['title'].astype(str).str.lower().str.strip()
     
     # Format judul menjadi Title Case
-    df_webtoon['title'] = df_webtoon['title'].apply(format_title)
+    if vectorized:
+        df_webtoon['title'] = format_title_vectorized(df_webtoon['title'])
+    else:
+        df_webtoon['title'] = df_webtoon['title'].apply(format_title)
     
     df_webtoon['genre'] = df_webtoon['genre'].astype(str).str.upper().str.strip()
     df_webtoon['weekdays'] = df_webtoon['weekdays'].astype(str).str.upper().str.strip()
 
     df_webtoon['source_type'] = 'WEBTOON ORIGINALS'
 
-    # 5. SAMAKAN STRUKTUR KOLOM
-    df_webtoon = df_webtoon.reindex(columns=TARGET_COLUMNS)
-    df_manga = df_manga.reindex(columns=TARGET_COLUMNS)
+    return df_webtoon.reindex(columns=TARGET_COLUMNS)
 
-    # 6. GABUNGKAN DATA
-    df_combined = pd.concat([df_webtoon, df_manga], ignore_index=True)
 
-    # 7. HAPUS STATUS CANCELLED
-    if 'status' in df_combined.columns:
-        before = len(df_combined)
-        df_combined = df_combined[
-            df_combined['status'].astype(str).str.upper() != 'CANCELLED'
-        ]
-        print(f"Data CANCELLED dihapus: {before - len(df_combined)} baris")
+def _drop_cancelled(df):
+    """Hapus baris berstatus CANCELLED, kembalikan (df, jumlah_dihapus)."""
+    before = len(df)
+    df = df[df['status'].astype(str).str.upper() != 'CANCELLED']
+    return df, before - len(df)
 
-    # 8. NORMALISASI RATING (1–10 → 1–5)
-    df_combined['rating'] = pd.to_numeric(
-        df_combined['rating'], errors='coerce'
-    )
+
+def _normalize_rating_column(df, vectorized=True):
+    """NORMALISASI RATING (1–10 → 1–5), dibulatkan 2 desimal."""
+    df['rating'] = pd.to_numeric(df['rating'], errors='coerce')
 
     def normalize_rating(r):
         if pd.isna(r):
@@ -165,13 +288,69 @@ def pre_etl_harmonization():
             return r
         return r / 2
 
-    df_combined['rating'] = df_combined['rating'].apply(normalize_rating)
-    df_combined['rating'] = df_combined['rating'].round(2)
+    if vectorized:
+        df['rating'] = normalize_rating_vectorized(df['rating'])
+    else:
+        df['rating'] = df['rating'].apply(normalize_rating)
+    df['rating'] = df['rating'].round(2)
+    return df
+
+# =========================
+# PRE-ETL HARMONIZATION
+# =========================
+@instrument.timed("pre_etl_harmonization", rows=lambda df, *a, **k: len(df))
+def pre_etl_harmonization(file_webtoon=FILE_WEBTOON, file_manga=FILE_MANGA,
+                          output_file=OUTPUT_FILE, seed=None, vectorized=True,
+                          near_duplicates=False, near_dup_params=None):
+    """
+    Harmonisasi data Webtoon + Manga menjadi data_gabungan.csv.
+
+    vectorized=True memakai operasi per kolom (format_title_vectorized,
+    normalize_rating_vectorized, random_choice_vectorized); False memakai
+    jalur lama per baris. Dengan seed yang sama, keduanya menghasilkan
+    file yang identik byte per byte.
+
+    near_duplicates=True juga membuang varian judul yang sama (lihat
+    near_dedup.py; parameter lewat near_dup_params) dan menulis laporan
+    cluster ke NEAR_DUP_REPORT.
+    """
+    print("=== MULAI PROSES HARMONISASI DATA ===")
+
+    if seed is not None:
+        random.seed(seed)
+
+    # 1. LOAD DATA
+    df_webtoon = pd.read_csv(file_webtoon, encoding='latin-1')
+    df_manga = pd.read_csv(file_manga, encoding='latin-1')
+
+    # 2-5. CLEANING DATA MANGA & WEBTOON + SAMAKAN STRUKTUR KOLOM
+    df_manga = _clean_manga(df_manga, vectorized)
+    df_webtoon = _clean_webtoon(df_webtoon, vectorized)
+
+    # 6. GABUNGKAN DATA
+    df_combined = pd.concat([df_webtoon, df_manga], ignore_index=True)
+
+    # 7. HAPUS STATUS CANCELLED
+    df_combined, n_cancelled = _drop_cancelled(df_combined)
+    print(f"Data CANCELLED dihapus: {n_cancelled} baris")
+
+    # 8. NORMALISASI RATING (1–10 → 1–5)
+    df_combined = _normalize_rating_column(df_combined, vectorized)
 
     # 9. FINAL CLEANING
     before_dedup = len(df_combined)
     df_combined.drop_duplicates(subset=['title'], inplace=True)
     print(f"Duplikat dihapus: {before_dedup - len(df_combined)} baris")
+
+    if near_duplicates:
+        df_combined, report, stats = near_dedup.drop_near_duplicates(
+            df_combined, **(near_dup_params or {})
+        )
+        report.to_csv(NEAR_DUP_REPORT, index=False)
+        print(
+            f"Near-duplicate dihapus: {stats['dropped']} baris "
+            f"({stats['clusters']} cluster, laporan: {NEAR_DUP_REPORT})"
+        )
     
     df_combined.reset_index(drop=True, inplace=True)
 
@@ -182,11 +361,158 @@ def pre_etl_harmonization():
 
     # 9. SIMPAN FILE
     print(f"\nTOTAL DATA AKHIR: {len(df_combined)} baris")
-    df_combined.to_csv(OUTPUT_FILE, index=False)
-    print(f"FILE DISIMPAN KE: {OUTPUT_FILE}")
+    staging.write_frame(df_combined, output_file)
+    print(f"FILE DISIMPAN KE: {output_file}")
 
     return df_combined
 
+# =========================
+# INDEKS JUDUL (MODE STREAMING)
+# =========================
+class SeenTitleIndex:
+    """
+    Indeks judul yang sudah ditulis, disimpan sebagai array hash 64-bit
+    terurut (8 byte per judul). Peluang tabrakan hash untuk 10 juta judul
+    sekitar 3e-6.
+    """
+
+    def __init__(self):
+        self._hashes = np.empty(0, dtype=np.uint64)
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def add_new(self, titles):
+        """
+        Tandai judul yang belum pernah dilihat (juga unik di dalam chunk),
+        lalu masukkan ke indeks. Mengembalikan mask boolean.
+        """
+        hashes = pd.util.hash_array(np.asarray(titles, dtype=object))
+        is_new = ~pd.Series(hashes).duplicated().to_numpy()
+
+        if len(self._hashes) > 0:
+            pos = np.searchsorted(self._hashes, hashes)
+            found = self._hashes[np.minimum(pos, len(self._hashes) - 1)] == hashes
+            is_new &= ~found
+
+        new_hashes = np.sort(hashes[is_new])
+        self._hashes = np.insert(
+            self._hashes, np.searchsorted(self._hashes, new_hashes), new_hashes
+        )
+        return is_new
+
+
+class SqliteTitleIndex:
+    """
+    Indeks judul di disk (SQLite) untuk memori konstan. Hash 64-bit
+    disimpan sebagai INTEGER PRIMARY KEY.
+    """
+
+    _BATCH = 900  # batas parameter SQLite
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_titles (h INTEGER PRIMARY KEY)"
+        )
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM seen_titles").fetchone()[0]
+
+    def add_new(self, titles):
+        hashes = pd.util.hash_array(np.asarray(titles, dtype=object)).view(np.int64)
+        is_new = ~pd.Series(hashes).duplicated().to_numpy()
+
+        seen = set()
+        for i in range(0, len(hashes), self._BATCH):
+            batch = [int(h) for h in hashes[i:i + self._BATCH]]
+            placeholders = ','.join('?' * len(batch))
+            seen.update(
+                row[0] for row in self.conn.execute(
+                    f"SELECT h FROM seen_titles WHERE h IN ({placeholders})", batch
+                )
+            )
+        if seen:
+            is_new &= ~np.isin(hashes, np.fromiter(seen, dtype=np.int64))
+
+        self.conn.executemany(
+            "INSERT INTO seen_titles (h) VALUES (?)",
+            ((int(h),) for h in hashes[is_new])
+        )
+        self.conn.commit()
+        return is_new
+
+    def close(self):
+        self.conn.close()
+
+# =========================
+# PRE-ETL HARMONIZATION (STREAMING)
+# =========================
+@instrument.timed("pre_etl_harmonization", rows=lambda n_rows, *a, **k: n_rows)
+def pre_etl_harmonization_streaming(file_webtoon=FILE_WEBTOON, file_manga=FILE_MANGA,
+                                    output_file=OUTPUT_FILE, chunksize=DEFAULT_CHUNKSIZE,
+                                    seed=None, title_index=None):
+    """
+    Harmonisasi dengan memori terbatas: setiap sumber dibaca per chunk,
+    judul duplikat (antar chunk & antar sumber) disaring lewat title_index,
+    dan hasil langsung ditambahkan ke output_file.
+
+    Urutan & isi baris sama dengan pre_etl_harmonization (Webtoon dulu,
+    lalu Manga; duplikat pertama yang dipertahankan). Kolom acak
+    (length/weekdays Manga) diambil per chunk, sehingga nilainya berbeda
+    dari mode in-memory meski seed sama.
+
+    title_index: SeenTitleIndex (default, di memori) atau SqliteTitleIndex.
+    """
+    print("=== MULAI PROSES HARMONISASI DATA (STREAMING) ===")
+
+    if seed is not None:
+        random.seed(seed)
+    if title_index is None:
+        title_index = SeenTitleIndex()
+
+    sources = [
+        (file_webtoon, _clean_webtoon),
+        (file_manga, _clean_manga),
+    ]
+
+    next_id = 1
+    n_cancelled = 0
+    n_duplicates = 0
+    writer = staging.FrameWriter(output_file)
+
+    for path, clean in sources:
+        reader = pd.read_csv(path, encoding='latin-1', chunksize=chunksize)
+        for chunk in reader:
+            chunk = clean(chunk)
+
+            chunk, dropped = _drop_cancelled(chunk)
+            n_cancelled += dropped
+
+            chunk = _normalize_rating_column(chunk)
+
+            is_new = title_index.add_new(chunk['title'])
+            n_duplicates += int((~is_new).sum())
+            chunk = chunk[is_new]
+
+            # Tipe kolom tetap sama antar chunk (misal year tanpa NaN)
+            chunk = chunk.astype(STREAMING_DTYPES)
+            chunk.insert(0, 'title_id', np.arange(next_id, next_id + len(chunk)))
+            next_id += len(chunk)
+
+            writer.write(chunk)
+
+    writer.close()
+    print(f"Data CANCELLED dihapus: {n_cancelled} baris")
+    print(f"Duplikat dihapus: {n_duplicates} baris")
+    print(f"\nTOTAL DATA AKHIR: {next_id - 1} baris")
+    print(f"FILE DISIMPAN KE: {output_file}")
+
+    return next_id - 1
+
 # MAIN
 if __name__ == "__main__":
-    pre_etl_harmonization()
\ No newline at end of file
+    if '--stream' in sys.argv:
+        pre_etl_harmonization_streaming()
+    else:
+        pre_etl_harmonization(near_duplicates='--near-dedup' in sys.argv)
@@ -0,0 +1,148 @@
+# scripts/score_models.py
+"""
+Scoring harian: hanya baris dim_comics yang baru / berubah sejak scoring
+terakhir (title_id belum ada di fact_predictions, atau row_hash berbeda)
+yang diprediksi dengan model tersimpan (model_store), per batch, lalu
+di-upsert ke fact_predictions.
+
+Model dibuat oleh train_models.py; jalankan training dulu.
+
+Contoh:
+    python score_models.py --batch-size 20000
+"""
+import argparse
+
+import numpy as np
+from sqlalchemy import text
+
+import train_models as tm
+from bulk_loader import copy_into
+from db_connector import get_engine
+from feature_codec import ids_to_csr
+from model_store import MODEL_DIR, read_artifact
+from data_version import record_run
+from dw_frames import read_chunks, select_sql
+from dw_schema import refresh_summary_views, schema_ready
+
+DEFAULT_BATCH_SIZE = 10_000
+
+# target → (kolom prediksi, status yang dinilai; None = semua baris)
+PREDICTIONS = {
+    "Target_Audience": ("Target_Audience_Pred", None),
+    "Popularity": ("Popularity_Pred", "COMPLETED"),
+    "Viral_Potential": ("Viral_Potential_Pred", "ONGOING"),
+}
+
+# Kolom PROJECTIONS["score_models"] saja, dibaca per batch (server-side cursor)
+DELTA_SQL = select_sql(
+    "v_comics c LEFT JOIN fact_predictions f USING (title_id)", "score_models",
+    where="f.title_id IS NULL OR f.row_hash IS DISTINCT FROM c.row_hash",
+    order_by="c.title_id", alias="c"
+)
+
+
+def load_models(model_dir=MODEL_DIR):
+    artifacts = {}
+    for target in PREDICTIONS:
+        artifact = read_artifact(target, model_dir)
+        if artifact is None:
+            print(f"⚠️  Artefak {target} tidak ada di {model_dir}, kolom prediksinya dikosongkan")
+            continue
+        artifacts[target] = artifact
+    return artifacts
+
+
+def _genre_matrix(genre_ids, n_genres):
+    """Genre yang ditambahkan setelah training tidak dikenal model → diabaikan."""
+    genre_ids = [
+        [i for i in ids if i < n_genres] if isinstance(ids, (list, tuple, np.ndarray)) else []
+        for ids in genre_ids
+    ]
+    return ids_to_csr(genre_ids, n_genres)
+
+
+def score_batch(batch, artifacts):
+    """Prediksi satu batch v_comics → baris fact_predictions."""
+    # Encoding fitur sama untuk semua target (satu prepare_data saat training)
+    preprocessing = next(iter(artifacts.values()))['preprocessing']
+    out = tm.apply_preprocessing(batch, preprocessing)
+
+    status = batch['status'].astype(str).str.upper().to_numpy()
+    for target, (pred_col, scope) in PREDICTIONS.items():
+        out[pred_col] = None
+        artifact = artifacts.get(target)
+        mask = np.ones(len(batch), dtype=bool) if scope is None else status == scope
+        if artifact is None or not mask.any():
+            continue
+
+        model, le_y, features = artifact['model'], artifact['label_encoder'], artifact['features']
+        rows = out[mask].reset_index(drop=True)
+        genre_matrix = _genre_matrix(rows['genre_ids'], model.n_features_in_ - len(features))
+        X = tm.engine_input(tm.feature_matrix(rows, features, genre_matrix), artifact['engine'])
+        out.loc[mask, pred_col] = le_y.inverse_transform(model.predict(X))
+
+    return out[tm.FACT_COLUMNS]
+
+
+def upsert_predictions(conn, frame):
+    """COPY ke tabel stage sementara lalu INSERT ... ON CONFLICT (title_id)."""
+    conn.execute(text(
+        "CREATE TEMP TABLE IF NOT EXISTS stage_fact_predictions "
+        "(LIKE fact_predictions INCLUDING DEFAULTS) ON COMMIT DROP;"
+    ))
+    conn.execute(text("TRUNCATE stage_fact_predictions;"))
+    copy_into(conn.connection, frame, 'stage_fact_predictions')
+
+    cols = ', '.join(f'"{c}"' for c in frame.columns)
+    updates = ', '.join(f'"{c}" = EXCLUDED."{c}"' for c in frame.columns if c != 'title_id')
+    conn.execute(text(f"""
+        INSERT INTO fact_predictions ({cols})
+        SELECT {cols} FROM stage_fact_predictions
+        ON CONFLICT (title_id) DO UPDATE SET {updates}, scored_at = now();
+    """))
+
+
+def score_delta(batch_size=DEFAULT_BATCH_SIZE, model_dir=MODEL_DIR):
+    engine = get_engine()
+    raw = engine.raw_connection()
+    try:
+        if not schema_ready(raw.cursor()):
+            raise RuntimeError("Star schema belum ada, jalankan data_etl.py terlebih dahulu")
+    finally:
+        raw.close()
+
+    artifacts = load_models(model_dir)
+    if not artifacts:
+        raise RuntimeError(f"Tidak ada artefak model di {model_dir}")
+
+    n_scored = 0
+    with engine.begin() as conn:
+        for batch in read_chunks(conn, DELTA_SQL, chunksize=batch_size):
+            if batch.empty:
+                continue
+            scored = score_batch(batch, artifacts)
+            upsert_predictions(conn, scored)
+            n_scored += len(batch)
+            print(f"  batch {len(batch)} baris di-upsert (total {n_scored})")
+        if n_scored > 0:
+            refresh_summary_views(conn.connection.cursor())
+            record_run(conn, "scoring", n_scored)
+    return n_scored
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scoring baris dim_comics baru/berubah")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--model-dir', default=MODEL_DIR)
+    args = parser.parse_args(argv)
+
+    print("=== SCORING DELTA dim_comics ===")
+    n_scored = score_delta(args.batch_size, args.model_dir)
+    if n_scored == 0:
+        print("✅ Tidak ada baris baru/berubah, fact_predictions sudah terbaru.")
+    else:
+        print(f"✅ {n_scored} baris diprediksi & di-upsert ke fact_predictions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+# scripts/similar_comics.py
+"""
+Rekomendasi berbasis konten: top-k komik serupa per title_id, dihitung
+sekali di pipeline dan disimpan di tabel similar_comics (dw_schema), lalu
+dibaca dashboard ("Komik Serupa") lewat PRIMARY KEY.
+
+Vektor komik (sparse, dinormalisasi L2 → skor = cosine similarity):
+- synopsis : HashingVectorizer (kata + bigram, tanpa kosakata tersimpan) +
+             bobot TF-IDF
+- genre    : multi-hot genre_ids
+- author   : one-hot author_id
+masing-masing dinormalisasi lalu diberi bobot (*_WEIGHT).
+
+Index tetangga terdekat:
+- exact  : perkalian matriks sparse per batch + top-k (katalog kecil)
+- approx : TruncatedSVD → vektor dense, dikelompokkan MiniBatchKMeans
+           (inverted file); setiap komik hanya dibandingkan dengan anggota
+           `n_probe` cluster terdekat dari cluster-nya
+- auto   : exact sampai EXACT_MAX_ROWS komik, selebihnya approx
+
+Contoh:
+    python similar_comics.py --k 10
+    python similar_comics.py --method approx --n-probe 16
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.preprocessing import normalize
+from sqlalchemy import text
+
+import instrument
+from bulk_loader import copy_into
+from data_version import record_run
+from db_connector import get_engine
+from dw_frames import read_frame
+from dw_schema import SIMILAR_COMICS_DDL
+from feature_codec import ids_to_csr
+
+TOP_K = 10
+SYNOPSIS_WEIGHT = 1.0
+GENRE_WEIGHT = 0.6
+AUTHOR_WEIGHT = 0.4
+HASH_FEATURES = 2 ** 18
+EXACT_MAX_ROWS = 20_000
+EXACT_BATCH_ROWS = 512
+SVD_COMPONENTS = 64
+SVD_SAMPLE_ROWS = 20_000     # SVD di-fit pada sampel, lalu dipakai untuk semua baris
+N_PROBE = 8
+
+
+# ===============================
+# VEKTOR KOMIK
+# ===============================
+def comic_vectors(df, genre_matrix):
+    """Matriks CSR (n_komik x fitur), baris ternormalisasi L2."""
+    hashing = HashingVectorizer(
+        n_features=HASH_FEATURES, ngram_range=(1, 2), alternate_sign=False, norm=None
+    )
+    synopsis = TfidfTransformer(sublinear_tf=True).fit_transform(
+        hashing.transform(df['synopsis'].fillna("").astype(str))
+    )
+
+    author_codes = pd.factorize(df['author_id'])[0]
+    has_author = author_codes >= 0
+    authors = sparse.csr_matrix(
+        (np.ones(has_author.sum()), (np.flatnonzero(has_author), author_codes[has_author])),
+        shape=(len(df), max(author_codes.max() + 1, 1))
+    )
+
+    blocks = [
+        SYNOPSIS_WEIGHT * normalize(synopsis),
+        GENRE_WEIGHT * normalize(genre_matrix.astype(np.float32)),
+        AUTHOR_WEIGHT * authors,
+    ]
+    return normalize(sparse.hstack(blocks, format='csr').astype(np.float32))
+
+
+def _top_k(scores, k, exclude):
+    """Top-k kolom per baris (skor > 0), tanpa kolom `exclude` (komik itu sendiri)."""
+    rows = np.arange(len(scores))
+    scores[rows, exclude] = -np.inf
+    k = min(k, scores.shape[1] - 1)
+    idx = np.argpartition(-scores, k - 1, axis=1)[:, :k] if k > 0 else np.empty((len(scores), 0), int)
+    top = np.take_along_axis(scores, idx, axis=1)
+    order = np.argsort(-top, axis=1, kind='stable')
+    return np.take_along_axis(idx, order, axis=1), np.take_along_axis(top, order, axis=1)
+
+
+# ===============================
+# NEAREST NEIGHBOR
+# ===============================
+def exact_neighbors(X, k=TOP_K, batch_rows=EXACT_BATCH_ROWS):
+    """Top-k cosine tepat: X[batch] @ X.T per batch (memori batch x n)."""
+    n = X.shape[0]
+    neighbors = np.empty((n, min(k, n - 1)), dtype=np.int64)
+    scores = np.empty(neighbors.shape, dtype=np.float32)
+    XT = X.T.tocsr()
+    for start in range(0, n, batch_rows):
+        stop = min(start + batch_rows, n)
+        sims = (X[start:stop] @ XT).toarray()
+        neighbors[start:stop], scores[start:stop] = _top_k(sims, k, np.arange(start, stop))
+    return neighbors, scores
+
+
+def approx_neighbors(X, k=TOP_K, n_components=SVD_COMPONENTS, n_lists=None, n_probe=N_PROBE, seed=42):
+    """
+    Top-k cosine perkiraan (inverted file): vektor diproyeksikan SVD ke
+    n_components dimensi lalu dikelompokkan ke n_lists cluster (default
+    sqrt(n)). Anggota satu cluster hanya dibandingkan dengan anggota n_probe
+    cluster yang centroid-nya paling dekat; skornya cosine tepat di X.
+    """
+    n = X.shape[0]
+    n_components = min(n_components, X.shape[1] - 1)
+    rng = np.random.default_rng(seed)
+    sample = rng.choice(n, min(n, SVD_SAMPLE_ROWS), replace=False)
+    svd = TruncatedSVD(n_components, n_iter=3, random_state=seed).fit(X[sample])
+    Z = normalize(svd.transform(X)).astype(np.float32)
+
+    n_lists = min(n_lists or max(1, int(np.sqrt(n))), n)
+    n_probe = min(n_probe, n_lists)
+    kmeans = MiniBatchKMeans(n_lists, random_state=seed, n_init=1, batch_size=4096).fit(Z)
+    labels = kmeans.labels_
+    centroids = normalize(kmeans.cluster_centers_).astype(np.float32)
+    # Cluster sendiri selalu di posisi pertama daftar probe
+    centroid_sims = centroids @ centroids.T
+    np.fill_diagonal(centroid_sims, np.inf)
+    probes = np.argsort(-centroid_sims, axis=1)[:, :n_probe]
+
+    order = np.argsort(labels, kind='stable')
+    bounds = np.searchsorted(labels[order], np.arange(n_lists + 1))
+    members = [order[bounds[c]:bounds[c + 1]] for c in range(n_lists)]
+
+    neighbors = np.full((n, k), -1, dtype=np.int64)
+    scores = np.full((n, k), -np.inf, dtype=np.float32)
+    for c in range(n_lists):
+        queries = members[c]
+        if not len(queries):
+            continue
+        candidates = np.concatenate([members[p] for p in probes[c]])
+        sims = (X[queries] @ X[candidates].T).toarray()
+        # Anggota cluster c ada di awal daftar kandidat → posisi komik itu sendiri
+        idx, top = _top_k(sims, k, np.arange(len(queries)))
+        neighbors[queries, :idx.shape[1]] = candidates[idx]
+        scores[queries, :idx.shape[1]] = top
+    return neighbors, scores
+
+
+def nearest_neighbors(X, k=TOP_K, method="auto", **approx_params):
+    if method == "auto":
+        method = "exact" if X.shape[0] <= EXACT_MAX_ROWS else "approx"
+    if method == "exact":
+        return exact_neighbors(X, k)
+    if method == "approx":
+        return approx_neighbors(X, k, **approx_params)
+    raise ValueError(f"Metode tidak dikenal: {method} (pilihan: auto, exact, approx)")
+
+
+# ===============================
+# PIPELINE
+# ===============================
+def load_comics(engine):
+    """Kolom yang dipakai vektor (PROJECTIONS["similar_comics"]) + matriks multi-hot genre."""
+    df = read_frame(engine, "dim_comics", "similar_comics")
+    n_genres = pd.read_sql("SELECT COUNT(*) AS n FROM dim_genre", con=engine)['n'].iloc[0]
+    return df, ids_to_csr(df['genre_ids'], int(n_genres))
+
+
+def similar_frame(title_ids, neighbors, scores):
+    """Array tetangga → baris tabel similar_comics (hanya skor > 0)."""
+    n, k = neighbors.shape
+    frame = pd.DataFrame({
+        'title_id': np.repeat(title_ids, k),
+        'rank': np.tile(np.arange(1, k + 1, dtype=np.int16), n),
+        'similar_id': title_ids[np.clip(neighbors.ravel(), 0, None)],
+        'score': scores.ravel(),
+    })
+    frame = frame[(neighbors.ravel() >= 0) & (frame['score'] > 0)]
+    # rank dihitung ulang setelah skor 0 dibuang supaya tetap 1..m
+    frame['rank'] = frame.groupby('title_id').cumcount().astype(np.int16) + 1
+    return frame
+
+
+@instrument.timed("similar_comics", rows=lambda n_rows, *a, **k: n_rows)
+def build_similar_comics(k=TOP_K, method="auto", **approx_params):
+    """Hitung ulang tabel similar_comics. Mengembalikan jumlah baris yang ditulis."""
+    engine = get_engine()
+    df, genre_matrix = load_comics(engine)
+    if len(df) < 2:
+        print("Katalog terlalu kecil untuk komik serupa.")
+        return 0
+
+    X = comic_vectors(df, genre_matrix)
+    neighbors, scores = nearest_neighbors(X, k, method, **approx_params)
+    frame = similar_frame(df['title_id'].to_numpy(), neighbors, scores)
+
+    # Tabel diisi ulang dalam satu transaksi; versi data baru → cache dashboard dimuat ulang
+    with engine.begin() as conn:
+        conn.execute(text(SIMILAR_COMICS_DDL))
+        conn.execute(text("TRUNCATE similar_comics;"))
+        copy_into(conn.connection, frame, 'similar_comics')
+        record_run(conn, "similar_comics", len(frame))
+    return len(frame)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bangun tabel komik serupa (rekomendasi berbasis konten)")
+    parser.add_argument('--k', type=int, default=TOP_K, help="Jumlah komik serupa per komik")
+    parser.add_argument('--method', choices=['auto', 'exact', 'approx'], default='auto')
+    parser.add_argument('--n-probe', type=int, default=N_PROBE, help="Cluster yang dicari (approx)")
+    parser.add_argument('--n-lists', type=int, default=None, help="Jumlah cluster (approx, default sqrt(n))")
+    args = parser.parse_args(argv)
+
+    approx_params = {"n_probe": args.n_probe, "n_lists": args.n_lists}
+    n_rows = build_similar_comics(args.k, args.method, **approx_params)
+    print(f"✅ {n_rows} pasangan komik serupa disimpan ke tabel similar_comics")
+    return n_rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+# scripts/staging.py
+"""
+Lapisan staging antar tahap pipeline (folder Data_Staging).
+
+Konfigurasi dibaca dari .env (root proyek) / environment:
+    STAGING_DIR      folder staging (default: <root proyek>/Data_Staging)
+    STAGING_FORMAT   parquet (default) | arrow | csv
+
+Dataset disimpan per nama (misal "data_gabungan"), ekstensi sesuai format:
+    .parquet  kolumnar bertipe, kompresi zstd, bisa baca sebagian kolom
+    .arrow    Arrow IPC (Feather v2) tanpa kompresi → dibaca lewat memory
+              map (zero-copy) untuk kolom numerik
+    .csv      format lama; tetap didukung untuk impor / ekspor
+
+Contoh:
+    python staging.py import data_gabungan feature_table   # CSV → STAGING_FORMAT
+    python staging.py export data_gabungan                 # → CSV
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from dotenv import load_dotenv
+
+PROJECT_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+load_dotenv(os.path.join(PROJECT_DIR, ".env"))
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+PARQUET_COMPRESSION = "zstd"
+CSV_ENCODING = "latin-1"
+
+
+def staging_dir():
+    return os.getenv("STAGING_DIR") or os.path.join(PROJECT_DIR, "Data_Staging")
+
+
+def staging_format():
+    fmt = (os.getenv("STAGING_FORMAT") or "parquet").lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"STAGING_FORMAT tidak dikenal: {fmt} (pilihan: {', '.join(FORMATS)})")
+    return fmt
+
+
+def format_of(path):
+    ext = os.path.splitext(path)[1].lower()
+    for fmt, fmt_ext in FORMATS.items():
+        if ext == fmt_ext:
+            return fmt
+    raise ValueError(f"Ekstensi file staging tidak dikenal: {path}")
+
+
+def staging_path(name, fmt=None, directory=None):
+    """Path dataset `name` dalam format `fmt` (default STAGING_FORMAT)."""
+    return os.path.join(directory or staging_dir(), name + FORMATS[fmt or staging_format()])
+
+
+def dataset_path(name, directory=None):
+    """
+    File dataset yang sudah ada: format STAGING_FORMAT dulu, lalu format
+    lain (parquet, arrow, csv). Jika belum ada sama sekali, path dalam
+    STAGING_FORMAT (untuk ditulis).
+    """
+    preferred = staging_format()
+    for fmt in [preferred] + [f for f in FORMATS if f != preferred]:
+        path = staging_path(name, fmt, directory)
+        if os.path.exists(path):
+            return path
+    return staging_path(name, preferred, directory)
+
+# ===============================
+# KONVERSI ARROW
+# ===============================
+def _stringify_mixed(df):
+    """
+    Kolom object berisi campuran tipe (misal subscribers: int Webtoon +
+    teks Manga) ditulis sebagai teks, sama seperti hasil baca ulang CSV.
+    """
+    df = df.copy(deep=False)
+    for col in df.columns[df.dtypes == object]:
+        values = df[col]
+        mask = values.notna()
+        if not values[mask].map(type).eq(str).all():
+            df[col] = values.where(~mask, values[mask].astype(str))
+    return df
+
+
+def _arrow_schema(df):
+    """Schema Arrow tetap: kolom object selalu string (juga chunk yang kosong/NULL semua)."""
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    for i, col in enumerate(df.columns):
+        if df[col].dtype == object:
+            schema = schema.set(i, pa.field(col, pa.string()))
+    return schema.remove_metadata()
+
+
+def to_arrow(df, schema=None):
+    df = _stringify_mixed(df)
+    return pa.Table.from_pandas(df, schema=schema or _arrow_schema(df), preserve_index=False)
+
+
+def from_arrow(table):
+    """Arrow → pandas; NULL teks menjadi NaN (sama dengan read_csv)."""
+    df = table.to_pandas()
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].fillna(np.nan)
+    return df
+
+# ===============================
+# BACA / TULIS
+# ===============================
+def write_frame(df, path):
+    """Tulis DataFrame ke path; format dari ekstensi. Mengembalikan path."""
+    fmt = format_of(path)
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "parquet":
+        pq.write_table(to_arrow(df), path, compression=PARQUET_COMPRESSION)
+    else:
+        feather.write_feather(to_arrow(df), path, compression="uncompressed")
+    return path
+
+
+def read_frame(path, columns=None, memory_map=True):
+    """
+    Baca file staging; `columns` membatasi kolom yang dibaca (projection).
+    Parquet & Arrow dibuka lewat memory map jika memory_map=True.
+    """
+    fmt = format_of(path)
+    if fmt == "csv":
+        return pd.read_csv(path, encoding=CSV_ENCODING, usecols=columns)
+    if fmt == "parquet":
+        return from_arrow(pq.read_table(path, columns=columns, memory_map=memory_map))
+    return from_arrow(feather.read_table(path, columns=columns, memory_map=memory_map))
+
+
+class FrameWriter:
+    """
+    Tulis DataFrame per chunk ke satu file staging (mode streaming).
+    Schema diambil dari chunk pertama; chunk berikutnya disesuaikan.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.fmt = format_of(path)
+        self.schema = None
+        self._writer = None
+
+    def write(self, df):
+        if self.fmt == "csv":
+            first = self.schema is None
+            df.to_csv(self.path, index=False, mode='w' if first else 'a', header=first)
+            self.schema = True
+            return
+
+        if self.schema is None:
+            self.schema = _arrow_schema(_stringify_mixed(df))
+            if self.fmt == "parquet":
+                self._writer = pq.ParquetWriter(
+                    self.path, self.schema, compression=PARQUET_COMPRESSION
+                )
+            else:
+                self._writer = ipc.new_file(self.path, self.schema)
+        self._writer.write_table(to_arrow(df, self.schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_dataset(df, name, fmt=None, directory=None):
+    return write_frame(df, staging_path(name, fmt, directory))
+
+
+def read_dataset(name, columns=None, directory=None):
+    return read_frame(dataset_path(name, directory), columns=columns)
+
+
+def convert(name, fmt, directory=None):
+    """
+    Impor CSV `name` ke format kolumnar `fmt`, atau ekspor (fmt="csv") dari
+    file parquet / arrow yang ada. Mengembalikan path tujuan.
+    """
+    sources = [f for f in FORMATS if f != "csv"] if fmt == "csv" else ["csv"]
+    for source_fmt in sources:
+        source = staging_path(name, source_fmt, directory)
+        if os.path.exists(source):
+            return write_frame(read_frame(source), staging_path(name, fmt, directory))
+    raise FileNotFoundError(f"Dataset {name} ({'/'.join(sources)}) tidak ditemukan")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Impor / ekspor dataset staging")
+    parser.add_argument('action', choices=['import', 'export'])
+    parser.add_argument('names', nargs='+', help="Nama dataset, misal data_gabungan")
+    parser.add_argument('--format', choices=[f for f in FORMATS if f != "csv"], default=None,
+                        help="Format tujuan impor (default STAGING_FORMAT)")
+    parser.add_argument('--dir', default=None, help="Folder staging (default STAGING_DIR)")
+    args = parser.parse_args(argv)
+
+    fmt = "csv" if args.action == "export" else (args.format or staging_format())
+    if fmt == "csv" and args.action == "import":
+        parser.error("STAGING_FORMAT=csv: tidak ada yang perlu diimpor, pilih --format")
+    for name in args.names:
+        path = convert(name, fmt, args.dir)
+        print(f"✅ {name} → {path} ({os.path.getsize(path) / 1e6:.2f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+# scripts/subscriber_tiers.py
+"""
+Tier subscribers (Low / Medium / High) untuk label Popularity (COMPLETED)
+dan Viral_Potential (ONGOING) dari quantile sketch KLL, tanpa memuat
+seluruh katalog & rank global.
+
+Urutan tier sama dengan train_models.prepare_data: subscribers (NULL diisi
+median subscribers semua komik), seri diputus title_id (rank
+method='first' pada data urut title_id), lalu dibagi tiga seperti
+pd.qcut. Kunci sketch = (2 x subscribers) << 30 | title_id (int64), jadi
+urutan kunci = urutan rank tersebut.
+
+Per status disimpan dua sketch: kunci baris ber-subscribers dan title_id
+baris tanpa subscribers (kuncinya baru bisa dibentuk setelah median
+diketahui); satu sketch lagi untuk median semua komik. Sketch mergeable
+dan dibangun per chunk (data_etl saat load, atau build_from_db lewat
+server-side cursor), lalu disimpan di Data_Staging/subscriber_tiers.json.
+
+Error:
+- KLL: galat rank ternormalisasi ± rank_error(k) (~1,3% untuk k=200).
+  Selama jumlah baris per sketch belum memicu kompaksi, hasilnya persis
+  sama dengan qcut.
+- Sketch tidak bisa menghapus baris. Baris yang berubah/terhapus pada ETL
+  inkremental tetap ada di sketch (stale_rows); tiap baris menggeser rank
+  paling banyak 1, sehingga galat tambahan ≤ stale_rows / n. Di atas
+  STALE_MAX_FRACTION sketch dibangun ulang.
+
+Contoh:
+    python subscriber_tiers.py             # laporan error vs qcut persis
+    python subscriber_tiers.py --rebuild --k 400
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+import staging
+from dw_frames import read_chunks, select_sql
+
+TIER_LABELS = ['Low', 'Medium', 'High']
+# status (huruf besar) → target label
+TIER_TARGETS = {"COMPLETED": "Popularity", "ONGOING": "Viral_Potential"}
+DEFAULT_K = 200
+STALE_MAX_FRACTION = 0.01
+TIERS_FILE = os.path.join(staging.staging_dir(), "subscriber_tiers.json")
+
+_ID_BITS = 30
+_ID_MASK = (1 << _ID_BITS) - 1
+
+
+def rank_error(k):
+    """Galat rank ternormalisasi KLL satu sisi (99% confidence, rumus Apache DataSketches)."""
+    return 2.296 / k ** 0.9723
+
+
+# ===============================
+# KLL SKETCH
+# ===============================
+class KLLSketch:
+    """
+    Sketch kuantil KLL untuk item int64. Level h berbobot 2^h; level
+    yang melebihi kapasitas diurutkan lalu separuh itemnya (ganjil/genap
+    acak) naik ke level berikutnya. update() menerima satu batch sekaligus.
+    """
+
+    def __init__(self, k=DEFAULT_K, c=2 / 3, seed=0):
+        self.k, self.c, self.seed = k, c, seed
+        self.n = 0
+        self.levels = [np.empty(0, dtype=np.int64)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * self.c ** depth)))
+
+    def _compress(self):
+        while True:
+            over = [h for h, items in enumerate(self.levels) if len(items) > self._capacity(h)]
+            if not over:
+                return
+            h = over[0]
+            if h + 1 == len(self.levels):
+                self.levels.append(np.empty(0, dtype=np.int64))
+            items = np.sort(self.levels[h])
+            odd = len(items) % 2
+            promoted = items[odd:][self._rng.integers(2)::2]
+            self.levels[h] = items[:odd]
+            self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+
+    def update(self, items):
+        items = np.asarray(items, dtype=np.int64).ravel()
+        if len(items):
+            self.n += len(items)
+            self.levels[0] = np.concatenate([self.levels[0], items])
+            self._compress()
+        return self
+
+    def merge(self, other):
+        for h, items in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0, dtype=np.int64))
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def weighted(self):
+        """(item terurut, bobot) semua level."""
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(x), 1 << h, dtype=np.int64) for h, x in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], weights[order]
+
+    @property
+    def exact(self):
+        """Belum pernah kompaksi → semua item tersimpan, kuantil persis."""
+        return len(self.levels) == 1
+
+    def item_at(self, ranks):
+        """Item dengan rank (1-based, inklusif) ranks pada urutan sketch."""
+        items, weights = self.weighted()
+        idx = np.searchsorted(np.cumsum(weights), np.asarray(ranks), side="left")
+        return items[np.clip(idx, 0, len(items) - 1)]
+
+    def to_dict(self):
+        return {"k": self.k, "c": self.c, "seed": self.seed, "n": self.n,
+                "levels": [x.tolist() for x in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["k"], data["c"], data["seed"])
+        sketch.n = data["n"]
+        sketch.levels = [np.asarray(x, dtype=np.int64) for x in data["levels"]]
+        sketch._rng = np.random.default_rng([data["seed"], data["n"]])
+        return sketch
+
+
+# ===============================
+# TIER SUBSCRIBERS
+# ===============================
+def tier_keys(subscribers2, title_ids):
+    """Kunci urutan tier: (2 x subscribers) << 30 | title_id."""
+    title_ids = np.asarray(title_ids, dtype=np.int64)
+    if len(title_ids) and (title_ids.min() < 0 or title_ids.max() > _ID_MASK):
+        raise ValueError(f"title_id harus di rentang 0..{_ID_MASK} untuk kunci tier")
+    return (np.asarray(subscribers2, dtype=np.int64) << _ID_BITS) | title_ids
+
+
+class SubscriberTiers:
+    """Sketch per status + median global; lihat docstring modul."""
+
+    def __init__(self, k=DEFAULT_K, seed=0):
+        self.k, self.seed = k, seed
+        self.all_subscribers = KLLSketch(k, seed=seed)
+        self.present = {s: KLLSketch(k, seed=seed) for s in TIER_TARGETS}
+        self.missing = {s: KLLSketch(k, seed=seed) for s in TIER_TARGETS}
+        self.stale_rows = 0
+
+    @property
+    def n_rows(self):
+        return self.all_subscribers.n + sum(m.n for m in self.missing.values())
+
+    def update(self, frame):
+        """Tambah baris (title_id, status, subscribers) — satu chunk."""
+        subscribers = pd.to_numeric(frame['subscribers'], errors='coerce')
+        has_subs = subscribers.notna().to_numpy()
+        self.all_subscribers.update(subscribers[has_subs].round().astype(np.int64))
+        status = frame['status'].astype(object).astype(str).str.upper().to_numpy()
+        title_ids = frame['title_id'].to_numpy()
+        for s in TIER_TARGETS:
+            rows = status == s
+            self.present[s].update(tier_keys(
+                2 * subscribers[rows & has_subs].round().astype(np.int64), title_ids[rows & has_subs]
+            ))
+            self.missing[s].update(title_ids[rows & ~has_subs])
+        return self
+
+    def mark_stale(self, n_rows):
+        self.stale_rows += int(n_rows)
+
+    def merge(self, other):
+        self.all_subscribers.merge(other.all_subscribers)
+        for s in TIER_TARGETS:
+            self.present[s].merge(other.present[s])
+            self.missing[s].merge(other.missing[s])
+        self.stale_rows += other.stale_rows
+        return self
+
+    def fill_value2(self):
+        """2 x median subscribers (pengisi NULL, sama dengan Series.median())."""
+        n = self.all_subscribers.n
+        if n == 0:
+            return 0
+        lower, upper = self.all_subscribers.item_at([(n + 1) // 2, n // 2 + 1])
+        return int(lower) + int(upper)
+
+    def _status_keys(self, status):
+        """(kunci terurut, bobot) gabungan baris ber-subscribers & baris NULL (diisi median)."""
+        present_items, present_w = self.present[status].weighted()
+        missing_ids, missing_w = self.missing[status].weighted()
+        items = np.concatenate([present_items, tier_keys(np.full(len(missing_ids), self.fill_value2()), missing_ids)])
+        weights = np.concatenate([present_w, missing_w])
+        order = np.argsort(items, kind="stable")
+        return items[order], weights[order]
+
+    def boundaries(self, status):
+        """
+        Dua kunci batas tier: kunci ≤ batas[0] → Low, ≤ batas[1] → Medium,
+        selebihnya High. Rank target sama dengan qcut: 1 + q (N - 1).
+        """
+        items, weights = self._status_keys(status)
+        n = int(weights.sum())
+        if n == 0:
+            return np.array([], dtype=np.int64)
+        cum = np.cumsum(weights)
+        targets = [1 + q * (n - 1) for q in (1 / 3, 2 / 3)]
+        # Item terakhir yang rank inklusifnya ≤ target
+        idx = np.searchsorted(cum, targets, side="right") - 1
+        return np.where(idx >= 0, items[np.clip(idx, 0, None)], np.iinfo(np.int64).min)
+
+    def assign(self, frame):
+        """Label tier per baris (None untuk status selain TIER_TARGETS)."""
+        status = frame['status'].astype(object).astype(str).str.upper().to_numpy()
+        subscribers = pd.to_numeric(frame['subscribers'], errors='coerce')
+        subs2 = (2 * subscribers).round().fillna(self.fill_value2()).astype(np.int64).to_numpy()
+        keys = tier_keys(subs2, frame['title_id'].to_numpy())
+        labels = np.full(len(frame), None, dtype=object)
+        for s in TIER_TARGETS:
+            rows = status == s
+            if rows.any():
+                bounds = self.boundaries(s)
+                labels[rows] = np.asarray(TIER_LABELS, dtype=object)[np.searchsorted(bounds, keys[rows], side="left")]
+        return pd.Series(labels, index=frame.index)
+
+    def error_bound(self, status):
+        """Batas galat rank ternormalisasi: KLL (0 jika belum kompaksi) + stale_rows / n."""
+        n = self.present[status].n + self.missing[status].n
+        sketch = 0.0 if (self.present[status].exact and self.missing[status].exact) else rank_error(self.k)
+        return sketch + (self.stale_rows / n if n else 0.0)
+
+    def needs_rebuild(self):
+        return self.n_rows == 0 or self.stale_rows > STALE_MAX_FRACTION * self.n_rows
+
+    # --- persistensi ---
+    def to_dict(self):
+        return {
+            "k": self.k, "seed": self.seed, "stale_rows": self.stale_rows,
+            "all_subscribers": self.all_subscribers.to_dict(),
+            "present": {s: x.to_dict() for s, x in self.present.items()},
+            "missing": {s: x.to_dict() for s, x in self.missing.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        tiers = cls(data["k"], data["seed"])
+        tiers.stale_rows = data["stale_rows"]
+        tiers.all_subscribers = KLLSketch.from_dict(data["all_subscribers"])
+        tiers.present = {s: KLLSketch.from_dict(x) for s, x in data["present"].items()}
+        tiers.missing = {s: KLLSketch.from_dict(x) for s, x in data["missing"].items()}
+        return tiers
+
+    def save(self, path=TIERS_FILE):
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(path + ".tmp", path)
+        return path
+
+    @classmethod
+    def load(cls, path=TIERS_FILE):
+        """Sketch tersimpan, None jika belum ada."""
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def build_from_db(engine, k=DEFAULT_K, chunksize=None):
+    """Bangun ulang dari v_comics per chunk (server-side cursor)."""
+    tiers = SubscriberTiers(k)
+    sql = select_sql("v_comics", "subscriber_tiers")
+    for chunk in read_chunks(engine, sql, **({"chunksize": chunksize} if chunksize else {})):
+        tiers.update(chunk)
+    return tiers
+
+
+# ===============================
+# LAPORAN ERROR vs QCUT
+# ===============================
+def exact_tiers(frame):
+    """Label persis seperti train_models.prepare_data (median fill, rank 'first', qcut)."""
+    frame = frame.sort_values('title_id')
+    subscribers = pd.to_numeric(frame['subscribers'], errors='coerce').astype('float64')
+    rank = subscribers.fillna(subscribers.median()).rank(method='first')
+    status = frame['status'].astype(object).astype(str).str.upper()
+    labels = pd.Series(None, index=frame.index, dtype=object)
+    for s in TIER_TARGETS:
+        rows = status == s
+        if rows.sum() >= len(TIER_LABELS):
+            labels[rows] = pd.qcut(rank[rows], 3, labels=TIER_LABELS).astype(object)
+    return labels.reindex(frame.index)
+
+
+def error_report(tiers, frame):
+    """
+    Per status: galat rank batas tier (selisih ukuran Low dan Low+Medium
+    terhadap qcut persis, dibagi n), persentase label yang sama, batas
+    galat teoretis, serta median pengisi & subscribers di batas tier.
+    """
+    exact = exact_tiers(frame)
+    sketch = tiers.assign(frame)
+    status = frame['status'].astype(object).astype(str).str.upper().to_numpy()
+    subscribers = pd.to_numeric(frame['subscribers'], errors='coerce').astype('float64')
+    rows = []
+    for s, target in TIER_TARGETS.items():
+        mask = status == s
+        n = int(mask.sum())
+        if n == 0:
+            continue
+        exact_counts = np.cumsum([(exact[mask] == label).sum() for label in TIER_LABELS[:2]])
+        sketch_counts = np.cumsum([(sketch[mask] == label).sum() for label in TIER_LABELS[:2]])
+        exact_bounds = [
+            subscribers[mask & (exact == label).to_numpy()].fillna(subscribers.median()).max()
+            for label in TIER_LABELS[:2]
+        ]
+        rows.append({
+            "status": s, "target": target, "rows": n,
+            "rank_error_low": abs(int(sketch_counts[0]) - int(exact_counts[0])) / n,
+            "rank_error_high": abs(int(sketch_counts[1]) - int(exact_counts[1])) / n,
+            "label_agreement": float((exact[mask] == sketch[mask]).mean()),
+            "error_bound": tiers.error_bound(s),
+            "median_exact": float(subscribers.median()),
+            "median_sketch": tiers.fill_value2() / 2,
+            "bounds_exact": [float(b) for b in exact_bounds],
+            "bounds_sketch": [float((b >> _ID_BITS) / 2) for b in tiers.boundaries(s)],
+        })
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    from db_connector import get_engine
+
+    parser = argparse.ArgumentParser(description="Tier subscribers dari quantile sketch KLL")
+    parser.add_argument('--rebuild', action='store_true', help="Bangun ulang sketch dari database")
+    parser.add_argument('--k', type=int, default=DEFAULT_K, help="Parameter akurasi KLL (--rebuild)")
+    parser.add_argument('--path', default=TIERS_FILE)
+    args = parser.parse_args(argv)
+
+    engine = get_engine()
+    tiers = None if args.rebuild else SubscriberTiers.load(args.path)
+    if tiers is None:
+        tiers = build_from_db(engine, args.k)
+        tiers.save(args.path)
+        print(f"✅ Sketch dibangun dari {tiers.n_rows} komik (k={tiers.k}) → {args.path}")
+
+    frame = pd.concat(read_chunks(engine, select_sql("v_comics", "subscriber_tiers")), ignore_index=True)
+    report = error_report(tiers, frame)
+    print(f"=== TIER SKETCH vs QCUT PERSIS (k={tiers.k}, stale {tiers.stale_rows} baris) ===")
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.4f}"))
+    return report
+
+
+if __name__ == "__main__":
+    main()
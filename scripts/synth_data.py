@@ -0,0 +1,158 @@
+# scripts/synth_data.py
+"""
+Generator data sintetis untuk benchmark skala besar.
+
+Membuat Manga_Details.csv & webtoon_originals_id.csv berukuran `scale` x
+file asli dengan bentuk kolom yang sama. Baris diambil acak (dengan
+pengembalian) dari file asli sehingga distribusi genre (daftar dipisah
+koma), status, length, weekdays, tahun, rating dan pola NaN ikut terbawa;
+lalu:
+- judul dibuat unik, dengan porsi judul duplikat (antar & dalam sumber)
+  sama dengan data asli supaya deduplikasi pre_etl tetap bekerja
+- sebagian besar author diganti nama sintetis dari token nama asli
+  (jumlah author unik ikut membesar bersama skala)
+- subscribers / views / likes diberi noise log-normal (format angka Manga
+  "7,897" dipertahankan)
+
+Contoh:
+    python synth_data.py --scale 10 --out-dir /tmp/synth_10x --seed 42
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+import staging
+
+SOURCES = {
+    "webtoon": "webtoon_originals_id",
+    "manga": "Manga_Details",
+}
+CHUNK_ROWS = 200_000
+
+
+def _title_key(titles):
+    return titles.astype(str).str.lower().str.strip()
+
+
+def load_sources(directory=None):
+    """File sumber asli (CSV di STAGING_DIR) sebagai dict nama → DataFrame."""
+    return {
+        name: staging.read_frame(staging.staging_path(file, "csv", directory))
+        for name, file in SOURCES.items()
+    }
+
+
+def source_profile(sources):
+    """Statistik yang dipertahankan generator: rasio judul duplikat & author unik."""
+    titles = pd.concat([_title_key(df['title']) for df in sources.values()], ignore_index=True)
+    profile = {"duplicate_rate": float(titles.duplicated().mean()), "new_author_rate": {}}
+    for name, df in sources.items():
+        authors = df['authors'].dropna()
+        profile["new_author_rate"][name] = float(authors.nunique() / max(len(authors), 1))
+    return profile
+
+
+def _author_tokens(sources):
+    tokens = pd.concat([df['authors'].dropna().astype(str) for df in sources.values()])
+    tokens = tokens.str.split(r"[,\s]+", regex=True).explode()
+    tokens = tokens[tokens.str.len() > 1]
+    return tokens.drop_duplicates().to_numpy()
+
+
+def _synthetic_authors(template, tokens, rng):
+    """Nama sintetis dengan jumlah author (dipisah koma) sama seperti template."""
+    n_authors = template.str.count(",").to_numpy() + 1
+    first = tokens[rng.integers(0, len(tokens), n_authors.sum())]
+    last = tokens[rng.integers(0, len(tokens), n_authors.sum())]
+    names = pd.Series(np.char.add(np.char.add(first.astype(str), " "), last.astype(str)))
+    owner = np.repeat(np.arange(len(template)), n_authors)
+    return names.groupby(owner).agg(", ".join).to_numpy()
+
+
+def _jitter(values, rng, sigma=0.15):
+    return np.maximum(np.round(values * rng.lognormal(0.0, sigma, len(values))), 0).astype('int64')
+
+
+def _format_thousands(series, rng):
+    """Noise untuk subscribers Manga ("7,897"); nilai non-angka dibiarkan."""
+    numbers = pd.to_numeric(series.str.replace(",", "", regex=False), errors='coerce')
+    mask = numbers.notna().to_numpy()
+    out = series.to_numpy(dtype=object).copy()
+    out[mask] = [f"{v:,}" for v in _jitter(numbers[mask].to_numpy(), rng)]
+    return out
+
+
+def synth_chunk(name, real, n_rows, start, profile, tokens, title_pool, rng):
+    """
+    `n_rows` baris sintetis sumber `name` mulai nomor baris global `start`.
+    title_pool: judul yang sudah dibuat (untuk duplikat), diperbarui di tempat.
+    """
+    df = real.iloc[rng.integers(0, len(real), n_rows)].reset_index(drop=True)
+
+    # Judul unik + sebagian duplikat dari judul yang sudah ada
+    titles = (df['title'].astype(str) + " " + pd.Series(np.arange(start, start + n_rows)).astype(str)).to_numpy()
+    if title_pool:
+        dup = rng.random(n_rows) < profile["duplicate_rate"]
+        titles[dup] = np.asarray(title_pool, dtype=object)[rng.integers(0, len(title_pool), dup.sum())]
+    df['title'] = titles
+    title_pool.extend(titles[rng.random(n_rows) < 0.05])   # sampel kecil, memori tetap terbatas
+
+    # Author: sebagian besar nama baru, sisanya author asli (NaN tetap NaN)
+    has_author = df['authors'].notna().to_numpy()
+    new = has_author & (rng.random(n_rows) < profile["new_author_rate"][name])
+    if new.any():
+        df.loc[new, 'authors'] = _synthetic_authors(df.loc[new, 'authors'].astype(str), tokens, rng)
+
+    if name == "webtoon":
+        for col in ('subscribers', 'views', 'likes'):
+            df[col] = _jitter(df[col].to_numpy(), rng)
+        df['title_id'] = np.arange(start + 1, start + n_rows + 1)
+    else:
+        df['subscribers'] = _format_thousands(df['subscribers'].astype(str).where(df['subscribers'].notna()), rng)
+    return df
+
+
+def generate_sources(scale, out_dir, seed=None, source_dir=None):
+    """
+    Tulis file sumber sintetis (scale x ukuran asli) ke out_dir.
+    Mengembalikan dict nama → (path, jumlah baris).
+    """
+    rng = np.random.default_rng(seed)
+    sources = load_sources(source_dir)
+    profile = source_profile(sources)
+    tokens = _author_tokens(sources)
+    os.makedirs(out_dir, exist_ok=True)
+
+    written = {}
+    title_pool = []
+    start = 0
+    for name, real in sources.items():
+        path = os.path.join(out_dir, SOURCES[name] + ".csv")
+        n_total = int(round(len(real) * scale))
+        for offset in range(0, n_total, CHUNK_ROWS):
+            n_rows = min(CHUNK_ROWS, n_total - offset)
+            chunk = synth_chunk(name, real, n_rows, start, profile, tokens, title_pool, rng)
+            chunk.to_csv(
+                path, index=False, mode='w' if offset == 0 else 'a', header=offset == 0,
+                encoding=staging.CSV_ENCODING, errors='replace'
+            )
+            start += n_rows
+        written[name] = (path, n_total)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generator data sumber sintetis")
+    parser.add_argument('--scale', type=float, default=10, help="Kelipatan ukuran data asli")
+    parser.add_argument('--out-dir', required=True)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    for name, (path, n_rows) in generate_sources(args.scale, args.out_dir, args.seed).items():
+        print(f"✅ {name}: {n_rows} baris → {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+# scripts/tuning.py
+"""
+Pencarian engine + hyperparameter untuk train_models (--tune) dengan
+successive halving di atas fold CV stratified.
+
+- Kandidat: konfigurasi default tiap engine (train_models.ENGINES) +
+  sampel acak dari SEARCH_SPACES.
+- Putaran (rung) pertama memakai sebagian kecil baris latih tiap fold;
+  setiap putaran hanya 1/eta kandidat terbaik (F1 weighted rata-rata
+  fold) yang lanjut, dengan baris latih eta kali lebih banyak. Putaran
+  terakhir memakai seluruh baris latih fold.
+- Fold, urutan subsampel (prefix stratified, bertingkat antar putaran) dan
+  irisan matriks fitur per fold dihitung sekali (CVCache) lalu dipakai
+  ulang semua kandidat.
+- Pasangan (kandidat, fold) dievaluasi paralel (ProcessPoolExecutor);
+  CVCache dikirim sekali per worker lewat initializer.
+
+Biaya dilaporkan sebagai cost_vs_grid = total baris latih semua fit /
+(kandidat x fold x baris latih penuh), yaitu relatif terhadap grid yang
+melatih semua kandidat dengan data penuh.
+
+Contoh:
+    python train_models.py --tune --tune-candidates 24 --cv-folds 3
+"""
+import json
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import ParameterGrid, ParameterSampler, StratifiedKFold
+from threadpoolctl import threadpool_limits
+
+from train_models import DENSE_ENGINES, ENGINES
+
+N_CANDIDATES = 24
+CV_FOLDS = 3
+ETA = 3
+MIN_TRAIN_ROWS = 100
+
+SEARCH_SPACES = {
+    "gb": {
+        "n_estimators": [100, 200, 400],
+        "learning_rate": [0.05, 0.1, 0.2],
+        "max_depth": [3, 5, 8],
+        "subsample": [0.8, 1.0],
+    },
+    "hist_gb": {
+        "max_iter": [100, 200, 400],
+        "learning_rate": [0.05, 0.1, 0.2],
+        "max_depth": [None, 6, 10],
+        "max_leaf_nodes": [15, 31, 63],
+        "l2_regularization": [0.0, 1.0],
+    },
+    "rf": {
+        "n_estimators": [100, 300, 500],
+        "max_depth": [None, 16, 32],
+        "min_samples_leaf": [1, 2, 5],
+        "max_features": ["sqrt", 0.3],
+    },
+    "rf_bounded": {
+        "n_estimators": [100, 200],
+        "max_depth": [8, 16, 24],
+        "min_samples_leaf": [2, 5, 10],
+        "max_samples": [0.3, 0.5, 0.8],
+    },
+}
+
+
+# ===============================
+# KANDIDAT
+# ===============================
+def sample_candidates(engines, n_candidates=N_CANDIDATES, seed=42):
+    """
+    Daftar (engine, params): per engine konfigurasi default ({}) lalu
+    sampel acak dari SEARCH_SPACES, total ± n_candidates.
+    """
+    per_engine = max(1, math.ceil(n_candidates / len(engines)))
+    candidates = []
+    for engine in engines:
+        space = SEARCH_SPACES[engine]
+        n_sampled = min(per_engine - 1, len(ParameterGrid(space)))
+        candidates.append((engine, {}))
+        candidates.extend(
+            (engine, dict(params))
+            for params in ParameterSampler(space, n_sampled, random_state=seed)
+        )
+    return candidates
+
+
+# ===============================
+# FOLD CACHE
+# ===============================
+class CVCache:
+    """
+    Fold stratified + irisan matriks fitur per (fold, jumlah baris latih).
+    train_order tiap fold diurutkan supaya setiap prefix-nya stratified,
+    sehingga subsampel putaran kecil selalu bagian dari putaran berikutnya.
+    """
+
+    def __init__(self, X, y, n_folds=CV_FOLDS, seed=42, dense=False):
+        self.X = sparse.csr_matrix(X)
+        self.X_dense = self.X.toarray() if dense else None
+        self.y = np.asarray(y)
+        self.folds = []
+        rng = np.random.default_rng(seed)
+        splitter = StratifiedKFold(n_folds, shuffle=True, random_state=seed)
+        for train_idx, val_idx in splitter.split(np.zeros(len(self.y)), self.y):
+            self.folds.append((_stratified_order(train_idx, self.y[train_idx], rng), val_idx))
+        self._slices = {}
+
+    @property
+    def n_folds(self):
+        return len(self.folds)
+
+    def train_rows(self, fold):
+        return len(self.folds[fold][0])
+
+    def split(self, fold, n_train, dense):
+        """(X_train, y_train, X_val, y_val) untuk fold dengan n_train baris latih pertama."""
+        key = (fold, n_train, dense)
+        if key not in self._slices:
+            train_order, val_idx = self.folds[fold]
+            train_idx = np.sort(train_order[:n_train])
+            X = self.X_dense if dense else self.X
+            self._slices[key] = (X[train_idx], self.y[train_idx], X[val_idx], self.y[val_idx])
+        return self._slices[key]
+
+
+def _stratified_order(train_idx, y_train, rng):
+    """Acak train_idx lalu urutkan per posisi relatif di kelasnya (prefix ≈ proporsi kelas)."""
+    perm = rng.permutation(len(train_idx))
+    y_perm = pd.Series(y_train[perm])
+    rank = y_perm.groupby(y_perm).cumcount().to_numpy()
+    size = y_perm.map(y_perm.value_counts()).to_numpy()
+    return train_idx[perm[np.argsort((rank + 0.5) / size, kind="stable")]]
+
+
+# ===============================
+# EVALUASI (WORKER)
+# ===============================
+_CV = None
+
+
+def _init_worker(cv):
+    global _CV
+    _CV = cv
+
+
+def _evaluate(job):
+    """Fit satu kandidat di satu fold → (kandidat, fold, f1, accuracy, detik)."""
+    cand_idx, engine, params, fold, n_train = job
+    X_train, y_train, X_val, y_val = _CV.split(fold, n_train, engine in DENSE_ENGINES)
+    model = ENGINES[engine][1](1).set_params(**params)
+    start = time.perf_counter()
+    with threadpool_limits(limits=1, user_api="openmp"):
+        model.fit(X_train, y_train)
+        y_pred = model.predict(X_val)
+    return (
+        cand_idx, fold,
+        float(f1_score(y_val, y_pred, average="weighted")),
+        float(accuracy_score(y_val, y_pred)),
+        time.perf_counter() - start,
+    )
+
+
+def _run_jobs(jobs, pool, max_workers):
+    if pool is None:
+        return [_evaluate(job) for job in jobs]
+    return list(pool.map(_evaluate, jobs, chunksize=max(1, len(jobs) // (4 * max_workers))))
+
+
+# ===============================
+# SUCCESSIVE HALVING
+# ===============================
+def successive_halving(X, y, engines=None, n_candidates=N_CANDIDATES, n_folds=CV_FOLDS,
+                       eta=ETA, max_workers=1, seed=42, halving=True):
+    """
+    Cari konfigurasi terbaik untuk (X, y); y sudah di-encode (LabelEncoder).
+    halving=False → semua kandidat dilatih dengan data penuh (grid, untuk
+    pembanding). Mengembalikan dict pemenang + metrik CV + riwayat putaran.
+    """
+    global _CV
+    engines = list(engines or ENGINES)
+    start = time.perf_counter()
+    candidates = sample_candidates(engines, n_candidates, seed)
+    cv = CVCache(X, y, n_folds, seed, dense=any(e in DENSE_ENGINES for e in engines))
+
+    n_rungs = max(1, math.ceil(math.log(len(candidates), eta))) if halving else 1
+    survivors = list(range(len(candidates)))
+    scores = {}
+    history = []
+    fit_rows = 0
+
+    _CV = cv
+    pool = (
+        ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(cv,))
+        if max_workers > 1 else None
+    )
+    try:
+        for rung in range(n_rungs):
+            fraction = float(eta) ** (rung - (n_rungs - 1))
+            n_train = [
+                min(cv.train_rows(f), max(MIN_TRAIN_ROWS, math.ceil(cv.train_rows(f) * fraction)))
+                for f in range(cv.n_folds)
+            ]
+            jobs = [
+                (c, candidates[c][0], candidates[c][1], f, n_train[f])
+                for c in survivors for f in range(cv.n_folds)
+            ]
+            per_candidate = {c: [] for c in survivors}
+            for cand_idx, _, f1, acc, _ in _run_jobs(jobs, pool, max_workers):
+                per_candidate[cand_idx].append((f1, acc))
+            fit_rows += sum(n_train) * len(survivors)
+
+            scores = {
+                c: (np.mean([r[0] for r in res]), np.std([r[0] for r in res]), np.mean([r[1] for r in res]))
+                for c, res in per_candidate.items()
+            }
+            ranked = sorted(survivors, key=lambda c: -scores[c][0])
+            history.append({
+                "rung": rung,
+                "candidates": len(survivors),
+                "train_rows": int(np.mean(n_train)),
+                "best_f1": float(scores[ranked[0]][0]),
+            })
+            print(
+                f"  rung {rung}: {len(survivors):>3} kandidat x {cv.n_folds} fold, "
+                f"{int(np.mean(n_train))} baris latih, F1 terbaik {scores[ranked[0]][0]:.4f}"
+            )
+            survivors = ranked[:max(1, math.ceil(len(ranked) / eta))]
+    finally:
+        _CV = None
+        if pool is not None:
+            pool.shutdown()
+
+    best = ranked[0]
+    engine, params = candidates[best]
+    grid_rows = len(candidates) * sum(cv.train_rows(f) for f in range(cv.n_folds))
+    return {
+        "engine": engine,
+        "params": params,
+        "cv_f1": float(scores[best][0]),
+        "cv_f1_std": float(scores[best][1]),
+        "cv_accuracy": float(scores[best][2]),
+        "cv_folds": cv.n_folds,
+        "candidates": len(candidates),
+        "cost_vs_grid": fit_rows / grid_rows,
+        "seconds": time.perf_counter() - start,
+        "history": history,
+    }
+
+
+def tuning_metrics(result):
+    """Kolom tambahan baris ml_metrics untuk model hasil tuning."""
+    return {
+        "params": json.dumps(result["params"], sort_keys=True),
+        "cv_f1": result["cv_f1"],
+        "cv_f1_std": result["cv_f1_std"],
+        "cv_accuracy": result["cv_accuracy"],
+        "cv_folds": result["cv_folds"],
+        "tuning_candidates": result["candidates"],
+        "tuning_cost_vs_grid": result["cost_vs_grid"],
+        "tuning_seconds": result["seconds"],
+    }